@@ -0,0 +1,191 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from benchmarks.synthetic import render_data_payload
+from stream.buffer_stream import BufferStream
+from model.render_data import RenderData
+from model.path_data import PathData
+from model.render_data_decoder import RenderDataDecoder
+from model.render_data_columns import RenderDataColumns
+from stream.socket_stream import SocketStream
+import argparse
+import tempfile
+import threading
+import socket
+import time
+import os
+
+
+# Benchmark of the pixel render data deserialization.
+# Compares the per field PathData.deserialize with the bulk RenderDataDecoder on a synthetic payload,
+# either from memory (BufferStream) or through a local socket pair (SocketStream).
+#
+# The decoded render data is compared with PathData.deserialize, a mismatch exits with an error.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_render_data --samples 4096 --depth 8 [--socket]
+#   python -m benchmarks.bench_render_data --check
+
+
+def assert_same_render_data(a, b):
+    """
+    Asserts that two RenderData objects hold the same paths
+    :return:
+    """
+    assert a.sample_count == b.sample_count, 'sample count {} != {}'.format(a.sample_count, b.sample_count)
+    assert a.dict_paths.keys() == b.dict_paths.keys(), 'different paths'
+    for key, path_a in a.dict_paths.items():
+        path_b = b.dict_paths[key]
+        assert path_a.data_list == path_b.data_list, 'user data of path {}'.format(key)
+        assert (path_a.path_depth, path_a.path_origin, path_a.final_estimate,
+                path_a.is_show_path, path_a.is_show_ne) == \
+               (path_b.path_depth, path_b.path_origin, path_b.final_estimate,
+                path_b.is_show_path, path_b.is_show_ne), 'values of path {}'.format(key)
+        assert path_a.intersections.keys() == path_b.intersections.keys(), 'intersections of path {}'.format(key)
+        for its_key, its_a in path_a.intersections.items():
+            its_b = path_b.intersections[its_key]
+            assert its_a.data_list == its_b.data_list, 'user data of intersection {} {}'.format(key, its_key)
+            assert (its_a.depth_idx, its_a.pos, its_a.pos_ne, its_a.is_ne_occluded, its_a.pos_envmap, its_a.li) == \
+                   (its_b.depth_idx, its_b.pos, its_b.pos_ne, its_b.is_ne_occluded, its_b.pos_envmap, its_b.li), \
+                'values of intersection {} {}'.format(key, its_key)
+
+
+def legacy_decode(stream):
+    """
+    Decodes a pixel payload field by field with PathData.deserialize
+    :param stream: Stream
+    :return: RenderData
+    """
+    render_data = RenderData()
+    render_data._sample_count = stream.read_uint()
+    for sample in range(render_data.sample_count):
+        path_data = PathData()
+        path_data.deserialize(stream)
+        render_data.dict_paths[path_data.sample_idx] = path_data
+    return render_data
+
+
+def assert_same_file_round_trip(expected, decoder, payload):
+    """
+    Decodes a pixel payload into columns, writes them like the disk cache
+    and asserts that the render data built from the file matches expected
+    :return:
+    """
+    columns = decoder.decode_columns(BufferStream(payload))
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, 'pixel.emcacol')
+        columns.to_file(filepath)
+        loaded = RenderDataColumns.from_file(filepath)
+        assert_same_render_data(expected, decoder.build(loaded, RenderData()))
+        loaded.release()
+
+
+def check(payloads):
+    """
+    Asserts that the bulk decoder and the disk cache round trip match PathData.deserialize
+    :param payloads: [(samples, depth, values), ...]
+    :return:
+    """
+    decoder = RenderDataDecoder()
+    for samples, depth, values in payloads:
+        payload = render_data_payload(samples, depth, values)
+        expected = legacy_decode(BufferStream(payload))
+        assert_same_render_data(expected, decoder.decode(BufferStream(payload), RenderData()))
+        assert_same_file_round_trip(expected, decoder, payload)
+        print('{} samples, depth {}, {} values: identical'.format(samples, depth, values))
+
+
+def socket_source(payload):
+    """
+    Returns a function creating a SocketStream which receives payload from a sender thread
+    :param payload: bytes
+    :return: function
+    """
+    def create():
+        sender, receiver = socket.socketpair()
+
+        def send():
+            sender.sendall(payload)
+            sender.close()
+
+        threading.Thread(target=send, daemon=True).start()
+        return SocketStream(sock=receiver)
+    return create
+
+
+def best_of(repeat, func):
+    """
+    Runs func repeat times and returns the fastest runtime and the last result
+    :return: (seconds, result)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EMCA render data deserialization benchmark')
+    parser.add_argument('--samples', type=int, default=4096)
+    parser.add_argument('--depth', type=int, default=8)
+    parser.add_argument('--values', type=int, default=1, help='values per user data key')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--socket', action='store_true', help='read the payload through a local socket pair')
+    parser.add_argument('--check', action='store_true', help='only check the decoders on several small payloads')
+    args = parser.parse_args()
+
+    if args.check:
+        check([(1, 0, 0), (64, 1, 1), (64, 5, 0), (64, 5, 3), (256, 8, 2)])
+        return
+
+    payload = render_data_payload(args.samples, args.depth, args.values)
+    print('payload: {} samples, depth {}, {:.2f} MB'.format(args.samples, args.depth, len(payload) / 1e6))
+
+    source = socket_source(payload) if args.socket else lambda: BufferStream(payload)
+
+    def legacy():
+        return legacy_decode(source())
+
+    decoder = RenderDataDecoder()
+
+    def bulk():
+        return decoder.decode(source(), RenderData())
+
+    t_legacy, rd_legacy = best_of(args.repeat, legacy)
+    t_bulk, rd_bulk = best_of(args.repeat, bulk)
+
+    print('PathData.deserialize     {:8.3f}s'.format(t_legacy))
+    print('RenderDataDecoder.decode {:8.3f}s'.format(t_bulk))
+    print('speedup                  {:8.2f}x'.format(t_legacy / t_bulk))
+    assert_same_render_data(rd_legacy, rd_bulk)
+    assert_same_file_round_trip(rd_legacy, decoder, payload)
+    print('identical output         True')
+
+
+if __name__ == '__main__':
+    main()
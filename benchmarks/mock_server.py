@@ -0,0 +1,304 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from benchmarks.synthetic import write_server_string
+from benchmarks.synthetic import write_render_data
+from benchmarks.synthetic import write_camera
+from benchmarks.synthetic import scene_payloads
+from stream.buffer_stream import BufferStream
+from stream.socket_stream import SocketStream
+from core.messages import ServerMsg
+from core.messages import RenderSystem
+import numpy as np
+import argparse
+import hashlib
+import logging
+import socket
+import tempfile
+import time
+import os
+
+
+# Pure Python stand-in for the EMCA server library (server/src/server.cpp, server/src/emcaserver.cpp).
+# Speaks the same protocol and answers with synthetic scene and path data,
+# so the client can be load tested without a render system.
+#
+# Run from the repository root and connect the client to localhost:50013:
+#   python -m benchmarks.mock_server --samples 10000 --depth 5 --values 1
+
+
+class MockServer(object):
+
+    """
+        MockServer
+        Serves one client at a time, after a disconnect the next client is accepted.
+        Pixel payloads are generated once per sample count and reused for all pixels
+        unless unique_pixels is set, so payload generation does not dominate load tests.
+    """
+
+    def __init__(self, port=50013, hostname='', sample_count=1024, path_depth=5, values_per_key=1,
+                 mesh_count=4, plugins=(), render_system=RenderSystem.MITSUBA, unique_pixels=False,
+                 output_filepath=None, image_size=(256, 256), seed=0):
+        self._port = port
+        self._hostname = hostname
+        self._sample_count = sample_count
+        self._path_depth = path_depth
+        self._values_per_key = values_per_key
+        self._mesh_count = mesh_count
+        self._plugins = list(plugins)
+        self._render_system = render_system
+        self._unique_pixels = unique_pixels
+        self._output_filepath = output_filepath or os.path.join(tempfile.gettempdir(), 'emca_mock_server.exr')
+        self._image_size = image_size
+        self._seed = seed
+        self._payloads = {}
+        self._scene = None
+        self._server_socket = None
+        self._running = False
+
+    @property
+    def port(self):
+        return self._port
+
+    @property
+    def sample_count(self):
+        return self._sample_count
+
+    def start(self):
+        """
+        Listens for clients until a client sends EMCA_QUIT
+        :return:
+        """
+        self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server_socket.bind((self._hostname, self._port))
+        self._server_socket.listen(1)
+        # port 0 binds to any free port
+        self._port = self._server_socket.getsockname()[1]
+        logging.info('Mock server is listening on port {} ...'.format(self._port))
+        self._running = True
+        while self._running:
+            connection, address = self._server_socket.accept()
+            logging.info('Client connected {}'.format(address))
+            try:
+                self.handle_client(SocketStream(sock=connection))
+            except (RuntimeError, ConnectionError) as e:
+                logging.error(e)
+            finally:
+                connection.close()
+        self._server_socket.close()
+
+    def handle_client(self, stream):
+        """
+        Handshake and message loop of one client connection
+        :param stream: SocketStream
+        :return:
+        """
+        stream.write_short(ServerMsg.EMCA_HELLO.value)
+        if stream.read_short() != ServerMsg.EMCA_HELLO.value:
+            logging.error('Received wrong handshake message from client')
+            return
+
+        with stream.message() as msg:
+            msg.write_short(self._render_system.value)
+            msg.write_short(ServerMsg.EMCA_SUPPORTED_PLUGINS.value)
+            msg.write_uint(len(self._plugins))
+            for plugin_id in self._plugins:
+                msg.write_short(plugin_id)
+            msg.write_short(ServerMsg.EMCA_CAPABILITY_SCENE_HASH.value)
+
+        while True:
+            header = stream.read_short()
+            if header in self._plugins:
+                self.respond_plugin(stream, header)
+                continue
+            state = ServerMsg.get_server_msg(header)
+            if state is ServerMsg.EMCA_HEADER_RENDER_INFO:
+                self.respond_render_info(stream)
+            elif state is ServerMsg.EMCA_SEND_RENDER_INFO:
+                self._sample_count = stream.read_int()
+                logging.info('Sample count = {}'.format(self._sample_count))
+            elif state is ServerMsg.EMCA_HEADER_IMAGE_DATA:
+                self.respond_render_image(stream)
+            elif state is ServerMsg.EMCA_HEADER_SCENE_DATA:
+                self.respond_scene_data(stream)
+            elif state is ServerMsg.EMCA_HEADER_SCENE_HASH:
+                self.respond_scene_hash(stream)
+            elif state is ServerMsg.EMCA_HEADER_CAMERA:
+                self.respond_camera_data(stream)
+            elif state is ServerMsg.EMCA_HEADER_PIXEL_DATA:
+                self.respond_render_data(stream)
+            elif state is ServerMsg.EMCA_DISCONNECT:
+                stream.write_short(ServerMsg.EMCA_DISCONNECT.value)
+                return
+            elif state is ServerMsg.EMCA_QUIT:
+                stream.write_short(ServerMsg.EMCA_QUIT.value)
+                self._running = False
+                return
+            else:
+                logging.warning('Unknown message received {}'.format(header))
+
+    def respond_render_info(self, stream):
+        with stream.message() as msg:
+            msg.write_short(ServerMsg.EMCA_HEADER_RENDER_INFO.value)
+            write_server_string(msg, 'mock scene')
+            write_server_string(msg, self._output_filepath)
+            write_server_string(msg, 'exr')
+            msg.write_int(self._sample_count)
+
+    def respond_render_image(self, stream):
+        """
+        Writes a synthetic image to the output filepath,
+        the client loads the rendered image from there
+        :param stream: SocketStream
+        :return:
+        """
+        self.write_image()
+        stream.write_short(ServerMsg.EMCA_HEADER_IMAGE_DATA.value)
+
+    def scene(self):
+        """
+        Returns the payloads of all scene objects, created on first use
+        :return: list[bytes]
+        """
+        if self._scene is None:
+            self._scene = scene_payloads(self._mesh_count, seed=self._seed)
+        return self._scene
+
+    def respond_scene_hash(self, stream):
+        geometry_hash = hashlib.sha1()
+        for payload in self.scene():
+            geometry_hash.update(payload)
+        with stream.message() as msg:
+            msg.write_short(ServerMsg.EMCA_HEADER_SCENE_HASH.value)
+            write_server_string(msg, geometry_hash.hexdigest()[:16])
+            msg.write_uint(len(self.scene()))
+
+    def respond_camera_data(self, stream):
+        with stream.message() as msg:
+            msg.write_short(ServerMsg.EMCA_HEADER_CAMERA.value)
+            write_camera(msg)
+
+    def respond_scene_data(self, stream):
+        self.scene()
+        with stream.message() as msg:
+            msg.write_short(ServerMsg.EMCA_HEADER_CAMERA.value)
+            write_camera(msg)
+            for payload in self._scene:
+                msg.write_short(ServerMsg.EMCA_HEADER_SCENE_DATA.value)
+                msg.write_bytes(payload)
+
+    def respond_render_data(self, stream):
+        x = stream.read_int()
+        y = stream.read_int()
+        sample_count = stream.read_int()
+        logging.info('Respond path data of pixel: ({}, {})'.format(x, y))
+        payload = self.render_data_payload(x, y, sample_count)
+        with stream.message() as msg:
+            msg.write_short(ServerMsg.EMCA_HEADER_PIXEL_DATA.value)
+            msg.write_bytes(payload)
+
+    def respond_plugin(self, stream, plugin_id):
+        """
+        Consumes a plugin request and answers with an empty result.
+        Only the request of the spherical view plugin (66) is known,
+        other announced plugins must not send any data
+        :param stream: SocketStream
+        :param plugin_id: short
+        :return:
+        """
+        if plugin_id == 66:
+            # position, sample count, render size and null terminated integrator name
+            stream.skip(3 * 4 + 3 * 4)
+            while stream.read_char() != b'\x00':
+                pass
+        with stream.message() as msg:
+            msg.write_short(plugin_id)
+            msg.write_int(0)
+
+    def render_data_payload(self, x, y, sample_count):
+        """
+        Returns the synthetic path data of a pixel
+        :param x: integer
+        :param y: integer
+        :param sample_count: integer
+        :return: bytes
+        """
+        if self._unique_pixels:
+            seed = hash((self._seed, x, y))
+        else:
+            payload = self._payloads.get(sample_count, None)
+            if payload is not None:
+                return payload
+            seed = self._seed
+        start = time.time()
+        payload_stream = BufferStream()
+        write_render_data(payload_stream, sample_count, self._path_depth, self._values_per_key, seed)
+        payload = payload_stream.getvalue()
+        logging.info('Generated {} samples ({} bytes) in {:.3}s'.format(sample_count, len(payload), time.time() - start))
+        if not self._unique_pixels:
+            self._payloads[sample_count] = payload
+        return payload
+
+    def write_image(self):
+        """
+        Writes a noisy gradient as exr image to the output filepath
+        :return:
+        """
+        import OpenEXR
+        import Imath
+        width, height = self._image_size
+        rnd = np.random.default_rng(self._seed)
+        gradient = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :].repeat(height, axis=0)
+        header = OpenEXR.Header(width, height)
+        channel = Imath.Channel(Imath.PixelType(Imath.PixelType.FLOAT))
+        header['channels'] = {'R': channel, 'G': channel, 'B': channel}
+        exr = OpenEXR.OutputFile(self._output_filepath, header)
+        exr.writePixels({c: (gradient * rnd.exponential(1.0, (height, width)).astype(np.float32)).tobytes()
+                         for c in 'RGB'})
+        exr.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EMCA mock server with synthetic data')
+    parser.add_argument('--port', type=int, default=50013)
+    parser.add_argument('--samples', type=int, default=1024, help='initial sample count per pixel')
+    parser.add_argument('--depth', type=int, default=5, help='path depth')
+    parser.add_argument('--values', type=int, default=1, help='values per user data key')
+    parser.add_argument('--meshes', type=int, default=4, help='amount of triangle meshes')
+    parser.add_argument('--plugins', type=int, nargs='*', default=[], help='announced plugin ids')
+    parser.add_argument('--unique', action='store_true', help='generate distinct data for every pixel')
+    parser.add_argument('--output', help='filepath of the rendered image')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockServer(port=args.port, sample_count=args.samples, path_depth=args.depth,
+                        values_per_key=args.values, mesh_count=args.meshes, plugins=args.plugins,
+                        unique_pixels=args.unique, output_filepath=args.output)
+    server.start()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from stream.buffer_stream import BufferStream
+from core.messages import MeshType
+import numpy as np
+import random
+
+
+# Synthetic EMCA payloads, written in the same layout as the server library (server/src/pathdata.cpp),
+# so client deserialization can be exercised without a running render system.
+
+
+def write_server_string(stream, value):
+    """
+    Writes a string the way the server does (int length followed by the raw characters)
+    :param stream: Stream
+    :param value: str
+    :return:
+    """
+    raw_value = bytes(value, "utf-8")
+    stream.write_int(len(raw_value))
+    stream.write_bytes(raw_value)
+
+
+def write_user_data(stream, rnd, values_per_key=1, keys=None):
+    """
+    Writes one UserData block, keys is a dict {type_name: [key, ...]}
+    :param stream: Stream
+    :param rnd: random.Random
+    :param values_per_key: integer
+    :param keys: dict
+    :return:
+    """
+    keys = keys or {}
+    writers = [
+        ('bool', lambda: stream.write_bool(rnd.random() < 0.5)),
+        ('float', lambda: stream.write_float(rnd.random())),
+        ('double', lambda: stream.write_double(rnd.random())),
+        ('int', lambda: stream.write_int(rnd.randint(0, 16))),
+        ('point2i', lambda: [stream.write_int(rnd.randint(0, 512)) for _ in range(2)]),
+        ('point2f', lambda: [stream.write_float(rnd.random()) for _ in range(2)]),
+        ('point3i', lambda: [stream.write_int(rnd.randint(0, 512)) for _ in range(3)]),
+        ('point3f', lambda: [stream.write_float(rnd.uniform(-1, 1)) for _ in range(3)]),
+        ('color3f', lambda: [stream.write_float(rnd.random()) for _ in range(4)]),
+        ('string', lambda: write_server_string(stream, rnd.choice(['diffuse', 'conductor', 'dielectric']))),
+    ]
+    for type_name, write_value in writers:
+        type_keys = keys.get(type_name, [])
+        stream.write_uint(len(type_keys))
+        for key in type_keys:
+            write_server_string(stream, key)
+            stream.write_uint(values_per_key)
+            for _ in range(values_per_key):
+                write_value()
+
+
+PATH_KEYS = {
+    'float': ['pathPdf'],
+    'int': ['emitterHits'],
+}
+
+INTERSECTION_KEYS = {
+    'bool': ['isSpecular'],
+    'float': ['roughness', 'bsdfPdf'],
+    'int': ['bsdfType'],
+    'point2f': ['uv'],
+    'point3f': ['normal'],
+    'color3f': ['bsdfWeight'],
+    'string': ['bsdf'],
+}
+
+
+def write_path_data(stream, rnd, sample_idx, path_depth, values_per_key=1):
+    """
+    Writes one PathData block with path_depth intersections
+    :param stream: Stream
+    :param rnd: random.Random
+    :param sample_idx: integer
+    :param path_depth: integer
+    :param values_per_key: integer
+    :return:
+    """
+    write_user_data(stream, rnd, values_per_key, PATH_KEYS)
+    stream.write_int(sample_idx)
+    stream.write_int(path_depth)
+    for _ in range(3):
+        stream.write_float(rnd.uniform(-1, 1))
+    stream.write_bool(True)
+    # heavy tailed final estimates, every now and then a firefly
+    scale = 100.0 if rnd.random() < 0.01 else 1.0
+    for _ in range(3):
+        stream.write_float(rnd.random() * scale)
+    stream.write_float(1.0)
+    stream.write_bool(True)
+    stream.write_bool(True)
+    stream.write_uint(path_depth)
+    for depth_idx in range(1, path_depth + 1):
+        stream.write_int(depth_idx)
+        write_user_data(stream, rnd, values_per_key, INTERSECTION_KEYS)
+        stream.write_int(depth_idx)
+        # intersection position
+        stream.write_bool(True)
+        for _ in range(3):
+            stream.write_float(rnd.uniform(-1, 1))
+        # next event estimation
+        stream.write_bool(True)
+        for _ in range(3):
+            stream.write_float(rnd.uniform(-1, 1))
+        stream.write_bool(rnd.random() < 0.5)
+        # envmap hit only on the last vertex
+        is_last = depth_idx == path_depth
+        stream.write_bool(is_last)
+        if is_last:
+            for _ in range(3):
+                stream.write_float(rnd.uniform(-1, 1))
+        # current estimate
+        stream.write_bool(True)
+        for _ in range(4):
+            stream.write_float(rnd.random())
+
+
+def write_render_data(stream, sample_count, path_depth=5, values_per_key=1, seed=0):
+    """
+    Writes the payload of an EMCA_HEADER_PIXEL_DATA message (without the header)
+    :param stream: Stream
+    :param sample_count: integer
+    :param path_depth: integer
+    :param values_per_key: integer
+    :param seed: integer
+    :return:
+    """
+    rnd = random.Random(seed)
+    stream.write_uint(sample_count)
+    for sample_idx in range(sample_count):
+        write_path_data(stream, rnd, sample_idx, path_depth, values_per_key)
+
+
+def render_data_payload(sample_count, path_depth=5, values_per_key=1, seed=0):
+    """
+    Returns the synthetic pixel payload as bytes
+    :return: bytes
+    """
+    stream = BufferStream()
+    write_render_data(stream, sample_count, path_depth, values_per_key, seed)
+    return stream.getvalue()
+
+
+def write_color(stream, rnd):
+    """
+    Writes a random Color3f (with alpha channel)
+    :param stream: Stream
+    :param rnd: random.Random
+    :return:
+    """
+    for _ in range(3):
+        stream.write_float(rnd.random())
+    stream.write_float(1.0)
+
+
+def write_camera(stream, origin=(0.0, -5.0, 1.0), direction=(0.0, 1.0, 0.0), up=(0.0, 0.0, 1.0), fov=45.0):
+    """
+    Writes the payload of an EMCA_HEADER_CAMERA message (without the header)
+    :param stream: Stream
+    :return:
+    """
+    stream.write_float(0.01)
+    stream.write_float(1000.0)
+    stream.write_float(5.0)
+    stream.write_float(fov)
+    for values in (up, direction, origin):
+        for value in values:
+            stream.write_float(value)
+
+
+def uv_sphere(center, radius, rings, segments):
+    """
+    Returns the vertices (float32 [n, 3]) and triangle indices (int32 [m, 3]) of a tessellated sphere
+    :param center: (x, y, z)
+    :param radius: float
+    :param rings: integer
+    :param segments: integer
+    :return: (np.array, np.array)
+    """
+    theta = np.linspace(0, np.pi, rings + 1)
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing='ij')
+    vertices = np.stack([np.sin(theta) * np.cos(phi),
+                         np.sin(theta) * np.sin(phi),
+                         np.cos(theta)], axis=-1).reshape(-1, 3) * radius + np.asarray(center)
+
+    ring = np.arange(rings)[:, None] * segments
+    seg = np.arange(segments)[None, :]
+    seg_next = (seg + 1) % segments
+    v0 = (ring + seg).reshape(-1)
+    v1 = (ring + seg_next).reshape(-1)
+    v2 = (ring + segments + seg).reshape(-1)
+    v3 = (ring + segments + seg_next).reshape(-1)
+    triangles = np.concatenate([np.stack([v0, v2, v1], axis=-1), np.stack([v1, v2, v3], axis=-1)])
+    return vertices.astype('=f4'), triangles.astype('=i4')
+
+
+def write_triangle_mesh(stream, rnd, vertices, triangles):
+    """
+    Writes the payload of an EMCA_HEADER_SCENE_DATA triangle mesh message (without the header)
+    :param stream: Stream
+    :param rnd: random.Random
+    :param vertices: float32 np.array [n, 3]
+    :param triangles: int32 np.array [m, 3]
+    :return:
+    """
+    stream.write_short(MeshType.TriangleMesh.value)
+    stream.write_uint(len(vertices))
+    stream.write_bytes(np.ascontiguousarray(vertices, '=f4').tobytes())
+    stream.write_uint(len(triangles))
+    stream.write_bytes(np.ascontiguousarray(triangles, '=i4').tobytes())
+    # specular and diffuse color
+    write_color(stream, rnd)
+    write_color(stream, rnd)
+
+
+def write_sphere(stream, rnd, center, radius):
+    """
+    Writes the payload of an EMCA_HEADER_SCENE_DATA sphere message (without the header)
+    :param stream: Stream
+    :param rnd: random.Random
+    :param center: (x, y, z)
+    :param radius: float
+    :return:
+    """
+    stream.write_short(MeshType.SphereMesh.value)
+    stream.write_float(radius)
+    for value in center:
+        stream.write_float(value)
+    # diffuse and specular color
+    write_color(stream, rnd)
+    write_color(stream, rnd)
+
+
+def scene_payloads(mesh_count, rings=32, segments=64, seed=0):
+    """
+    Returns the payloads of a synthetic scene, one per scene object:
+    tessellated spheres placed on a grid and one analytic sphere
+    :param mesh_count: amount of triangle meshes
+    :param rings: integer
+    :param segments: integer
+    :param seed: integer
+    :return: list[bytes]
+    """
+    rnd = random.Random(seed)
+    payloads = []
+    grid = max(1, int(np.ceil(np.sqrt(mesh_count))))
+    for mesh_idx in range(mesh_count):
+        center = (2.0 * (mesh_idx % grid - grid / 2), 2.0 * (mesh_idx // grid), 0.0)
+        vertices, triangles = uv_sphere(center, 0.8, rings, segments)
+        stream = BufferStream()
+        write_triangle_mesh(stream, rnd, vertices, triangles)
+        payloads.append(stream.getvalue())
+    stream = BufferStream()
+    write_sphere(stream, rnd, (0.0, 0.0, 3.0), 0.5)
+    payloads.append(stream.getvalue())
+    return payloads
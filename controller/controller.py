@@ -126,6 +126,11 @@ class Controller(QObject):
         """
         msg = tpl[0]
         logging.info('State: {}'.format(msg))
+        if msg is StateMsg.DATA_RENDER and not self._controller_stream.is_current_render_data(tpl[1]):
+            # another pixel was selected meanwhile, only the latest pixel is processed
+            logging.info('Skip render data of superseded pixel request')
+            self._controller_stream.handle_state_msg(tpl)
+            return None
         if msg is StateMsg.DATA_INFO:
             self._view.view_render_info.update_render_info(tpl[1])
         elif msg is StateMsg.DATA_IMAGE:
@@ -309,6 +314,7 @@ class Controller(QObject):
         """
         # close all views and close connection
         self._controller_stream.close()
+        self._controller_filter.close()
         self._model.plugins_handler.close()
         self._view.view_render_info.close()
         self._view.view_detector.close()
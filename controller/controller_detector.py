@@ -32,18 +32,20 @@ class ControllerDetector(object):
             if self._model.detector.is_active:
                 self.run_detector()
 
-    def update_and_run_detector(self, m, alpha, k, pre_filter, is_default, is_active):
+    def update_and_run_detector(self, m, alpha, k, pre_filter, strategy, is_active, channel, thresholds):
         """
         Saves all user changes of the detector
         :param m:
         :param alpha:
         :param k:
         :param pre_filter:
-        :param is_default:
+        :param strategy: flag of the detector strategy
         :param is_active:
+        :param channel: channel mode
+        :param thresholds: { strategy flag : threshold } of the robust strategies
         :return:
         """
-        self._model.detector.update_values(m, alpha, k, pre_filter, is_default, is_active)
+        self._model.detector.update_values(m, alpha, k, pre_filter, strategy, is_active, channel, thresholds)
         # run detector if sample contribution data is available
         if self._model.final_estimate_data.data_loaded:
             self.run_detector()
@@ -58,7 +60,7 @@ class ControllerDetector(object):
         """
         detector = self._model.detector
         if detector.is_active:
-            data = self._model.final_estimate_data.mean
+            data = self._model.final_estimate_data.plot_data_y
             path_outliers_indices = detector.run_outlier_detection(data=data)
             if len(path_outliers_indices) > 0:
                 self._controller_main.update_path(path_outliers_indices, False)
@@ -23,25 +23,35 @@
 """
 
 from filter.filter_settings import FilterSettings
+from filter.filter import Filter
+from filter.filter_query import FilterQuery
+from filter.filter_worker import FilterWorker
+from PySide2.QtCore import QObject
 from PySide2.QtCore import Slot
 from core.messages import StateMsg
 import logging
 
 
-class ControllerFilter(object):
+class ControllerFilter(QObject):
 
     """
         ControllerFilter
         Handles the core logic of the filter mechanism.
         Filters RenderData by user input.
+        Filters are evaluated by a FilterWorker thread, the results are combined within the main thread.
     """
 
     def __init__(self, parent, model, view):
+        QObject.__init__(self)
 
         self._controller_main = parent
         self._model = model
         self._view = view
 
+        self._worker = FilterWorker()
+        self._worker.set_callbacks(self.handle_progress, self.handle_result)
+        self._worker.start()
+
     def handle_state_msg(self, tpl):
         """
         Handle current state, messages mostly received from thread,
@@ -53,9 +63,54 @@ class ControllerFilter(object):
         if msg is StateMsg.DATA_RENDER:
             # if filter is enabled filter RenderData and send update to MainController.
             if self._view.view_filter.is_active():
-                render_data = self._model.render_data
-                xs = self._model.filter.apply_filters(render_data)
-                self._controller_main.update_path(xs, False)
+                self.run_filters()
+
+    def run_filters(self):
+        """
+        Evaluates all filters which are not evaluated for the current render data yet in the background,
+        a running evaluation is cancelled. The result is sent to the MainController
+        :return:
+        """
+        render_data = self._model.render_data
+        if render_data is None:
+            return
+        pending = self._model.filter.pending_filters(render_data)
+        if not pending:
+            self._worker.cancel()
+            self._view.view_filter.hide_progress()
+            xs = self._model.filter.set_masks(render_data, {})
+            self._controller_main.update_path(xs, False)
+            return
+        self._view.view_filter.show_progress(0, len(pending))
+        self._worker.submit(render_data, pending)
+
+    @Slot(int, int, int, name='handle_progress')
+    def handle_progress(self, job_id, done, total):
+        """
+        Shows the progress of the running filter evaluation
+        :param job_id: integer
+        :param done: amount of evaluated filters
+        :param total: amount of filters
+        :return:
+        """
+        if self._worker.is_current(job_id):
+            self._view.view_filter.show_progress(done, total)
+
+    @Slot(int, object, name='handle_result')
+    def handle_result(self, job_id, result):
+        """
+        Combines the evaluated filter masks and sends the filtered paths to the MainController.
+        Results of cancelled evaluations or of render data which is not displayed anymore are dropped
+        :param job_id: integer
+        :param result: (RenderData, {filter_idx : mask})
+        :return:
+        """
+        render_data, masks = result
+        if not self._worker.is_current(job_id) or render_data is not self._model.render_data:
+            return
+        self._view.view_filter.hide_progress()
+        xs = self._model.filter.set_masks(render_data, masks)
+        self._controller_main.update_path(xs, False)
 
     @Slot(bool, name='add_filter')
     def add_filter(self, clicked):
@@ -68,12 +123,29 @@ class ControllerFilter(object):
         if not self._view.view_filter.is_line_edit_empty(idx):
             fs = FilterSettings(self._view.view_filter)
             self._view.view_filter.add_filter_to_view(fs)
-            render_data = self._model.render_data
-            xs = self._model.filter.filter(fs, render_data)
-            if xs is None:
-                logging.error("Issue with filter ...")
-                return
-            self._controller_main.update_path(xs, False)
+            self._model.filter.add_filter(fs)
+            self.run_filters()
+
+    @Slot(bool, name='add_query')
+    def add_query(self, clicked):
+        """
+        Adds a filter query to the current render data
+        :param clicked:
+        :return:
+        """
+        view_filter = self._view.view_filter
+        text = view_filter.leQuery.text().strip()
+        if text == "":
+            return
+        try:
+            query = FilterQuery(text, view_filter.next_filter_idx())
+        except ValueError as e:
+            logging.error("Invalid filter query: {}".format(e))
+            self._view.view_popup.error_invalid_filter_query(str(e))
+            return
+        view_filter.add_filter_to_view(query)
+        self._model.filter.add_filter(query)
+        self.run_filters()
 
     @Slot(bool, name='apply_filters')
     def apply_filters(self, clicked):
@@ -83,11 +155,29 @@ class ControllerFilter(object):
         :return:
         """
         if self._view.view_filter.filterList.count() > 0:
-            render_data = self._model.render_data
-            xs = self._model.filter.apply_filters(render_data)
+            self.run_filters()
+
+    def toggle_filter(self, idx, active):
+        """
+        Switches a filter on or off and updates the filtered render data
+        :param idx: filter index
+        :param active: boolean
+        :return:
+        """
+        xs = self._model.filter.toggle_filter(idx, active)
+        self._controller_main.update_path(xs, False)
+
+    @Slot(int, name='set_composition')
+    def set_composition(self, index):
+        """
+        Sets if paths have to satisfy all active filters (index 0) or any of them (index 1)
+        and updates the filtered render data
+        :param index: index of the composition combo box
+        :return:
+        """
+        xs = self._model.filter.set_composition(Filter.OR if index == 1 else Filter.AND)
+        if self._view.view_filter.filterList.count() > 0:
             self._controller_main.update_path(xs, False)
-        else:
-            pass
 
     @Slot(bool, name='clear_filter')
     def clear_filter(self, clicked):
@@ -96,6 +186,8 @@ class ControllerFilter(object):
         :param clicked: boolean
         :return:
         """
+        self._worker.cancel()
+        self._view.view_filter.hide_progress()
         self._model.filter.clear_all()
         self._view.view_filter.filterList.clear()
 
@@ -116,3 +208,10 @@ class ControllerFilter(object):
                 xs = self._model.filter.delete_filter(w.get_idx())
                 self._controller_main.update_path(xs, False)
                 del i
+
+    def close(self):
+        """
+        Stops the filter worker thread
+        :return:
+        """
+        self._worker.stop()
@@ -1,4 +1,6 @@
 from stream.socket_stream_client import SocketStreamClient
+from model.render_data_disk_cache import RenderDataDiskCache
+from model.mesh_cache import MeshCache
 from core.messages import StateMsg
 from PySide2.QtCore import Slot
 import logging
@@ -37,7 +39,18 @@ class ControllerSocketStream(object):
             self._view.view_emca.enable_view(True)
             self._view.view_render_scene.enable_view(True)
             self._model.plugins_handler.enable_plugins(True)
+        elif msg in (StateMsg.DATA_RENDER, StateMsg.DATA_RENDER_CACHED, StateMsg.DATA_RENDER_CANCELLED):
+            # a response was consumed, keep the server busy with the next pending pixel
+            self._sstream_client.scheduler.dispatch()
+        elif msg is StateMsg.DATA_SCENE_HASH:
+            # the geometry is only transferred if it is not cached yet
+            if tpl[1] and self._model.load_cached_scene():
+                self._sstream_client.request_camera_data()
+            else:
+                self._sstream_client.request_scene_data()
         elif msg is StateMsg.DISCONNECT:
+            self._sstream_client.scheduler.clear()
+            self._sstream_client.scheduler.cache.clear()
             self._view.view_emca.enable_view(False)
             self._view.view_render_image.enable_view(False)
             self._view.view_render_scene.enable_view(False)
@@ -70,6 +83,19 @@ class ControllerSocketStream(object):
         :return:
         """
         self._model.options_data.set_last_hostname_and_port(hostname, port)
+        self._sstream_client.set_decode_in_process(self._model.options_data.get_option_decode_in_process())
+        options_data = self._model.options_data
+        cache = self._sstream_client.scheduler.cache
+        cache.max_bytes = options_data.get_option_render_data_cache_size() * 1024 * 1024
+        if options_data.get_option_render_data_disk_cache():
+            cache.disk_cache = RenderDataDiskCache(options_data.get_option_render_data_disk_cache_dir(),
+                                                   options_data.get_option_render_data_disk_cache_size() * 1024 * 1024)
+        else:
+            cache.disk_cache = None
+        if options_data.get_option_mesh_cache():
+            self._model.mesh_cache = MeshCache(options_data.get_option_mesh_cache_dir())
+        else:
+            self._model.mesh_cache = None
         is_connected, error_msg = self._sstream_client.connect_socket_stream(hostname, port)
         if not is_connected and error_msg:
             self._view.view_popup.server_error(error_msg)
@@ -78,6 +104,29 @@ class ControllerSocketStream(object):
         self._sstream_client.start()
         return is_connected
 
+    def record_session(self, filename):
+        """
+        Records the data of the next session to filename, None disables recording
+        :param filename: str|None
+        :return:
+        """
+        self._sstream_client.record_session(filename)
+
+    def replay_session(self, filename):
+        """
+        Replays a recorded session without a running server.
+        Starts the Thread which handles the recorded messages
+        :param filename: str
+        :return:
+        """
+        is_connected, error_msg = self._sstream_client.replay_session(filename)
+        if not is_connected and error_msg:
+            self._view.view_popup.server_error(error_msg)
+            return is_connected
+
+        self._sstream_client.start()
+        return is_connected
+
     def request_render_info(self):
         """
         Requests the render info data from the server interface
@@ -98,7 +147,10 @@ class ControllerSocketStream(object):
         :return:
         """
         self._view.view_render_scene.clear_scene_objects()
-        self._sstream_client.request_scene_data()
+        if self._model.server_supports_scene_hash and self._model.mesh_cache is not None:
+            self._sstream_client.request_scene_hash()
+        else:
+            self._sstream_client.request_scene_data()
 
     def request_render_data(self, pixel):
         """
@@ -121,7 +173,33 @@ class ControllerSocketStream(object):
         pixel_icon.set_pixel(pixmap, pixel)
         sample_count = self._model.render_info.sample_count
         self._view.view_emca.update_pixel_hist(pixel_icon)
-        self._sstream_client.request_render_data(pixel, sample_count)
+        render_data = self._sstream_client.request_render_data(pixel, sample_count)
+        if render_data is not None:
+            # pixel was already received, no need to ask the server again
+            self._sstream_client.display_render_data(render_data)
+
+    def is_current_render_data(self, render_data):
+        """
+        Returns if the render data belongs to the latest requested pixel
+        :param render_data: RenderData
+        :return: boolean
+        """
+        return self._sstream_client.scheduler.is_current(render_data)
+
+    def request_render_data_batch(self, pixels):
+        """
+        Requests the render data of several pixels (e.g. a row or region of interest),
+        the results are only cached and displayed once the pixel is selected
+        :param pixels: [(x,y), ...]
+        :return:
+        """
+        if not self._sstream_client.is_connected():
+            self._view.view_popup.error_not_connected("")
+            return None
+
+        sample_count = self._model.render_info.sample_count
+        self._sstream_client.scheduler.request_batch(pixels, sample_count)
+        self._sstream_client.scheduler.dispatch()
 
     def request_plugin(self, flag):
         """
@@ -22,28 +22,19 @@
     SOFTWARE.
 """
 
+from core.value import Value
 import numpy as np
 import abc
 
 
-class Color(object):
+class Color(Value):
 
     """
         Color
         Represents the base class of the color type classes
     """
 
-    def __init__(self, data):
-        self.data = data
-        self.decimals = 2
-
-    @property
-    def digits(self):
-        return self.decimals
-
-    @digits.setter
-    def digits(self, new_digits):
-        self.decimals = new_digits
+    __slots__ = ()
 
     @abc.abstractmethod
     def to_string(self):
@@ -33,57 +33,56 @@ class Color3f(Color):
         Represents a red, green, blue, alpha color class
     """
 
+    __slots__ = ()
+
+    _dtype = np.float32
+    _data_size = 3
+
     def __init__(self, r=0, g=0, b=0, alpha=0):
-        super(Color3f, self).__init__(np.array([r, g, b], dtype=np.float32))
-        self._r = float(r)
-        self._g = float(g)
-        self._b = float(b)
-        self._alpha = float(alpha)
+        self._init_values((float(r), float(g), float(b), float(alpha)))
 
     @property
     def red(self):
-        return self._r
+        return self._get(0)
 
     @red.setter
     def red(self, new_red):
-        self._r = float(new_red)
-        self.data[0] = self._r
+        self._set(0, float(new_red))
 
     @property
     def green(self):
-        return self._g
+        return self._get(1)
 
     @green.setter
     def green(self, new_green):
-        self._g = float(new_green)
-        self.data[1] = self._g
+        self._set(1, float(new_green))
 
     @property
     def blue(self):
-        return self._b
+        return self._get(2)
 
     @blue.setter
     def blue(self, new_blue):
-        self._b = float(new_blue)
-        self.data[2] = self._b
+        self._set(2, float(new_blue))
 
     @property
     def alpha(self):
-        return self._alpha
+        return self._get(3)
 
     @alpha.setter
     def alpha(self, new_alpha):
-        self._alpha = new_alpha
+        self._set(3, new_alpha)
 
     @property
     def mean(self):
-        return (self._r + self._g + self._b) / 3.0
+        r, g, b, _ = self.to_tuple()
+        return (r + g + b) / 3.0
 
     def to_list(self):
-        return [self._r, self._g, self._b, self._alpha]
+        return list(self.to_tuple())
 
     def to_list_rgb(self):
-        return [self._r, self._g, self._b]
+        return list(self.to_tuple()[:3])
 
     def to_string(self):
         return '[{}, {}, {}, {}]'.format(self.data[0],
@@ -99,7 +98,7 @@ class Color3f(Color):
 
     def __getitem__(self, item):
         if item == 3:
-            return self._alpha
+            return self.alpha
         return self.data[item]
 
 
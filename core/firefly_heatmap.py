@@ -0,0 +1,156 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from PIL import Image
+from PIL.ImageQt import ImageQt as PilImageQt
+from PySide2.QtGui import QPixmap
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+class FireflyHeatmap(object):
+
+    """
+        FireflyHeatmap
+        Scores every pixel of a rendered image by how far it exceeds the median of its neighbourhood.
+        Scores are robust z-scores of the log2 luminance, the neighbourhood median and
+        median absolute deviation are approximated by separable (row, then column) median filters.
+        Pixels with high scores are firefly candidates worth requesting from the server.
+    """
+
+    # Rec. 709 luminance weights
+    LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+    def __init__(self, radius=2, min_scale=0.5, threshold=3.0):
+        # neighbourhood is (2 * radius + 1)^2 pixels
+        self._radius = radius
+        # lower bound of the deviation scale in stops, avoids infinite scores in flat regions
+        self._min_scale = min_scale
+        # pixels scoring at least threshold are candidates
+        self._threshold = threshold
+        self._scores = None
+
+    @property
+    def scores(self):
+        """
+        Returns the firefly scores as (height, width) numpy array or None
+        :return:
+        """
+        return self._scores
+
+    @property
+    def threshold(self):
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, threshold):
+        self._threshold = threshold
+
+    def clear(self):
+        """
+        Clears the computed scores
+        :return:
+        """
+        self._scores = None
+
+    @staticmethod
+    def median_of(values):
+        """
+        Returns the elementwise median of an odd amount of equally shaped arrays.
+        Partial selection sort with np.minimum and np.maximum, which is much faster than np.median for small windows
+        :param values: list of numpy arrays
+        :return: numpy array
+        """
+        values = list(values)
+        k = len(values)
+        # after pass i values[i] holds the i-th smallest value
+        for i in range(k // 2 + 1):
+            for j in range(i + 1, k):
+                lo = np.minimum(values[i], values[j])
+                values[j] = np.maximum(values[i], values[j])
+                values[i] = lo
+        return values[k // 2]
+
+    @staticmethod
+    def separable_median(image, radius):
+        """
+        Approximates a (2r+1)x(2r+1) median filter by a horizontal and a vertical (2r+1) median filter,
+        borders are extended
+        :param image: (height, width) numpy array
+        :param radius: integer
+        :return: (height, width) numpy array
+        """
+        height, width = image.shape
+        size = 2 * radius + 1
+        padded = np.pad(image, ((0, 0), (radius, radius)), mode='edge')
+        rows = FireflyHeatmap.median_of(padded[:, i:i + width] for i in range(size))
+        padded = np.pad(rows, ((radius, radius), (0, 0)), mode='edge')
+        return FireflyHeatmap.median_of(padded[i:i + height] for i in range(size))
+
+    def compute(self, r, g, b):
+        """
+        Computes the firefly score of every pixel
+        :param r: (height, width) numpy array
+        :param g: (height, width) numpy array
+        :param b: (height, width) numpy array
+        :return: (height, width) numpy array
+        """
+        wr, wg, wb = FireflyHeatmap.LUMINANCE_WEIGHTS
+        luminance = wr * r + wg * g + wb * b
+        log_luminance = np.log2(np.maximum(luminance, 1e-4), dtype=np.float32)
+        median = self.separable_median(log_luminance, self._radius)
+        deviation = log_luminance - median
+        mad = self.separable_median(np.abs(deviation), self._radius)
+        self._scores = np.maximum(deviation, 0.0) / (1.4826 * mad + self._min_scale)
+        return self._scores
+
+    def candidates(self, count=50):
+        """
+        Returns up to count pixels scoring at least the threshold, highest scores first
+        :param count: integer
+        :return: [(x, y, score), ...]
+        """
+        if self._scores is None:
+            return []
+        width = self._scores.shape[1]
+        flat = self._scores.ravel()
+        indices = np.flatnonzero(flat >= self._threshold)
+        if len(indices) > count:
+            indices = indices[np.argpartition(flat[indices], -count)[-count:]]
+        indices = indices[np.argsort(-flat[indices], kind='stable')]
+        return [(int(i % width), int(i // width), float(flat[i])) for i in indices]
+
+    def create_pixmap(self):
+        """
+        Returns the scores as semi transparent heatmap, pixels below half the threshold are transparent
+        :return: QPixmap or None
+        """
+        if self._scores is None:
+            return None
+        normalized = np.clip(self._scores / (2.0 * self._threshold), 0.0, 1.0)
+        rgba = np.array(plt.get_cmap('inferno')(normalized), dtype=np.float32)
+        rgba[..., 3] = np.clip(2.0 * normalized - 0.5, 0.0, 1.0)
+        rgba = np.uint8(rgba * 255.0)
+        q_img = PilImageQt(Image.fromarray(rgba, 'RGBA'))
+        return QPixmap.fromImage(q_img).copy()
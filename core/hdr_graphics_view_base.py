@@ -195,10 +195,8 @@ class HDRGraphicsViewBase(QGraphicsView):
         Updates the render image in the view
         :return:
         """
-        items_list = self._scene.items()
-        for item in items_list:
-            if isinstance(item, QGraphicsPixmapItem):
-                item.setPixmap(pixmap)
+        if self._pixmap_item:
+            self._pixmap_item.setPixmap(pixmap)
 
     def load_hdr_image(self, filepath, falsecolor=False):
         """
@@ -28,7 +28,6 @@ from PIL import Image
 from PIL.ImageQt import ImageQt as PilImageQt
 from PySide2.QtGui import QPixmap
 from enum import Enum
-import array
 import numpy as np
 import matplotlib.pyplot as plt
 import logging
@@ -54,6 +53,12 @@ class HDRImage(object):
         self._pixmap = None
         self._exposure = 0.0
         self._falsecolor = False
+        # linear (height, width, 3) float32 channels, decoded once per image
+        self._rgb = None
+        # exposure independent lookup indices of the channels for srgb tone mapping
+        self._srgb_index = None
+        # exposure independent log2 of the average intensity for falsecolor tone mapping
+        self._log_intensity = None
 
     @property
     def filepath(self):
@@ -74,6 +79,9 @@ class HDRImage(object):
             if self._exr:
                 del self._exr
                 self._exr = None
+            self._rgb = None
+            self._srgb_index = None
+            self._log_intensity = None
             self._filepath = filepath_or_bytestream
             self._falsecolor = falsecolor
             self._exr = OpenEXR.InputFile(filepath_or_bytestream)
@@ -82,6 +90,39 @@ class HDRImage(object):
             logging.error(e)
             return False
 
+    @property
+    def size(self):
+        """
+        Returns the size of the image
+        :return: (width, height)
+        """
+        dw = self._exr.header()['dataWindow']
+        return dw.max.x - dw.min.x + 1, dw.max.y - dw.min.y + 1
+
+    @property
+    def linear_rgb(self):
+        """
+        Returns the linear channels of the image as contiguous (height, width, 3) float32 numpy array,
+        the channels are only decoded from the exr file the first time
+        :return: numpy array
+        """
+        if self._rgb is None:
+            pt = Imath.PixelType(Imath.PixelType.FLOAT)
+            width, height = self.size
+            rgb = np.empty((height, width, 3), dtype=np.float32)
+            for i, channel in enumerate(('R', 'G', 'B')):
+                rgb[..., i] = np.frombuffer(self._exr.channel(channel, pt), dtype=np.float32).reshape(height, width)
+            self._rgb = rgb
+        return self._rgb
+
+    def rgb(self):
+        """
+        Returns the r, g and b channel of the image as (height, width) numpy arrays
+        :return: (r, g, b)
+        """
+        rgb = self.linear_rgb
+        return rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
     def is_pixmap_set(self):
         return self._pixmap is not None
 
@@ -102,22 +143,10 @@ class HDRImage(object):
         if self._pixmap is None:
             #update pixmap if needed
             try:
-                pt = Imath.PixelType(Imath.PixelType.FLOAT)
-
-                r_str = self._exr.channel('R', pt)
-                g_str = self._exr.channel('G', pt)
-                b_str = self._exr.channel('B', pt)
-
-                r = np.array(array.array('f', r_str), 'f')
-                g = np.array(array.array('f', g_str), 'f')
-                b = np.array(array.array('f', b_str), 'f')
-
-                (r_exp, g_exp, b_exp) = self.apply_exposure(r, g, b)
-
                 if self._falsecolor:
-                    self._pixmap = self.create_pixmap_fc(r_exp, g_exp, b_exp)
+                    self._pixmap = self.create_pixmap_fc()
                 else:
-                    self._pixmap = self.create_pixmap_srgb(r_exp, g_exp, b_exp)
+                    self._pixmap = self.create_pixmap_srgb()
             except Exception as e:
                 logging.error("Error " + str(e))
 
@@ -143,56 +172,56 @@ class HDRImage(object):
             self._pixmap = None
         self._falsecolor = falsecolor
 
-    def apply_exposure(self, r, g, b):
-        if self._exposure == 0.0:
-            return r, g, b
-
-        factor = np.power(2.0, self._exposure)
-
-        r_exp = r*factor
-        g_exp = g*factor
-        b_exp = b*factor
-
-        return r_exp, g_exp, b_exp
-
-    def create_pixmap_srgb(self, r_exp, g_exp, b_exp):
+    @staticmethod
+    def srgb_lut(exposure):
         """
-        Converts an srgb image to a pixmap
-        :param r_exp:
-        :param g_exp:
-        :param b_exp:
-        :return: QPixmap
+        Returns the srgb tone mapping lookup table of the given exposure.
+        The table is indexed by the upper 16 bits of a float32 (sign, exponent and 7 mantissa bits),
+        every entry holds the tone mapped value of the center of its bin
+        :param exposure: float
+        :return: numpy uint8 array
         """
+        bits = np.arange(1 << 16, dtype=np.uint32) << 16
+        # center of the bin, inf and nan bins are kept as they are
+        bits = np.where((bits & np.uint32(0x7f800000)) != np.uint32(0x7f800000), bits | np.uint32(1 << 15), bits)
 
         #even though this is 2.4, this corresponds to a gamma value of 2.2
         invSRGBGamma = 1.0/2.4
 
-        r_gamma = np.where(r_exp > 0.0031308, ((255.0 * 1.055) * np.power(r_exp, invSRGBGamma) - 0.055), r_exp * (12.92 * 255.0))
-        g_gamma = np.where(g_exp > 0.0031308, ((255.0 * 1.055) * np.power(g_exp, invSRGBGamma) - 0.055), g_exp * (12.92 * 255.0))
-        b_gamma = np.where(b_exp > 0.0031308, ((255.0 * 1.055) * np.power(b_exp, invSRGBGamma) - 0.055), b_exp * (12.92 * 255.0))
-
-        dw = self._exr.header()['dataWindow']
-        size = (dw.max.x - dw.min.x + 1, dw.max.y - dw.min.y + 1)
-
-        srgb = np.uint8([np.uint8(np.clip(r_gamma, 0.0, 255.0)),
-                         np.uint8(np.clip(g_gamma, 0.0, 255.0)),
-                         np.uint8(np.clip(b_gamma, 0.0, 255.0))]).transpose().reshape([size[1], size[0], 3])
+        with np.errstate(invalid='ignore', over='ignore'):
+            x = bits.view(np.float32).astype(np.float64) * np.power(2.0, exposure)
+            gamma = np.where(x > 0.0031308, ((255.0 * 1.055) * np.power(x, invSRGBGamma) - 0.055), x * (12.92 * 255.0))
+        return np.uint8(np.clip(np.nan_to_num(gamma, nan=0.0), 0.0, 255.0))
 
+    def create_pixmap_srgb(self):
+        """
+        Converts the image with the current exposure to a srgb pixmap,
+        only the lookup table is recomputed if the exposure changes
+        :return: QPixmap
+        """
+        if self._srgb_index is None:
+            self._srgb_index = (self.linear_rgb.view(np.uint32) >> 16).astype(np.uint16)
+        srgb = self.srgb_lut(self._exposure)[self._srgb_index]
         q_img = PilImageQt(Image.fromarray(srgb, 'RGB'))
         return QPixmap.fromImage(q_img).copy()
 
-    def create_pixmap_fc(self, r_exp, g_exp, b_exp):
-
-        #max_intensity = np.max([r_exp,g_exp,b_exp], axis=0)
-        avg_intensity = (r_exp+g_exp+b_exp)/3
-        log_intensity = np.where(avg_intensity > 0.0, np.log2(avg_intensity), -float('inf'))/10.0+0.5
+    def create_pixmap_fc(self):
+        """
+        Converts the log2 average intensity with the current exposure to a falsecolor pixmap
+        :return: QPixmap
+        """
+        if self._log_intensity is None:
+            #max_intensity = np.max(self.linear_rgb, axis=2)
+            avg_intensity = self.linear_rgb.mean(axis=2)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self._log_intensity = np.where(avg_intensity > 0.0, np.log2(avg_intensity), -np.inf).astype(np.float32)
 
         cmap = plt.get_cmap('viridis')
+        colors = np.uint8(cmap(np.arange(cmap.N))[:, :3]*255.0)
 
-        dw = self._exr.header()['dataWindow']
-        size = (dw.max.x - dw.min.x + 1, dw.max.y - dw.min.y + 1)
-
-        srgb = np.uint8(np.array(cmap(log_intensity))[:,:3]*255.0).reshape([size[1], size[0], 3])
+        # same binning as the colormap, values outside of [0, 1] take the first or last color
+        log_intensity = ((self._log_intensity + np.float32(self._exposure))/10.0+0.5)*cmap.N
+        srgb = colors[np.clip(log_intensity, 0, cmap.N - 1).astype(np.uint8)]
         q_img = PilImageQt(Image.fromarray(srgb, 'RGB'))
         return QPixmap.fromImage(q_img).copy()
 
@@ -204,12 +233,10 @@ class HDRImage(object):
         :return:
         """
         try:
-            dw = self._exr.header()['dataWindow']
-            size = (dw.max.x - dw.min.x + 1, dw.max.y - dw.min.y + 1)
+            size = self.size
 
-            # Read the three color channels as 32-bit floats
-            FLOAT = Imath.PixelType(Imath.PixelType.FLOAT)
-            (R, G, B) = [array.array('f', self._exr.channel(Chan, FLOAT)).tolist() for Chan in ("R", "G", "B")]
+            # the three color channels as 32-bit floats
+            (R, G, B) = [np.ascontiguousarray(self.linear_rgb[..., i]) for i in range(3)]
 
             """
             # Normalize so that brightest sample is 1
@@ -219,10 +246,10 @@ class HDRImage(object):
             B = [i / brightest for i in B]
             """
 
-            (Rs, Gs, Bs) = [array.array('f', Chan).tostring() for Chan in (R, G, B)]
+            (Rs, Gs, Bs) = [Chan.tobytes() for Chan in (R, G, B)]
 
             out = OpenEXR.OutputFile(filename, OpenEXR.Header(size[0], size[1]))
-            out.writePixels({'R': Rs, 'G': Gs, 'B': Gs})
+            out.writePixels({'R': Rs, 'G': Gs, 'B': Bs})
             return True
         except Exception as e:
             logging.error(e)
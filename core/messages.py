@@ -44,6 +44,9 @@ class StateMsg(Enum):
     UPDATE_PLUGIN       = 11
     SUPPORTED_PLUGINS   = 12
     QUIT                = 13
+    DATA_RENDER_CACHED  = 14
+    DATA_RENDER_CANCELLED = 15
+    DATA_SCENE_HASH     = 16
 
 
 class ServerMsg(Enum):
@@ -55,6 +58,9 @@ class ServerMsg(Enum):
     EMCA_HEADER_SCENE_DATA       = 0x000F
     EMCA_HEADER_CAMERA           = 0x0010
     EMCA_SUPPORTED_PLUGINS       = 0x0011
+    EMCA_HEADER_SCENE_HASH       = 0x0012
+    # capabilities follow the supported plugins without payload, unknown ones are skipped
+    EMCA_CAPABILITY_SCENE_HASH   = 0x0013
     EMCA_NO_VALID_DATA           = 0x01A4
     EMCA_DISCONNECT              = 0x1bcc
     EMCA_QUIT                    = 0x1bcd
@@ -70,6 +76,8 @@ class ServerMsg(Enum):
             0x000F: ServerMsg.EMCA_HEADER_SCENE_DATA,
             0x0010: ServerMsg.EMCA_HEADER_CAMERA,
             0x0011: ServerMsg.EMCA_SUPPORTED_PLUGINS,
+            0x0012: ServerMsg.EMCA_HEADER_SCENE_HASH,
+            0x0013: ServerMsg.EMCA_CAPABILITY_SCENE_HASH,
             0x01A4: ServerMsg.EMCA_NO_VALID_DATA,
             0x1bcc: ServerMsg.EMCA_DISCONNECT,
             0x1bcd: ServerMsg.EMCA_QUIT
@@ -33,66 +33,67 @@ class Point2f(Point):
         Represents a point2 float class
     """
 
+    __slots__ = ()
+
+    _dtype = np.float32
+
     def __init__(self, x=0, y=0):
-        super(Point2f, self).__init__(np.array([x, y], dtype=np.float32))
-        self._x = float(x)
-        self._y = float(y)
+        self._init_values((float(x), float(y)))
 
     @property
     def x(self):
-        return self._x
+        return self._get(0)
 
     @x.setter
     def x(self, new_x):
-        self._x = float(new_x)
-        self.data[0] = self._x
+        self._set(0, float(new_x))
 
     @property
     def y(self):
-        return self._y
+        return self._get(1)
 
     @y.setter
     def y(self, new_y):
-        self._y = float(new_y)
-        self.data[1] = self._y
+        self._set(1, float(new_y))
 
     def to_string(self):
-        return '[{}, {}]'.format(self._x, self._y)
+        return '[{}, {}]'.format(self.x, self.y)
 
     def __str__(self):
         return '[{1:.{0}f}, {2:.{0}f}]'.format(self.decimals,
-                                               self._x,
-                                               self._y)
+                                               self.x,
+                                               self.y)
 
 
 class Point2i(Point):
+
+    __slots__ = ()
+
+    _dtype = np.int32
+
     def __init__(self, x, y):
-        self._x = int(x)
-        self._y = int(y)
-        super(Point2i, self).__init__(np.array([x, y], dtype=np.int32))
+        self._init_values((int(x), int(y)))
 
     @property
     def x(self):
-        return self._x
+        return self._get(0)
 
     @x.setter
     def x(self, new_x):
-        self._x = int(new_x)
-        self.data[0] = self._x
+        self._set(0, int(new_x))
 
     @property
     def y(self):
-        return self._y
+        return self._get(1)
 
     @y.setter
     def y(self, new_y):
-        self._y = int(new_y)
-        self.data[1] = self._y
+        self._set(1, int(new_y))
 
     def to_string(self):
-        return '[{}, {}]'.format(self._x, self._y)
+        return '[{}, {}]'.format(self.x, self.y)
 
     def __str__(self):
         return '[{1:.{0}f}, {2:.{0}f}]'.format(self.decimals,
-                                               self._x,
-                                               self._y)
+                                               self.x,
+                                               self.y)
@@ -34,38 +34,36 @@ class Point3f(Point):
         Represents a point3 float class
     """
 
+    __slots__ = ()
+
+    _dtype = np.float32
+
     def __init__(self, x=0, y=0, z=0):
-        super(Point3f, self).__init__(np.array([x, y, z], dtype=np.float32))
-        self._x = float(x)
-        self._y = float(y)
-        self._z = float(z)
+        self._init_values((float(x), float(y), float(z)))
 
     @property
     def x(self):
-        return self._x
+        return self._get(0)
 
     @x.setter
     def x(self, new_x):
-        self._x = float(new_x)
-        self.data[0] = self._x
+        self._set(0, float(new_x))
 
     @property
     def y(self):
-        return self._y
+        return self._get(1)
 
     @y.setter
     def y(self, new_y):
-        self._y = float(new_y)
-        self.data[1] = self._y
+        self._set(1, float(new_y))
 
     @property
     def z(self):
-        return self._z
+        return self._get(2)
 
     @z.setter
     def z(self, new_z):
-        self._z = float(new_z)
-        self.data[2] = self._z
+        self._set(2, float(new_z))
 
     def dir_to(self, dest):
         if dest is None:
@@ -75,13 +73,13 @@ class Point3f(Point):
         return Vec3f(dir_vec_norm[0], dir_vec_norm[1], dir_vec_norm[2])
 
     def to_string(self):
-        return '[{}, {}, {}]'.format(self._x, self._y, self._z)
+        return '[{}, {}, {}]'.format(self.x, self.y, self.z)
 
     def __str__(self):
         return '[{1:.{0}f}, {2:.{0}f}, {3:.{0}f}]'.format(self.decimals,
-                                                          self._x,
-                                                          self._y,
-                                                          self._z)
+                                                          self.x,
+                                                          self.y,
+                                                          self.z)
 
 
 class Point3i(Point):
@@ -91,44 +89,42 @@ class Point3i(Point):
         Represents point3 integer class
     """
 
+    __slots__ = ()
+
+    _dtype = np.int32
+
     def __init__(self, x=0, y=0, z=0):
-        super(Point3i, self).__init__(np.array([x, y, z], dtype=np.int32))
-        self._x = int(x)
-        self._y = int(y)
-        self._z = int(z)
+        self._init_values((int(x), int(y), int(z)))
 
     @property
     def x(self):
-        return self._x
+        return self._get(0)
 
     @x.setter
     def x(self, new_x):
-        self._x = int(new_x)
-        self.data[0] = self._x
+        self._set(0, int(new_x))
 
     @property
     def y(self):
-        return self._y
+        return self._get(1)
 
     @y.setter
     def y(self, new_y):
-        self._y = int(new_y)
-        self.data[1] = self._y
+        self._set(1, int(new_y))
 
     @property
     def z(self):
-        return self._z
+        return self._get(2)
 
     @z.setter
     def z(self, new_z):
-        self._z = int(new_z)
-        self.data[2] = self._z
+        self._set(2, int(new_z))
 
     def to_string(self):
-        return '[{}, {}, {}]'.format(self._x, self._y, self._z)
+        return '[{}, {}, {}]'.format(self.x, self.y, self.z)
 
     def __str__(self):
         return '[{1:.{0}f}, {2:.{0}f}, {3:.{0}f}]'.format(self.decimals,
-                                                          self._x,
-                                                          self._y,
-                                                          self._z)
+                                                          self.x,
+                                                          self.y,
+                                                          self.z)
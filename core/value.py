@@ -0,0 +1,133 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import numpy as np
+
+
+class Value(object):
+
+    """
+        Value
+        Base class of the small value types (points, vectors and colors).
+        Components are stored once, either as tuple of python numbers
+        or as row of an existing numpy array which is wrapped without copying (see from_rows).
+        The numpy representation (data) is created on first access.
+        Values are meant to be immutable, setting a component copies the components into a new tuple
+        and never writes into a wrapped array.
+    """
+
+    __slots__ = ('_values', '_array', '_row', 'decimals')
+
+    # numpy type of the data representation
+    _dtype = None
+    # amount of components within data, None for all (colors keep alpha outside of data)
+    _data_size = None
+
+    def __init__(self, data):
+        self._values = None
+        self._array = np.asarray(data)
+        self._row = None
+        self.decimals = 2
+
+    def _init_values(self, values):
+        self._values = values
+        self._array = None
+        self._row = None
+        self.decimals = 2
+
+    @classmethod
+    def from_row(cls, array, row):
+        """
+        Wraps one row of a two dimensional array without copying
+        :param array: numpy array [n, components]
+        :param row: integer
+        :return: Value
+        """
+        value = cls.__new__(cls)
+        value._values = None
+        value._array = array
+        value._row = row
+        value.decimals = 2
+        return value
+
+    @classmethod
+    def from_rows(cls, array):
+        """
+        Wraps all rows of a two dimensional array, no component is copied
+        :param array: numpy array [n, components]
+        :return: list
+        """
+        from_row = cls.from_row
+        return [from_row(array, row) for row in range(len(array))]
+
+    @property
+    def digits(self):
+        return self.decimals
+
+    @digits.setter
+    def digits(self, new_digits):
+        self.decimals = new_digits
+
+    @property
+    def data(self):
+        """
+        Returns the components as numpy array
+        :return: numpy array
+        """
+        if self._row is not None:
+            return self._array[self._row, :self._data_size]
+        if self._array is None:
+            self._array = np.array(self._values[:self._data_size], dtype=self._dtype)
+        return self._array
+
+    @data.setter
+    def data(self, data):
+        self._values = None
+        self._array = np.asarray(data)
+        self._row = None
+
+    def _get(self, index):
+        if self._values is not None:
+            return self._values[index]
+        if self._row is not None:
+            return self._array[self._row, index].item()
+        return self._array[index].item()
+
+    def _set(self, index, value):
+        values = list(self.to_tuple())
+        values[index] = value
+        decimals = self.decimals
+        self._init_values(tuple(values))
+        self.decimals = decimals
+
+    def to_tuple(self):
+        """
+        Returns all components as tuple of python numbers
+        :return: tuple
+        """
+        if self._values is not None:
+            return self._values
+        if self._row is not None:
+            return tuple(self._array[self._row].tolist())
+        return tuple(self._array.tolist())
@@ -22,29 +22,20 @@
     SOFTWARE.
 """
 
+from core.value import Value
 import numpy as np
 import random
 import abc
 
 
-class Vec(object):
+class Vec(Value):
 
     """
         Vec
         Base class for all vector types
     """
 
-    def __init__(self, data):
-        self.data = data
-        self.decimals = 2
-
-    @property
-    def digits(self):
-        return self.decimals
-
-    @digits.setter
-    def digits(self, new_digits):
-        self.decimals = new_digits
+    __slots__ = ()
 
     @abc.abstractmethod
     def to_string(self):
@@ -22,7 +22,8 @@
     SOFTWARE.
 """
 
-import six.moves as smo
+from detector.detector_strategy import DETECTOR_STRATEGIES
+from collections import OrderedDict
 import numpy as np
 import logging
 import time
@@ -32,30 +33,48 @@ class Detector(object):
 
     """
         Detector
-        Detects outliers based on two algorithms
-        1. Mean squared error with Standard deviation
-        2. Generalized ESD Rosner
-        Therefore the Final Estimate data set is used to identify paths with high contribution
+        Detects outliers with one of the registered detector strategies,
+        e.g. standard deviation, Generalized ESD Rosner, median absolute deviation or interquartile range.
+        Therefore the Final Estimate data set is used to identify paths with high contribution.
+        The final estimates are reduced to the mean, luminance or max channel value,
+        or each rgb channel is tested on its own.
     """
 
+    # channel modes of the final estimate data
+    CHANNEL_MEAN = 0
+    CHANNEL_LUMINANCE = 1
+    CHANNEL_MAX = 2
+    CHANNEL_PER_CHANNEL = 3
+
+    # Rec. 709 luminance weights
+    LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
+
+    # flags of the standard deviation and esd strategy
+    DEFAULT = 'std'
+    ESD = 'esd'
+
     def __init__(self):
         # enable or disable filtering by detector
         self._active = False
 
-        # run default or esd outlier detection
-        self._default = True
+        # strategies dict { unique_strategy_flag : strategy, ... }
+        self._strategies = OrderedDict()
+        for cls in DETECTOR_STRATEGIES:
+            strategy = cls()
+            self._strategies[strategy.flag] = strategy
 
-        # esd outlier settings
-        self._k = 1
-        self._alpha = 0.05
+        # flag of the strategy used for outlier detection
+        self._strategy = Detector.DEFAULT
+
+        # esd pre filter setting
         self._filter = 1.0
 
-        # default outlier settings
-        self._m = 2
+        # channel mode of the final estimate data
+        self._channel = Detector.CHANNEL_MEAN
 
     @property
     def is_default_active(self):
-        return self._default
+        return self._strategy == Detector.DEFAULT
 
     @property
     def is_active(self):
@@ -65,21 +84,41 @@ class Detector(object):
     def is_active(self, enable):
         self._active = enable
 
+    @property
+    def strategies(self):
+        """
+        Returns all registered detector strategies
+        :return: list of DetectorStrategy
+        """
+        return list(self._strategies.values())
+
+    @property
+    def strategy(self):
+        """
+        Returns the flag of the strategy used for outlier detection
+        :return: string
+        """
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, flag):
+        self._strategy = flag
+
     @property
     def k(self):
-        return self._k
+        return self._strategies[Detector.ESD].k
 
     @k.setter
     def k(self, new_k):
-        self._k = new_k
+        self._strategies[Detector.ESD].k = new_k
 
     @property
     def alpha(self):
-        return self._alpha
+        return self._strategies[Detector.ESD].threshold
 
     @alpha.setter
     def alpha(self, new_alpha):
-        self._alpha = new_alpha
+        self._strategies[Detector.ESD].threshold = new_alpha
 
     @property
     def pre_filter(self):
@@ -91,119 +130,77 @@ class Detector(object):
 
     @property
     def m(self):
-        return self._m
+        return self._strategies[Detector.DEFAULT].threshold
 
     @m.setter
     def m(self, new_m):
-        self._m = new_m
+        self._strategies[Detector.DEFAULT].threshold = new_m
 
-    def update_values(self, m, alpha, k, pre_filter, is_default, is_active):
+    @property
+    def channel(self):
+        return self._channel
+
+    @channel.setter
+    def channel(self, new_channel):
+        self._channel = new_channel
+
+    def update_values(self, m, alpha, k, pre_filter, strategy, is_active, channel=CHANNEL_MEAN, thresholds=None):
         """
         Updates all values of the detector class
         :param m:
         :param alpha:
         :param k:
         :param pre_filter:
-        :param is_default:
+        :param strategy: flag of the strategy used for outlier detection
         :param is_active:
+        :param channel: channel mode
+        :param thresholds: { strategy flag : threshold } of the other strategies
         :return:
         """
-        self._m = m
-        self._alpha = alpha
-        self._k = k
+        self.m = m
+        self.alpha = alpha
+        self.k = k
         self._filter = pre_filter
-        self._default = is_default
+        self._strategy = strategy
         self._active = is_active
+        self._channel = channel
+        for flag, threshold in (thresholds or {}).items():
+            self._strategies[flag].threshold = threshold
+
+    def channel_values(self, data):
+        """
+        Reduces the final estimate data to the values tested by the detector.
+        Returns a (n, c) array, c is 3 in per channel mode and 1 otherwise
+        :param data: (n, 4) final estimate data or (n,) values
+        :return: numpy array
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 1:
+            return data[:, np.newaxis]
+        if self._channel == Detector.CHANNEL_LUMINANCE:
+            values = data[:, :3].dot(Detector.LUMINANCE_WEIGHTS)
+        elif self._channel == Detector.CHANNEL_MAX:
+            values = data[:, :3].max(axis=1)
+        elif self._channel == Detector.CHANNEL_PER_CHANNEL:
+            return data[:, :3]
+        else:
+            values = data.mean(axis=1)
+        return values[:, np.newaxis]
 
     def run_outlier_detection(self, data):
         """
         Runs the outlier detection on the given data set
         :param data: final_estimate data
-        :return:
+        :return: sorted indices of the outliers
         """
         if not self._active:
             path_outliers = np.array([], dtype=np.int32)
-        elif self._default:
-            path_outliers = self.default_outlier_detection(data)
         else:
-            path_outliers = self.esd_outlier_detection(data)
+            start = time.time()
+            strategy = self._strategies[self._strategy]
+            # channels are detected as a stack, a sample is an outlier if one of its channels is
+            mask = strategy.outlier_mask(self.channel_values(data).T)
+            path_outliers = np.flatnonzero(mask.any(axis=0)).astype(np.int32)
+            logging.info('{} outlier detection runtime: {}ms'.format(strategy.name, (time.time() - start) * 1000))
         logging.info("Outliers keys={}".format(path_outliers))
         return path_outliers
-
-    def default_outlier_detection(self, data):
-        """
-        Default outlier detection
-        :param data:
-        :return:
-        """
-        start = time.time()
-        # https://stackoverflow.com/questions/11686720/is-there-a-numpy-builtin-to-reject-outliers-from-a-list
-        outliers = data[abs(data - np.mean(data)) > self._m * np.std(data)]
-        outliers_keys = np.array([], dtype=np.int32)
-        for o in outliers:
-            outliers_keys = np.append(outliers_keys, np.where(data == o))
-        logging.info('default outlier detection runtime: {}ms'.format(time.time() - start))
-        return outliers_keys
-
-    def esd_outlier_detection(self, data):
-        """
-        Outlier detection with Generalized ESD from Rosner 1983
-        :param data:
-        :return:
-        """
-        # compute outliers with Generalized ESD from Rosner 1983
-        start = time.time()
-        outliers = self.generalized_esd_test(data, self._alpha, self._k)
-        logging.info('esd outlier detection runtime: {}ms'.format(time.time() - start))
-        return np.append(np.array([], dtype=np.int32), outliers[1])
-
-    @staticmethod
-    def generalized_esd_test(data, alpha=0.05, max_o=1):
-
-        """
-        Runs the Generalized ESD algorithm by Rosner
-        :param data:
-        :param alpha:
-        :param max_o:
-        :return:
-        """
-
-        from scipy.stats import t
-        import numpy.ma as ma
-
-        xm = ma.array(data)
-        n = len(xm)
-
-        # Compute R-values
-        R = []
-        L = []
-        minds = []
-        for i in smo.range(max_o + 1):
-            # Compute mean and std of x
-            xmean = xm.mean()
-            xstd = xm.std()
-            # Find maximum deviation
-            rr = np.abs((xm - xmean) / xstd)
-            minds.append(np.argmax(rr))
-            R.append(rr[minds[-1]])
-            if i >= 1:
-                p = 1.0 - alpha / (2.0 * (n - i + 1))
-                perPoint = t.ppf(p, n - i - 1)
-                L.append((n - i) * perPoint / np.sqrt((n - i - 1 + perPoint ** 2) * (n - i + 1)))
-            # Mask that value and proceed
-            xm[minds[-1]] = ma.masked
-        # Remove the first entry from R, which is of
-        # no meaning for the test
-        R.pop(-1)
-        # Find the number of outliers
-        outliers_found = False
-        for i in smo.range(max_o - 1, -1, -1):
-            if R[i] > L[i]:
-                outliers_found = True
-                break
-        # Prepare return value
-        if outliers_found:
-            return i + 1, minds[0:i + 1]
-        else:
-            # No outliers could be detected
-            return 0, []
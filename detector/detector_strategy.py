@@ -0,0 +1,331 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import six.moves as smo
+import numpy as np
+import warnings
+import abc
+
+
+class DetectorStrategy(object):
+
+    """
+        DetectorStrategy
+        Interface of an outlier detector strategy.
+        Strategies work batched on the values of one pixel (n,) or on a stack of pixels (p, n).
+        Pixels with different sample counts are stacked by padding with nan, nan values are never outliers.
+        New strategies are loaded via DETECTOR_STRATEGIES, implement the strategy and add the class there.
+    """
+
+    def __init__(self, name, flag, threshold, threshold_name):
+        self._name = name
+        self._flag = flag
+        self._threshold = threshold
+        self._threshold_name = threshold_name
+
+    @property
+    def name(self):
+        """
+        Returns the name of the strategy
+        :return: string
+        """
+        return self._name
+
+    @property
+    def flag(self):
+        """
+        Returns the unique identifier of the strategy
+        :return: string
+        """
+        return self._flag
+
+    @property
+    def threshold(self):
+        """
+        Returns the threshold of the strategy
+        :return: float
+        """
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, threshold):
+        self._threshold = threshold
+
+    @property
+    def threshold_name(self):
+        """
+        Returns the display name of the threshold
+        :return: string
+        """
+        return self._threshold_name
+
+    @abc.abstractmethod
+    def outlier_mask(self, values):
+        """
+        Returns a boolean mask of the outliers along the last axis
+        :param values: numpy array (n,) or (p, n)
+        :return: numpy boolean array of the same shape
+        """
+
+    def outlier_indices(self, values):
+        """
+        Returns the sorted indices of the outliers of one pixel
+        :param values: numpy array (n,)
+        :return: numpy array
+        """
+        return np.flatnonzero(self.outlier_mask(values)).astype(np.int32)
+
+    @staticmethod
+    def stack(values_list):
+        """
+        Stacks the values of several pixels into a (p, n) array padded with nan
+        :param values_list: list of numpy arrays
+        :return: numpy array
+        """
+        n = max([len(values) for values in values_list], default=0)
+        stacked = np.full((len(values_list), n), np.nan)
+        for i, values in enumerate(values_list):
+            stacked[i, :len(values)] = values
+        return stacked
+
+    @staticmethod
+    def _nan_stats(func, values, *args):
+        """
+        Applies a nan aware reduction along the last axis, rows which only contain nan result in nan
+        :param func: numpy nan reduction
+        :param values: numpy array
+        :return: numpy array with keepdims
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return func(values, *args, axis=-1, keepdims=True)
+
+
+class StandardDeviation(DetectorStrategy):
+
+    """
+        StandardDeviation
+        Values which deviate more than m standard deviations from the mean are outliers
+    """
+
+    def __init__(self):
+        DetectorStrategy.__init__(self, 'Standard deviation', 'std', 2.0, 'm')
+
+    def outlier_mask(self, values):
+        # https://stackoverflow.com/questions/11686720/is-there-a-numpy-builtin-to-reject-outliers-from-a-list
+        values = np.asarray(values, dtype=np.float64)
+        mean = self._nan_stats(np.nanmean, values)
+        std = self._nan_stats(np.nanstd, values)
+        return np.abs(values - mean) > self._threshold * std
+
+
+class GeneralizedEsd(DetectorStrategy):
+
+    """
+        GeneralizedEsd
+        Generalized ESD from Rosner 1983, the threshold is the significance level alpha,
+        k is the maximum amount of outliers
+    """
+
+    def __init__(self):
+        DetectorStrategy.__init__(self, 'Generalized ESD', 'esd', 0.05, 'alpha')
+        self._k = 1
+
+    @property
+    def k(self):
+        return self._k
+
+    @k.setter
+    def k(self, new_k):
+        self._k = new_k
+
+    def outlier_mask(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        mask = np.zeros(values.shape, dtype=bool)
+        for row, row_mask in zip(values.reshape(-1, values.shape[-1]), mask.reshape(-1, values.shape[-1])):
+            valid = np.flatnonzero(~np.isnan(row))
+            _, outliers = self.generalized_esd_test(row[valid], self._threshold, self._k)
+            row_mask[valid[outliers]] = True
+        return mask
+
+    @staticmethod
+    def esd_critical_values(n, alpha, max_o):
+        """
+        Computes the critical values lambda_1 ... lambda_max_o of the Generalized ESD test
+        :param n: amount of samples
+        :param alpha: significance level
+        :param max_o: maximum amount of outliers
+        :return: numpy array
+        """
+        from scipy.stats import t
+        i = np.arange(1, max_o + 1, dtype=np.float64)
+        p = 1.0 - alpha / (2.0 * (n - i + 1))
+        per_point = t.ppf(p, n - i - 1)
+        return (n - i) * per_point / np.sqrt((n - i - 1 + per_point ** 2) * (n - i + 1))
+
+    @staticmethod
+    def generalized_esd_test(data, alpha=0.05, max_o=1):
+
+        """
+        Runs the Generalized ESD algorithm by Rosner.
+        The data is sorted once, the most extreme value is always at one end of the remaining range,
+        mean and std are updated with running sums when it is removed.
+        Returns the amount of outliers and their indices in order of removal
+        :param data:
+        :param alpha:
+        :param max_o:
+        :return: (integer, list)
+        """
+
+        data = np.asarray(data, dtype=np.float64)
+        n = len(data)
+        # the test needs at least one degree of freedom left
+        max_o = min(max_o, n - 2)
+        if max_o < 1:
+            return 0, []
+
+        order = np.argsort(data, kind='stable')
+        # center the values to keep the running sum of squares precise
+        xs = data[order] - data[order[n // 2]]
+        total = xs.sum()
+        total_sq = np.dot(xs, xs)
+
+        # Compute R-values
+        R = np.zeros(max_o)
+        minds = np.empty(max_o, dtype=np.int64)
+        lo, hi = 0, n - 1
+        for i in smo.range(max_o):
+            m = n - i
+            xmean = total / m
+            xstd = np.sqrt(max(total_sq / m - xmean * xmean, 0.0))
+            # Find maximum deviation, which is either the smallest or the largest remaining value
+            dev_lo = xmean - xs[lo]
+            dev_hi = xs[hi] - xmean
+            if dev_hi > dev_lo or (dev_hi == dev_lo and order[hi] < order[lo]):
+                idx, dev = hi, dev_hi
+                hi -= 1
+            else:
+                idx, dev = lo, dev_lo
+                lo += 1
+            minds[i] = order[idx]
+            if xstd > 0.0:
+                R[i] = dev / xstd
+            # Remove that value and proceed
+            total -= xs[idx]
+            total_sq -= xs[idx] * xs[idx]
+
+        L = GeneralizedEsd.esd_critical_values(n, alpha, max_o)
+        # Find the number of outliers, the largest i with R_i > lambda_i
+        found = np.flatnonzero(R > L)
+        if len(found) > 0:
+            count = int(found[-1]) + 1
+            return count, minds[:count].tolist()
+        # No outliers could be detected
+        return 0, []
+
+
+class MedianAbsoluteDeviation(DetectorStrategy):
+
+    """
+        MedianAbsoluteDeviation
+        Values whose modified z-score 0.6745 * (x - median) / MAD exceeds the threshold are outliers (Iglewicz and Hoaglin).
+        If more than half of the values are equal the MAD is zero, then the mean absolute deviation is used instead
+    """
+
+    def __init__(self):
+        DetectorStrategy.__init__(self, 'Median absolute deviation', 'mad', 3.5, 'z')
+
+    def outlier_mask(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        median = self._nan_stats(np.nanmedian, values)
+        deviation = np.abs(values - median)
+        scale = self._nan_stats(np.nanmedian, deviation) / 0.6745
+        mean_scale = self._nan_stats(np.nanmean, deviation) * 1.253314
+        scale = np.where(scale > 0.0, scale, mean_scale)
+        return (scale > 0.0) & (deviation > self._threshold * scale)
+
+
+class InterQuartileRange(DetectorStrategy):
+
+    """
+        InterQuartileRange
+        Values outside of [Q1 - k * IQR, Q3 + k * IQR] are outliers (Tukey's fences)
+    """
+
+    def __init__(self):
+        DetectorStrategy.__init__(self, 'Interquartile range', 'iqr', 1.5, 'k')
+
+    def outlier_mask(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        q1, q3 = self._nan_stats(np.nanpercentile, values, [25.0, 75.0])
+        iqr = q3 - q1
+        return (values < q1 - self._threshold * iqr) | (values > q3 + self._threshold * iqr)
+
+
+class LogZScore(DetectorStrategy):
+
+    """
+        LogZScore
+        Values whose z-score of the logarithm exceeds the threshold are outliers.
+        Monte Carlo estimates are heavy tailed, in log space the bulk is close to normal distributed.
+        Only high values are detected, values <= 0 are never outliers
+    """
+
+    def __init__(self):
+        DetectorStrategy.__init__(self, 'Log z-score', 'log_z', 3.0, 'z')
+
+    def outlier_mask(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_values = np.where(values > 0.0, np.log(values), np.nan)
+        mean = self._nan_stats(np.nanmean, log_values)
+        std = self._nan_stats(np.nanstd, log_values)
+        return log_values - mean > self._threshold * std
+
+
+class Quantile(DetectorStrategy):
+
+    """
+        Quantile
+        Values above the given quantile are outliers
+    """
+
+    def __init__(self):
+        DetectorStrategy.__init__(self, 'Quantile', 'quantile', 0.999, 'q')
+
+    def outlier_mask(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        q = min(max(self._threshold, 0.0), 1.0)
+        return values > self._nan_stats(np.nanquantile, values, q)
+
+
+# In order to add a detector strategy, implement DetectorStrategy and add the class to this list.
+DETECTOR_STRATEGIES = [
+    StandardDeviation,
+    GeneralizedEsd,
+    MedianAbsoluteDeviation,
+    InterQuartileRange,
+    LogZScore,
+    Quantile,
+]
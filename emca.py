@@ -26,6 +26,7 @@ from PySide2.QtWidgets import QApplication
 from PySide2.QtCore import QFile, QTextStream, QCoreApplication
 from PySide2.QtCore import Qt
 from core.logger import InitLogSystem
+import argparse
 import sys
 import os
 
@@ -55,19 +56,30 @@ class EMCAClient(object):
         qt_app.setStyleSheet(text_stream.readAll())
         self.controller.options.set_theme(theme)
 
-    def start(self):
+    def start(self, record=None, replay=None):
         """
         Starts and opens the GUI of EMCA
+        :param record: file to record the next session to or None
+        :param replay: recorded session to replay instead of connecting to a server or None
         :return:
         """
         self.controller.display_view()
+        if record:
+            self.controller.stream.record_session(record)
+        if replay:
+            self.controller.stream.replay_session(replay)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Explorer of Monte-Carlo based Algorithms - Client')
+    parser.add_argument('--record', help='record all data received from the server to this file')
+    parser.add_argument('--replay', help='replay a recorded session without a running server')
+    args, qt_args = parser.parse_known_args()
+
     QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     InitLogSystem()
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     emca_client = EMCAClient()
     emca_client.load_theme(app)
-    emca_client.start()
+    emca_client.start(record=args.record, replay=args.replay)
     sys.exit(app.exec_())
@@ -23,6 +23,8 @@
 """
 
 from filter.filter_type import FilterType
+from filter.filter_predicate import FilterPredicate
+from filter.path_mask import PathMask
 import logging
 import time
 import numpy as np
@@ -34,19 +36,40 @@ class Filter(object):
         Filter
         Filters the Render data set depending on user added data.
         (bool, float, point2i, point2f, point3i, point3f, color3f)
-        All paths which satisfy the constraints will be displayed
+        All paths which satisfy the constraints will be displayed.
+        Filters are compiled into a FilterPredicate, or given as FilterQuery,
+        and evaluated on the columns of the Render data, the result of every filter is kept as PathMask. Active filters are combined by AND or OR,
+        without active filters all paths are displayed.
     """
 
+    AND = 'and'
+    OR = 'or'
+
     def __init__(self):
+        # {filter_idx : (filter_settings, PathMask or None if not evaluated yet)}
         self._filters = {}
-        self._paths = set()
+        # indices of filters which are switched off
+        self._inactive = set()
+        self._composition = Filter.AND
+        # render data the masks belong to and its path indices
+        self._render_data = None
+        self._indices = np.empty(0, dtype=np.int32)
+        # combination of all active filters, None if no filter is active
+        self._combined = None
+
+    @property
+    def composition(self):
+        return self._composition
 
     def path_indices(self):
         """
         Returns a numpy array containing all paths indices which satisfy the filter constraints
         :return:
         """
-        xs = np.array(list(self._paths), dtype=np.int32)
+        if self._combined is None:
+            xs = self._indices.astype(np.int32)
+        else:
+            xs = self._indices[self._combined.to_bool()].astype(np.int32)
         xs.sort()
         return xs
 
@@ -56,7 +79,9 @@ class Filter(object):
         :return:
         """
         self._filters.clear()
-        self._paths.clear()
+        self._inactive.clear()
+        self._render_data = None
+        self._combined = None
 
     def delete_filter(self, index):
         """
@@ -67,218 +92,162 @@ class Filter(object):
         :return: numpy array with path indices
         """
         del self._filters[index]
-        self._paths.clear()
-        for f_key, f in self._filters.items():
-            self._paths |= f[1]
+        self._inactive.discard(index)
+        self._combine()
         return self.path_indices()
 
-    def apply_filters(self, render_data):
+    def toggle_filter(self, index, active):
         """
-        Applies all active filters to a new Render data set.
+        Switches a filter on or off without deleting it.
         Returns a numpy array containing all path indices which satisfy the filter constraints
-        :param render_data:
+        :param index: row index of QListWidget
+        :param active: boolean
         :return: numpy array with path indices
         """
-        # apply filters to new data and update sets of path ids
-        self._paths.clear()
-        if len(self._filters) > 0:
-            for key, f in self._filters.items():
-                self.filter(f[0], render_data)
+        if active:
+            self._inactive.discard(index)
+        else:
+            self._inactive.add(index)
+        self._combine()
         return self.path_indices()
 
-    def filter(self, filter_settings, render_data):
+    def set_composition(self, composition):
         """
-        Applies a filter item with filter_settings to the Render data
+        Sets how active filters are combined, Filter.AND or Filter.OR.
         Returns a numpy array containing all path indices which satisfy the filter constraints
-        :param filter_settings:
-        :param render_data:
+        :param composition: Filter.AND or Filter.OR
         :return: numpy array with path indices
         """
-        start = time.time()
-        xs = set()
-        search_key = filter_settings.get_text()
-
-        if search_key == "sampleIndex":
-            for path_key, path in render_data.dict_paths.items():
-                if self.compare(path.sample_idx, filter_settings):
-                    xs.add(path_key)
-        elif search_key == "pathDepth":
-            for path_key, path in render_data.dict_paths.items():
-                if self.compare(path.path_depth, filter_settings):
-                    xs.add(path_key)
-        elif search_key == "finalEstimate":
-            for path_key, path in render_data.dict_paths.items():
-                if self.compare(path.final_estimate, filter_settings):
-                    xs.add(path_key)
-        else:
-            for path_key, path in render_data.dict_paths.items():
-                for item in path.data_list:
-                    entry = item.get(search_key, None)
-                    if entry:
-                        if isinstance(entry, list):
-                            if self.compare(entry[0], filter_settings):
-                                xs.add(path_key)
-                        else:
-                            if self.compare(entry, filter_settings):
-                                xs.add(path_key)
-                for its_key, its in path.intersections.items():
-                    for item in its.data_list:
-                        entry = item.get(search_key, None)
-                        if entry:
-                            if isinstance(entry, list):
-                                if self.compare(entry[0], filter_settings):
-                                    xs.add(path_key)
-                            else:
-                                if self.compare(entry, filter_settings):
-                                    xs.add(path_key)
-
-        # add filter and its set of keys,
-        # has to be updated if new pixel data is requested
-        self._filters[filter_settings.get_idx()] = (filter_settings, xs)
-        if len(self._paths) > 0:
-            self._paths &= xs
-        else:
-            self._paths |= xs
-        logging.info('filtered items in: {}ms'.format(time.time() - start))
+        self._composition = composition
+        self._combine()
         return self.path_indices()
 
-    def compare(self, entry, filter_settings):
+    def add_filter(self, filter_settings):
         """
-        Compares the render data value and data type with the user entered value.
-        Returns true if the render data entry value satisfy the user entered value.
-        :param entry: render data value
-        :param filter_settings:
-        :return: true or false
+        Adds a filter without evaluating it, see pending_filters and set_masks
+        :param filter_settings: FilterSettings or FilterQuery
+        :return:
         """
+        self._filters[filter_settings.get_idx()] = (filter_settings, None)
 
-        f_type = filter_settings.get_type()
-        expr = filter_settings.get_expr()
-        value = filter_settings.get_value()
-        if f_type is FilterType.SINGLE_VALUE:
-            if isinstance(value, str):
-                return self.compare_value(entry, expr, value, True)
-            return self.compare_value(entry, expr, value)
-        elif f_type is FilterType.POINT2:
-            return self.compare_point2(entry,
-                                       expr[0], expr[1],
-                                       value[0], value[1])
-        elif f_type is FilterType.POINT3:
-            return self.compare_point3(entry,
-                                       expr[0], expr[1], expr[2],
-                                       value[0], value[1], value[2])
-        elif f_type is FilterType.COLOR3:
-            return self.compare_color(entry,
-                                      expr[0], expr[1], expr[2],
-                                      value[0], value[1], value[2])
-
-    @staticmethod
-    def compare_value(val1, expr, val2, is_string=False):
+    def pending_filters(self, render_data):
         """
-        Checks which compare expression is used and compares depending on the expression the values
-        Returns true if val1 satisfy the entered expression
-        :param val1: value left
-        :param expr: expression
-        :param val2: value right
-        :param is_string set if value is a string
-        :return: true or false
+        Returns the filters which are not evaluated for render_data yet
+        :param render_data: RenderData
+        :return: list of FilterSettings or FilterQuery
         """
-        if is_string:
-            if expr == "==":
-                return str(val1).lower() == str(val2).lower()
-            elif expr == "!=":
-                return str(val1).lower() != str(val2).lower()
-        else:
-            if expr == '>':
-                return val1 > val2
-            elif expr == '<':
-                return val1 < val2
-            elif expr == '==':
-                return val1 == val2
-            elif expr == '>=':
-                return val1 >= val2
-            elif expr == '<=':
-                return val1 <= val2
-            elif expr == '!=':
-                return val1 != val2
-        return False
+        if render_data is not self._render_data:
+            return [filter_settings for filter_settings, mask in self._filters.values()]
+        return [filter_settings for filter_settings, mask in self._filters.values() if mask is None]
 
-    def compare_point2(self, point2, expr_x, expr_y, x, y):
+    def set_masks(self, render_data, masks):
         """
-        Compares a point2 with given expressions expr_x, expr_y and two values x and y.
-        Returns true if the values of point2 satisfy x and y
-        :param point2: point2
-        :param expr_x: Expression for point.x
-        :param expr_y: Expression for point.y
-        :param x:
-        :param y:
-        :return: true or false
+        Sets the evaluated masks of filters, masks of other render data are dropped.
+        Returns a numpy array containing all path indices which satisfy the filter constraints
+        :param render_data: RenderData
+        :param masks: {filter_idx : numpy array bool}, see filter_mask
+        :return: numpy array with path indices
         """
-        x_val = True
-        y_val = True
-
-        if expr_x != "":
-            x_val = self.compare_value(point2.x, expr_x, x)
-
-        if expr_y != "":
-            y_val = self.compare_value(point2.y, expr_y, y)
-
-        return x_val and y_val
+        if render_data is not self._render_data:
+            self._render_data = render_data
+            self._indices = render_data.get_indices()
+            self._filters = {idx: (filter_settings, None) for idx, (filter_settings, mask) in self._filters.items()}
+            self._combined = None
+        recombine = False
+        for idx, mask in masks.items():
+            # the filter may have been deleted meanwhile
+            if idx not in self._filters:
+                continue
+            filter_settings, old_mask = self._filters[idx]
+            self._filters[idx] = (filter_settings, PathMask.from_bool(mask))
+            if old_mask is not None:
+                recombine = True
+            elif idx not in self._inactive and not recombine:
+                self._add_to_combined(self._filters[idx][1])
+        if recombine:
+            self._combine()
+        return self.path_indices()
 
-    def compare_point3(self, point3, expr_x, expr_y, expr_z, x, y, z):
+    def apply_filters(self, render_data):
         """
-        Compares a point3 with given expressions expr_x, expr_y, expr_z and three values x, y and z
-        Returns true if the values of point3 satisfy x,y and z
-        :param point3: point3
-        :param expr_x: Expression for point.x
-        :param expr_y: Expression for point.y
-        :param expr_z: Expression for point.z
-        :param x:
-        :param y:
-        :param z:
-        :return: true or false
+        Applies all active filters to a new Render data set.
+        Returns a numpy array containing all path indices which satisfy the filter constraints
+        :param render_data:
+        :return: numpy array with path indices
         """
-        x_val = True
-        y_val = True
-        z_val = True
-
-        if expr_x != "":
-            x_val = self.compare_value(point3.x, expr_x, x)
-
-        if expr_y != "":
-            y_val = self.compare_value(point3.y, expr_y, y)
-
-        if expr_z != "":
-            y_val = self.compare_value(point3.z, expr_z, z)
-
-        return x_val and y_val and z_val
+        masks = {filter_settings.get_idx(): self.filter_mask(filter_settings, render_data)
+                 for filter_settings in self.pending_filters(render_data)}
+        return self.set_masks(render_data, masks)
 
-    def compare_color(self, color, expr_r, expr_g, expr_b, r, g, b):
+    def filter(self, filter_settings, render_data):
         """
-        Compares a color class with given expressions and compare values.
-        Returns true of the color type satisfy all values (r,g,b).
-        :param color: colo3f
-        :param expr_r:
-        :param expr_g:
-        :param expr_b:
-        :param r: red
-        :param g: green
-        :param b: blue
-        :return: true or false
+        Applies a filter item with filter_settings to the Render data
+        Returns a numpy array containing all path indices which satisfy the filter constraints
+        :param filter_settings:
+        :param render_data:
+        :return: numpy array with path indices
         """
-        red = True
-        green = True
-        blue = True
+        start = time.time()
+        self.add_filter(filter_settings)
+        xs = self.apply_filters(render_data)
+        logging.info('filtered items in: {:.3f}ms'.format((time.time() - start) * 1000.0))
+        return xs
 
-        if expr_r != "":
-            red = self.compare_value(color.red, expr_r, r)
+    def _combine(self):
+        """
+        Recombines the masks of all active filters
+        :return:
+        """
+        self._combined = None
+        for idx, (filter_settings, mask) in self._filters.items():
+            if idx not in self._inactive and mask is not None:
+                self._add_to_combined(mask)
 
-        if expr_g != "":
-            green = self.compare_value(color.green, expr_g, g)
+    def _add_to_combined(self, mask):
+        """
+        Combines a mask with the combination of the active filters
+        :param mask: PathMask
+        :return:
+        """
+        if self._combined is None:
+            self._combined = mask.copy()
+        elif self._composition == Filter.OR:
+            self._combined |= mask
+        else:
+            self._combined &= mask
 
-        if expr_b != "":
-            blue = self.compare_value(color.blue, expr_b, b)
+    @staticmethod
+    def filter_mask(filter_settings, render_data):
+        """
+        Evaluates a filter on all paths at once.
+        Returns a boolean mask over the paths in the order of render_data.get_indices()
+        :param filter_settings:
+        :param render_data:
+        :return: numpy array bool
+        """
+        if filter_settings.get_type() is FilterType.QUERY:
+            return filter_settings.evaluate(render_data)
 
-        return red and green and blue
+        predicate = FilterPredicate.from_settings(filter_settings)
+        search_key = filter_settings.get_text()
+        columns = render_data.columns
+
+        if search_key in ("sampleIndex", "pathDepth", "finalEstimate") and columns is not None:
+            path_columns = columns.path_columns
+            if search_key == "sampleIndex":
+                return predicate.evaluate(path_columns['sample_idx'].astype(np.float64), 'int')
+            elif search_key == "pathDepth":
+                return predicate.evaluate(path_columns['path_depth'].astype(np.float64), 'int')
+            # paths without final estimate never match
+            mask = predicate.evaluate(path_columns['final_estimate'][:, :3].astype(np.float64), 'color3f')
+            return mask & path_columns['has_final_estimate']
+
+        user_data_columns = render_data.user_data_columns
+        mask = np.zeros(user_data_columns.path_count, dtype=bool)
+        for column in user_data_columns.columns(search_key):
+            # a path matches if any of its entries matches
+            mask[column.path_rows[predicate.evaluate_column(column)]] = True
+        return mask
 
     def to_string(self):
         """
@@ -1,4 +1,5 @@
 from filter.filter_type import FilterType
+from PySide2.QtWidgets import QCheckBox
 from PySide2.QtWidgets import QFormLayout
 from PySide2.QtWidgets import QLabel
 from PySide2.QtWidgets import QWidget
@@ -38,6 +39,14 @@ class FilterListItem(QWidget):
             layout.addRow("r: ", QLabel(str(constraint[0])))
             layout.addRow("g: ", QLabel(str(constraint[1])))
             layout.addRow("b: ", QLabel(str(constraint[2])))
+        elif d_type is FilterType.QUERY:
+            label = QLabel(text)
+            label.setWordWrap(True)
+            layout.addRow("Query:", label)
+        # switches the filter off without deleting it
+        self.cbActive = QCheckBox("active")
+        self.cbActive.setChecked(True)
+        layout.addRow(self.cbActive)
         self.setLayout(layout)
 
     def get_idx(self):
@@ -0,0 +1,137 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from filter.filter_type import FilterType
+from model.user_data_columns import UserDataColumn
+import numpy as np
+
+
+# compare expressions of the filter settings
+OPERATORS = {
+    '>': np.greater,
+    '<': np.less,
+    '==': np.equal,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '!=': np.not_equal,
+}
+
+# user data types a filter type can be applied to, one component per expression
+_COMPONENT_TYPES = {
+    FilterType.POINT2: ('point2i', 'point2f', 'point3i', 'point3f'),
+    FilterType.POINT3: ('point3i', 'point3f'),
+    FilterType.COLOR3: ('color3f',),
+}
+
+_SCALAR_TYPES = ('bool', 'float', 'double', 'int')
+
+
+class FilterPredicate(object):
+
+    """
+        FilterPredicate
+        Filter settings compiled once into a vectorized predicate.
+        Evaluating it on a value array [n, components] returns a boolean mask [n],
+        values of types the filter can not be applied to never match.
+    """
+
+    def __init__(self, filter_type, expr, value):
+        self._type = filter_type
+        self._is_string = self._type is FilterType.SINGLE_VALUE and isinstance(value, str)
+        if self._type is FilterType.SINGLE_VALUE:
+            expr, value = (expr,), (value,)
+        if self._is_string:
+            # strings are only compared for (in)equality, case insensitive
+            self._ops = [(0, {'==': np.equal, '!=': np.not_equal}.get(expr[0], None), str(value[0]).lower())]
+        else:
+            # components without expression are not constrained
+            self._ops = [(i, OPERATORS.get(e, None), v) for i, (e, v) in enumerate(zip(expr, value)) if e != '']
+
+    @staticmethod
+    def from_settings(filter_settings):
+        """
+        Compiles the filter settings entered in the filter view
+        :param filter_settings: FilterSettings
+        :return: FilterPredicate
+        """
+        return FilterPredicate(filter_settings.get_type(), filter_settings.get_expr(), filter_settings.get_value())
+
+    @property
+    def filter_type(self):
+        return self._type
+
+    def accepts(self, type_name):
+        """
+        Returns if the predicate can be applied to values of the user data type
+        :param type_name: str
+        :return: boolean
+        """
+        if self._is_string:
+            return True
+        if self._type is FilterType.SINGLE_VALUE:
+            return type_name in _SCALAR_TYPES
+        return type_name in _COMPONENT_TYPES.get(self._type, ())
+
+    def evaluate(self, values, type_name, strings=None):
+        """
+        Evaluates the predicate on all values at once
+        :param values: np.array [n] or [n, components]
+        :param type_name: user data type of the values
+        :param strings: lower case strings of the values for string comparisons, see UserDataColumn.strings
+        :return: np.array bool [n]
+        """
+        n = len(values)
+        if not self.accepts(type_name):
+            return np.zeros(n, dtype=bool)
+        if self._is_string:
+            values = (strings if strings is not None else self.to_strings(values, type_name)).reshape(n, 1)
+        elif values.ndim == 1:
+            values = values.reshape(n, 1)
+        mask = np.ones(n, dtype=bool)
+        for component, op, value in self._ops:
+            if op is None:
+                # unknown expression
+                return np.zeros(n, dtype=bool)
+            mask &= op(values[:, component], value).astype(bool)
+        return mask
+
+    def evaluate_column(self, column):
+        """
+        Evaluates the predicate on all entries of a user data column
+        :param column: UserDataColumn
+        :return: np.array bool [len(column)]
+        """
+        if self._is_string:
+            return self.evaluate(column.values, column.type_name, column.strings())
+        return self.evaluate(column.values, column.type_name)
+
+    @staticmethod
+    def to_strings(values, type_name):
+        """
+        Returns the lower case string representation of values
+        :param values: np.array
+        :param type_name: str
+        :return: np.array object
+        """
+        return UserDataColumn(None, type_name, values, None, None).strings()
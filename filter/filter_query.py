@@ -0,0 +1,411 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from filter.filter_type import FilterType
+from filter.filter_predicate import FilterPredicate
+import numpy as np
+import re
+
+
+_TOKENS = re.compile(r'''\s*(?:
+    (?P<number>[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<string>"[^"]*"|'[^']*')
+    |(?P<quoted>`[^`]+`)
+    |(?P<op>>=|<=|==|!=|>|<)
+    |(?P<punct>[(),])
+    |(?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    )''', re.VERBOSE)
+
+_KEYWORDS = ('and', 'or', 'not', 'any', 'all', 'at', 'true', 'false')
+
+# component names of point and color values
+_COMPONENTS = {'x': 0, 'y': 1, 'z': 2, 'r': 0, 'g': 1, 'b': 2}
+
+# filter type and amount of components of composite user data types
+_COMPOSITE_TYPES = {
+    'point2i': (FilterType.POINT2, 2),
+    'point2f': (FilterType.POINT2, 2),
+    'point3i': (FilterType.POINT3, 3),
+    'point3f': (FilterType.POINT3, 3),
+    'color3f': (FilterType.COLOR3, 3),
+}
+
+# query name : (column, type, flag column or None) of the built-in path fields
+PATH_FIELDS = {
+    'sampleIndex': ('sample_idx', 'int', None),
+    'pathDepth': ('path_depth', 'int', None),
+    'pathOrigin': ('path_origin', 'point3f', None),
+    'finalEstimate': ('final_estimate', 'color3f', 'has_final_estimate'),
+}
+
+# query name : (column, type, flag column or None) of the built-in vertex fields
+VERTEX_FIELDS = {
+    'depth': ('depth_idx', 'int', None),
+    'index': ('intersection_idx', 'int', None),
+    'pos': ('pos', 'point3f', 'has_pos'),
+    'posNE': ('pos_ne', 'point3f', 'has_ne'),
+    'occludedNE': ('occluded_ne', 'bool', 'has_ne'),
+    'posEnvmap': ('pos_envmap', 'point3f', 'has_envmap'),
+    'li': ('li', 'color3f', 'has_li'),
+}
+
+
+class FilterQuery(object):
+
+    """
+        FilterQuery
+        Boolean query over path and vertex data, added to the filter list like FilterSettings, e.g.
+            pathDepth >= 3 AND any(vertex.roughness < 0.1) AND NOT finalEstimate.r > 10
+        Comparisons are combined by AND, OR, NOT and parentheses.
+        Names are built-in path fields, user data keys or vertex fields (prefixed with vertex.),
+        path. restricts a user data key to the data of the path, components are selected by .x .y .z or .r .g .b.
+        A user data key without prefix matches if the path or any of its vertices matches.
+        any(expr), all(expr) and at(k, expr) evaluate expr for every vertex of a path,
+        vertex fields outside of them are treated as any(...).
+        The query is compiled into the same vectorized predicates as the filter settings,
+        quantifiers are segmented reductions over the vertex rows of the paths.
+        Syntax errors raise a ValueError.
+    """
+
+    def __init__(self, query, idx=-1):
+        self._query = query
+        self._idx = idx
+        self._root = _Parser(query).parse()
+
+    def get_idx(self):
+        """
+        Returns the filter index
+        :return: integer
+        """
+        return self._idx
+
+    def get_type(self):
+        """
+        Returns the filter type
+        :return: FilterType
+        """
+        return FilterType.QUERY
+
+    def get_text(self):
+        """
+        Returns the query
+        :return: string
+        """
+        return self._query
+
+    def get_constraint(self):
+        """
+        Returns the constraint
+        :return: (string,)
+        """
+        return self._query,
+
+    def evaluate(self, render_data):
+        """
+        Evaluates the query on all paths at once.
+        Returns a boolean mask over the paths in the order of render_data.get_indices()
+        :param render_data: RenderData
+        :return: numpy array bool
+        """
+        columns = render_data.columns
+        if columns is None:
+            return np.zeros(len(render_data.dict_paths), dtype=bool)
+        return _Evaluator(columns, render_data.user_data_columns).path_mask(self._root)
+
+    def to_string(self):
+        """
+        Returns a string with class information
+        :return:
+        """
+        return "Query: {}".format(self._query)
+
+
+class _Parser(object):
+
+    """
+        Recursive descent parser of filter queries, returns the syntax tree as nested tuples:
+        ('or', a, b), ('and', a, b), ('not', a), ('any', a), ('all', a), ('at', depth, a),
+        ('cmp', name, op, value)
+    """
+
+    def __init__(self, query):
+        self._tokens = self.tokenize(query)
+        self._pos = 0
+
+    @staticmethod
+    def tokenize(query):
+        """
+        Splits a query into (kind, text, position) tokens
+        :param query: string
+        :return: list
+        """
+        tokens = []
+        pos = 0
+        query = query.rstrip()
+        while pos < len(query):
+            match = _TOKENS.match(query, pos)
+            if match is None or match.end() == pos:
+                pos = len(query) - len(query[pos:].lstrip())
+                raise ValueError('Unexpected character at {}: {}'.format(pos, query[pos:]))
+            kind = match.lastgroup
+            text = match.group(kind)
+            start = match.start(kind)
+            if kind == 'name' and text.lower() in _KEYWORDS:
+                kind = text.lower()
+            elif kind == 'quoted':
+                kind, text = 'name', text[1:-1]
+            tokens.append((kind, text, start))
+            pos = match.end()
+        return tokens
+
+    def parse(self):
+        if not self._tokens:
+            raise ValueError('Empty query')
+        node = self._or()
+        if self._pos < len(self._tokens):
+            self._error('Unexpected')
+        return node
+
+    def _peek(self):
+        return self._tokens[self._pos][0] if self._pos < len(self._tokens) else None
+
+    def _next(self, kind=None):
+        if self._pos >= len(self._tokens):
+            raise ValueError('Unexpected end of query{}'.format('' if kind is None else ', expected ' + kind))
+        token = self._tokens[self._pos]
+        if kind is not None and token[0] != kind:
+            self._error('Expected {} but found'.format(kind))
+        self._pos += 1
+        return token
+
+    def _error(self, message):
+        kind, text, pos = self._tokens[self._pos]
+        raise ValueError('{} {} at {}'.format(message, text, pos))
+
+    def _or(self):
+        node = self._and()
+        while self._peek() == 'or':
+            self._next()
+            node = ('or', node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._peek() == 'and':
+            self._next()
+            node = ('and', node, self._not())
+        return node
+
+    def _not(self):
+        if self._peek() == 'not':
+            self._next()
+            return 'not', self._not()
+        return self._atom()
+
+    def _atom(self):
+        kind = self._peek()
+        if kind == 'punct' and self._tokens[self._pos][1] == '(':
+            self._next()
+            node = self._or()
+            self._punct(')')
+            return node
+        if kind in ('any', 'all'):
+            self._next()
+            self._punct('(')
+            node = self._or()
+            self._punct(')')
+            return kind, node
+        if kind == 'at':
+            self._next()
+            self._punct('(')
+            depth = self._next('number')[1]
+            if not re.fullmatch(r'[+-]?\d+', depth):
+                raise ValueError('Depth of at(...) has to be an integer: {}'.format(depth))
+            self._punct(',')
+            node = self._or()
+            self._punct(')')
+            return 'at', int(depth), node
+        return self._comparison()
+
+    def _punct(self, char):
+        if self._pos >= len(self._tokens):
+            raise ValueError("Unexpected end of query, expected '{}'".format(char))
+        kind, text, pos = self._next()
+        if kind != 'punct' or text != char:
+            raise ValueError("Expected '{}' but found {} at {}".format(char, text, pos))
+
+    def _comparison(self):
+        name = self._next('name')[1]
+        op = self._next('op')[1]
+        kind, text, pos = self._next()
+        if kind == 'number':
+            value = float(text)
+        elif kind == 'string':
+            value = text[1:-1]
+        elif kind in ('true', 'false'):
+            value = 1.0 if kind == 'true' else 0.0
+        elif kind == 'name':
+            # unquoted words are compared as strings
+            value = text
+        else:
+            raise ValueError('Expected a value but found {} at {}'.format(text, pos))
+        return 'cmp', name, op, value
+
+
+class _Evaluator(object):
+
+    """
+        Evaluates a query syntax tree on the columns of one pixel,
+        path expressions return a mask over the paths, vertex expressions a mask over the vertices
+    """
+
+    def __init__(self, columns, user_data_columns):
+        self._columns = columns
+        self._user_data_columns = user_data_columns
+        self._offsets = columns.path_columns['vertex_offsets']
+        # path row of every vertex
+        self._vertex_paths = np.repeat(np.arange(columns.path_count), np.diff(self._offsets))
+
+    def path_mask(self, node):
+        kind = node[0]
+        if kind == 'or':
+            return self.path_mask(node[1]) | self.path_mask(node[2])
+        if kind == 'and':
+            return self.path_mask(node[1]) & self.path_mask(node[2])
+        if kind == 'not':
+            return ~self.path_mask(node[1])
+        if kind == 'any':
+            return self._segment_counts(self.vertex_mask(node[1])) > 0
+        if kind == 'all':
+            # paths without vertices satisfy all(...)
+            return self._segment_counts(self.vertex_mask(node[1])) == np.diff(self._offsets)
+        if kind == 'at':
+            at_depth = self._columns.vertex_columns['depth_idx'] == node[1]
+            return self._segment_counts(self.vertex_mask(node[2]) & at_depth) > 0
+        return self._compare_path(*node[1:])
+
+    def vertex_mask(self, node):
+        kind = node[0]
+        if kind == 'or':
+            return self.vertex_mask(node[1]) | self.vertex_mask(node[2])
+        if kind == 'and':
+            return self.vertex_mask(node[1]) & self.vertex_mask(node[2])
+        if kind == 'not':
+            return ~self.vertex_mask(node[1])
+        if kind in ('any', 'all', 'at'):
+            # nested quantifiers are evaluated per path
+            return self.path_mask(node)[self._vertex_paths]
+        return self._compare_vertex(*node[1:])
+
+    def _segment_counts(self, vertex_mask):
+        """
+        Returns the amount of set vertices of every path
+        :param vertex_mask: numpy array bool
+        :return: numpy array int
+        """
+        counts = np.concatenate(([0], np.cumsum(vertex_mask, dtype=np.int64)))
+        return counts[self._offsets[1:]] - counts[self._offsets[:-1]]
+
+    def _compare_path(self, name, op, value):
+        scope, key, component = self._resolve(name)
+        path_count = self._columns.path_count
+        if scope == 'vertex':
+            return self._segment_counts(self._compare_vertex(name, op, value)) > 0
+        if key in PATH_FIELDS:
+            return self._compare_field(self._columns.path_columns, PATH_FIELDS[key], component, op, value)
+        mask = np.zeros(path_count, dtype=bool)
+        for column in self._user_data_columns.columns(key):
+            matches = self._compare_column(column, component, op, value)
+            if scope == 'path':
+                matches &= column.vertex_rows < 0
+            mask[column.path_rows[matches]] = True
+        return mask
+
+    def _compare_vertex(self, name, op, value):
+        scope, key, component = self._resolve(name)
+        if scope == 'path' or (scope is None and key in PATH_FIELDS):
+            return self._compare_path(name, op, value)[self._vertex_paths]
+        if key in VERTEX_FIELDS:
+            return self._compare_field(self._columns.vertex_columns, VERTEX_FIELDS[key], component, op, value)
+        mask = np.zeros(self._columns.vertex_count, dtype=bool)
+        for column in self._user_data_columns.columns(key):
+            matches = self._compare_column(column, component, op, value) & (column.vertex_rows >= 0)
+            mask[column.vertex_rows[matches]] = True
+        return mask
+
+    def _resolve(self, name):
+        """
+        Splits a name into scope ('path', 'vertex' or None), key and component index or None
+        :param name: string
+        :return: (scope, key, component)
+        """
+        parts = name.split('.')
+        scope = None
+        if len(parts) > 1 and parts[0] in ('path', 'vertex'):
+            scope = parts.pop(0)
+        key = '.'.join(parts)
+        component = None
+        if len(parts) > 1 and parts[-1] in _COMPONENTS and not self._user_data_columns.columns(key):
+            key, component = '.'.join(parts[:-1]), _COMPONENTS[parts[-1]]
+        return scope, key, component
+
+    def _compare_field(self, columns, field, component, op, value):
+        column, type_name, flag = field
+        predicate = self._predicate(type_name, component, op, value)
+        values = columns[column]
+        if predicate is None:
+            return np.zeros(len(values), dtype=bool)
+        if type_name == 'color3f':
+            values = values[:, :3]
+        mask = predicate.evaluate(values.astype(np.float64), type_name)
+        if flag is not None:
+            mask &= columns[flag]
+        return mask
+
+    def _compare_column(self, column, component, op, value):
+        predicate = self._predicate(column.type_name, component, op, value)
+        if predicate is None:
+            return np.zeros(len(column), dtype=bool)
+        return predicate.evaluate_column(column)
+
+    @staticmethod
+    def _predicate(type_name, component, op, value):
+        """
+        Compiles a comparison for values of a data type.
+        Without component all components of a point or color have to satisfy it.
+        Returns None if the comparison can not match values of this type
+        :return: FilterPredicate|None
+        """
+        if isinstance(value, str):
+            return FilterPredicate(FilterType.SINGLE_VALUE, op, value) if component is None else None
+        filter_type, size = _COMPOSITE_TYPES.get(type_name, (FilterType.SINGLE_VALUE, 1))
+        if size == 1:
+            return FilterPredicate(filter_type, op, value) if component is None else None
+        if component is None:
+            return FilterPredicate(filter_type, (op,) * size, (value,) * size)
+        if component >= size:
+            return None
+        return FilterPredicate(filter_type,
+                               tuple(op if i == component else '' for i in range(size)),
+                               tuple(value if i == component else 0 for i in range(size)))
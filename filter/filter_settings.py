@@ -10,7 +10,7 @@ class FilterSettings(object):
     """
 
     def __init__(self, view):
-        self._idx = view.filterList.count()
+        self._idx = view.next_filter_idx()
         self._text = view.combItems.currentText()
 
         idx = view.stackedWidget.currentIndex()
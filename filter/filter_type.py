@@ -6,3 +6,4 @@ class FilterType(Enum):
     POINT2 = 1
     POINT3 = 2
     COLOR3 = 3
+    QUERY = 4
@@ -0,0 +1,127 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from PySide2.QtCore import QThread
+from PySide2.QtCore import Signal
+from filter.filter import Filter
+import threading
+import logging
+
+
+class FilterWorker(QThread):
+
+    """
+        FilterWorker
+        Evaluates filter masks in a background thread, so filtering large pixels does not block the ui.
+        A submitted job supersedes the pending and the running job, superseded jobs are cancelled
+        before their next filter and their results are not delivered.
+        Progress and results are sent via Qt Signals.
+    """
+
+    # (job id, evaluated filters, amount of filters)
+    _progressSig = Signal(int, int, int)
+    # (job id, (render data, {filter idx : mask}))
+    _resultSig = Signal(int, object)
+
+    def __init__(self):
+        QThread.__init__(self)
+        self._condition = threading.Condition()
+        self._job = None
+        self._job_id = 0
+        self._stopped = False
+
+    def set_callbacks(self, progress_callback, result_callback):
+        """
+        Connects the Qt Signals to Qt Slot callback functions
+        :param progress_callback: QtSlot callback function(job_id, done, total)
+        :param result_callback: QtSlot callback function(job_id, (render_data, masks))
+        :return:
+        """
+        self._progressSig.connect(progress_callback)
+        self._resultSig.connect(result_callback)
+
+    def submit(self, render_data, filters):
+        """
+        Evaluates the filters on render_data, supersedes the current job.
+        Returns the id of the new job
+        :param render_data: RenderData
+        :param filters: list of FilterSettings or FilterQuery
+        :return: integer
+        """
+        with self._condition:
+            self._job_id += 1
+            self._job = (self._job_id, render_data, list(filters))
+            self._condition.notify()
+            return self._job_id
+
+    def cancel(self):
+        """
+        Cancels the pending and the running job
+        :return:
+        """
+        with self._condition:
+            self._job_id += 1
+            self._job = None
+
+    def is_current(self, job_id):
+        """
+        Returns if job_id is the latest submitted job and was not cancelled
+        :param job_id: integer
+        :return: boolean
+        """
+        return job_id == self._job_id
+
+    def stop(self):
+        """
+        Stops the thread, the running filter is finished first
+        :return:
+        """
+        with self._condition:
+            self._stopped = True
+            self._job_id += 1
+            self._job = None
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._job is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                job_id, render_data, filters = self._job
+                self._job = None
+            masks = {}
+            for i, filter_settings in enumerate(filters):
+                if not self.is_current(job_id):
+                    logging.info("Filter job {} cancelled".format(job_id))
+                    break
+                try:
+                    masks[filter_settings.get_idx()] = Filter.filter_mask(filter_settings, render_data)
+                except Exception as e:
+                    logging.error("Issue with filter {} ... {}".format(filter_settings.get_idx(), e))
+                self._progressSig.emit(job_id, i + 1, len(filters))
+            else:
+                self._resultSig.emit(job_id, (render_data, masks))
@@ -0,0 +1,87 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import numpy as np
+
+
+class PathMask(object):
+
+    """
+        PathMask
+        Boolean mask over the paths of a pixel, packed into 64 bit words.
+        Masks are combined by bitwise operations on the words, bits beyond size are ignored.
+    """
+
+    def __init__(self, words, size):
+        self._words = words
+        self._size = size
+
+    @staticmethod
+    def from_bool(mask):
+        """
+        Packs a boolean mask
+        :param mask: numpy array bool
+        :return: PathMask
+        """
+        bits = np.packbits(mask, bitorder='little')
+        buffer = np.zeros(-(-len(bits) // 8) * 8, dtype=np.uint8)
+        buffer[:len(bits)] = bits
+        return PathMask(buffer.view(np.uint64), len(mask))
+
+    @staticmethod
+    def full(size):
+        """
+        Returns a mask with all paths set
+        :param size: amount of paths
+        :return: PathMask
+        """
+        return PathMask(np.full(-(-size // 64), np.iinfo(np.uint64).max, dtype=np.uint64), size)
+
+    @property
+    def size(self):
+        return self._size
+
+    def to_bool(self):
+        """
+        Unpacks the mask
+        :return: numpy array bool
+        """
+        return np.unpackbits(self._words.view(np.uint8), count=self._size, bitorder='little').view(bool)
+
+    def copy(self):
+        return PathMask(self._words.copy(), self._size)
+
+    def __and__(self, other):
+        return PathMask(self._words & other._words, self._size)
+
+    def __or__(self, other):
+        return PathMask(self._words | other._words, self._size)
+
+    def __iand__(self, other):
+        self._words &= other._words
+        return self
+
+    def __ior__(self, other):
+        self._words |= other._words
+        return self
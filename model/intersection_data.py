@@ -23,6 +23,8 @@
 """
 
 from model.user_data import UserData
+from core.color3 import Color3f
+from core.point3 import Point3f
 import logging
 
 
@@ -160,3 +162,77 @@ class IntersectionData(UserData):
         """
         return self._li
 
+
+
+class IntersectionDataView(IntersectionData):
+
+    """
+        IntersectionDataView
+        Thin view of one intersection (vertex) within RenderDataColumns,
+        values are read from the columns on access.
+        decode_user_data(user_data, pos) fills a UserData object from the payload at pos on first access.
+    """
+
+    def __init__(self, columns, index, decode_user_data):
+        UserData.__init__(self, decode_user_data, int(columns.vertex_columns['user_data_span'][index, 0]))
+        self._columns = columns
+        self._index = index
+
+    @property
+    def index(self):
+        """
+        Returns the row of this intersection within the vertex columns
+        :return: integer
+        """
+        return self._index
+
+    def _point(self, flag, name):
+        columns = self._columns.vertex_columns
+        if not columns[flag][self._index]:
+            return None
+        return Point3f.from_row(columns[name], self._index)
+
+    @property
+    def depth_idx(self):
+        return int(self._columns.vertex_columns['depth_idx'][self._index])
+
+    @property
+    def is_pos_set(self):
+        return bool(self._columns.vertex_columns['has_pos'][self._index])
+
+    @property
+    def is_ne_set(self):
+        return bool(self._columns.vertex_columns['has_ne'][self._index])
+
+    @property
+    def is_ne_occluded(self):
+        if not self.is_ne_set:
+            return None
+        return bool(self._columns.vertex_columns['occluded_ne'][self._index])
+
+    @property
+    def is_envmap_set(self):
+        return bool(self._columns.vertex_columns['has_envmap'][self._index])
+
+    @property
+    def is_li_set(self):
+        return bool(self._columns.vertex_columns['has_li'][self._index])
+
+    @property
+    def pos(self):
+        return self._point('has_pos', 'pos')
+
+    @property
+    def pos_ne(self):
+        return self._point('has_ne', 'pos_ne')
+
+    @property
+    def pos_envmap(self):
+        return self._point('has_envmap', 'pos_envmap')
+
+    @property
+    def li(self):
+        columns = self._columns.vertex_columns
+        if not columns['has_li'][self._index]:
+            return None
+        return Color3f.from_row(columns['li'], self._index)
@@ -0,0 +1,155 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from model.mesh_data import Mesh
+from model.mesh_data import Sphere
+from core.messages import MeshType
+from core.color3 import Color3f
+from core.point3 import Point3f
+import numpy as np
+import logging
+import json
+import os
+import re
+
+
+class MeshCache(object):
+
+    """
+        MeshCache
+        Keeps the scene geometry on disk, keyed by scene name and the geometry hash reported by the server.
+        Every triangle mesh is stored as .npy blobs (vertices and triangles in vtk cell layout),
+        which are memory mapped back and handed to vtk without deserialization.
+        The index file is written after the last announced mesh, a scene without index is incomplete.
+    """
+
+    INDEX_FILENAME = 'meshes.json'
+
+    def __init__(self, directory=None):
+        if not directory:
+            directory = os.path.join(os.path.expanduser('~'), '.cache', 'emca', 'meshes')
+        self._directory = directory
+        # directory of the current scene and geometry hash
+        self._scene_directory = None
+        self._mesh_count = 0
+        # index entries of the meshes stored so far
+        self._entries = []
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def scene_directory(self):
+        return self._scene_directory
+
+    def set_scene(self, scene_name, geometry_hash, mesh_count):
+        """
+        Selects the scene, meshes stored from now on belong to it
+        :param scene_name: str
+        :param geometry_hash: str
+        :param mesh_count: amount of scene objects announced by the server
+        :return:
+        """
+        scene_name = re.sub(r'[^\w.-]', '_', str(scene_name))
+        geometry_hash = re.sub(r'[^\w]', '_', str(geometry_hash))
+        self._scene_directory = os.path.join(self._directory, scene_name, geometry_hash)
+        self._mesh_count = int(mesh_count)
+        self._entries = []
+
+    def is_complete(self):
+        """
+        Returns if all meshes of the current scene are cached
+        :return: boolean
+        """
+        if self._scene_directory is None:
+            return False
+        return os.path.exists(os.path.join(self._scene_directory, self.INDEX_FILENAME))
+
+    def load(self):
+        """
+        Loads all meshes of the current scene, the arrays are memory mapped copy-on-write
+        :return: list[Mesh|Sphere] or None if the scene is not cached
+        """
+        if not self.is_complete():
+            return None
+        try:
+            with open(os.path.join(self._scene_directory, self.INDEX_FILENAME), 'r') as f:
+                entries = json.load(f)
+            meshes = []
+            for entry in entries:
+                specular_color = Color3f(*entry['specular_color'])
+                diffuse_color = Color3f(*entry['diffuse_color'])
+                if entry['mesh_type'] == MeshType.SphereMesh.value:
+                    meshes.append(Sphere.from_values(entry['radius'], Point3f(*entry['center']),
+                                                     specular_color, diffuse_color))
+                    continue
+                # vtk uses the memory directly and requires writable arrays
+                vertices = np.load(os.path.join(self._scene_directory, entry['vertices']), mmap_mode='c')
+                triangles = np.load(os.path.join(self._scene_directory, entry['triangles']), mmap_mode='c')
+                meshes.append(Mesh.from_arrays(vertices, triangles, specular_color, diffuse_color))
+        except (OSError, ValueError, KeyError) as e:
+            logging.error('Could not load cached scene {}: {}'.format(self._scene_directory, e))
+            return None
+        logging.info('Load {} cached scene objects from {}'.format(len(meshes), self._scene_directory))
+        return meshes
+
+    def store(self, mesh):
+        """
+        Stores the next mesh of the current scene,
+        the scene is complete once all announced meshes are stored
+        :param mesh: Mesh|Sphere
+        :return:
+        """
+        if self._scene_directory is None or len(self._entries) >= self._mesh_count or self.is_complete():
+            return
+        index = len(self._entries)
+        entry = {'mesh_type': mesh.mesh_type.value,
+                 'specular_color': mesh.specular_color.to_list(),
+                 'diffuse_color': mesh.diffuse_color.to_list()}
+        try:
+            os.makedirs(self._scene_directory, exist_ok=True)
+            if mesh.mesh_type is MeshType.SphereMesh:
+                entry['radius'] = mesh.radius
+                entry['center'] = list(mesh.center.to_tuple())
+            else:
+                entry['vertices'] = 'mesh_{}_vertices.npy'.format(index)
+                entry['triangles'] = 'mesh_{}_triangles.npy'.format(index)
+                np.save(os.path.join(self._scene_directory, entry['vertices']), mesh.vertices)
+                np.save(os.path.join(self._scene_directory, entry['triangles']), mesh.triangles)
+            self._entries.append(entry)
+            if len(self._entries) == self._mesh_count:
+                self._write_index()
+        except OSError as e:
+            logging.error('Could not cache scene object {}: {}'.format(index, e))
+            # the scene stays incomplete
+            self._scene_directory = None
+
+    def _write_index(self):
+        filepath = os.path.join(self._scene_directory, self.INDEX_FILENAME)
+        tmp_filepath = '{}.{}.tmp'.format(filepath, os.getpid())
+        with open(tmp_filepath, 'w') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_filepath, filepath)
+        logging.info('Cached {} scene objects in {}'.format(len(self._entries), self._scene_directory))
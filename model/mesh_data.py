@@ -57,17 +57,40 @@ class Mesh(object):
         """
 
         self._vertex_count = stream.read_uint()
-        self._vertices = np.array(stream.read_float_array(self._vertex_count*3), 'f')
+        # vtk uses the vertex memory directly, small reads may be served as read-only bytes
+        self._vertices = np.require(stream.read_float_array_np(self._vertex_count*3), 'f', ['C', 'W'])
 
         self._triangle_count = stream.read_uint()
-        triangle_indices = np.array(stream.read_int_array(self._triangle_count*3), 'q')
-        self._triangles = np.concatenate([np.full([self._triangle_count, 1], 3, 'q'),
-                                          triangle_indices.reshape([self._triangle_count, 3])], axis=1).flatten()
+        triangle_indices = stream.read_int_array_np(self._triangle_count*3)
+        # vtk cell layout [3, i0, i1, i2, 3, ...]
+        triangles = np.empty([self._triangle_count, 4], 'q')
+        triangles[:, 0] = 3
+        triangles[:, 1:] = triangle_indices.reshape([self._triangle_count, 3])
+        self._triangles = triangles.reshape(-1)
 
         # remember we got the alpha channel!
         self._specular_color = stream.read_color3f()
         self._diffuse_color = stream.read_color3f()
 
+    @staticmethod
+    def from_arrays(vertices, triangles, specular_color, diffuse_color):
+        """
+        Creates a mesh of already deserialized arrays (e.g. memory mapped from the mesh cache)
+        :param vertices: np.array float32 [vertex_count*3]
+        :param triangles: np.array int64 in vtk cell layout [triangle_count*4]
+        :param specular_color: Color3f
+        :param diffuse_color: Color3f
+        :return: Mesh
+        """
+        mesh = Mesh()
+        mesh._vertex_count = len(vertices) // 3
+        mesh._vertices = vertices
+        mesh._triangle_count = len(triangles) // 4
+        mesh._triangles = triangles
+        mesh._specular_color = specular_color
+        mesh._diffuse_color = diffuse_color
+        return mesh
+
     @property
     def mesh_type(self):
         return self._mesh_type
@@ -160,6 +183,23 @@ class Sphere(object):
         self._diffuse_color = stream.read_color3f()
         self._specular_color = stream.read_color3f()
 
+    @staticmethod
+    def from_values(radius, center, specular_color, diffuse_color):
+        """
+        Creates a sphere of already deserialized values
+        :param radius: float
+        :param center: Point3f
+        :param specular_color: Color3f
+        :param diffuse_color: Color3f
+        :return: Sphere
+        """
+        sphere = Sphere()
+        sphere._radius = radius
+        sphere._center = center
+        sphere._specular_color = specular_color
+        sphere._diffuse_color = diffuse_color
+        return sphere
+
     @property
     def mesh_type(self):
         return self._mesh_type
@@ -237,6 +277,14 @@ class MeshData(object):
             sphere.deserialize(stream)
             self._meshes.append(sphere)
 
+    def append(self, mesh):
+        """
+        Appends a Mesh or Sphere object which was not deserialized from the socket stream
+        :param mesh: Mesh|Sphere
+        :return:
+        """
+        self._meshes.append(mesh)
+
     @property
     def mesh_count(self):
         """
@@ -28,6 +28,7 @@ from model.render_info import RenderInfo
 from model.camera_data import CameraData
 from model.mesh_data import MeshData
 from model.render_data import RenderData
+from model.render_data_decoder import RenderDataDecoder
 from model.contribution_data import SampleContributionData
 from PySide2.QtCore import Signal
 from PySide2.QtCore import QObject
@@ -59,6 +60,7 @@ class Model(QObject):
         self._camera_data = CameraData()
         self._mesh_data = MeshData()
         self._render_data = RenderData()
+        self._render_data_decoder = RenderDataDecoder()
         self._final_estimate_data = SampleContributionData()
 
         # Model also holds refs to filter and detector
@@ -71,7 +73,11 @@ class Model(QObject):
         self._current_intersection_tpl = ()
 
         self._server_side_supported_plugins = []
+        # server announced the scene hash request
+        self._server_scene_hash = False
         self._server_render_system = None
+        # MeshCache or None
+        self._mesh_cache = None
         self._controller = None
 
     def set_callback(self, callback):
@@ -133,6 +139,30 @@ class Model(QObject):
     def server_side_supported_plugins(self):
         return self._server_side_supported_plugins
 
+    @property
+    def server_supports_scene_hash(self):
+        """
+        Returns if the server answers scene hash requests
+        :return: boolean
+        """
+        return self._server_scene_hash
+
+    @server_supports_scene_hash.setter
+    def server_supports_scene_hash(self, supported):
+        self._server_scene_hash = supported
+
+    @property
+    def mesh_cache(self):
+        return self._mesh_cache
+
+    @mesh_cache.setter
+    def mesh_cache(self, mesh_cache):
+        """
+        Sets the scene geometry cache, None disables it
+        :param mesh_cache: MeshCache|None
+        """
+        self._mesh_cache = mesh_cache
+
     @property
     def plugins_handler(self):
         """
@@ -245,9 +275,12 @@ class Model(QObject):
         """
         start = time.time()
         self._server_side_supported_plugins.clear()
+        # the capabilities of the server follow the supported plugins
+        self._server_scene_hash = False
         msg_len = stream.read_uint()
         for i in range(0, msg_len):
-            self._server_side_supported_plugins.append(stream.read_short())
+            plugin_id = stream.read_short()
+            self._server_side_supported_plugins.append(plugin_id)
         logging.info('Supported Plugins = {}'.format(self._server_side_supported_plugins))
         logging.info('serialize supported plugin keys in: {:.3}s'.format(time.time() - start))
         self.sendStateMsgSig.emit((StateMsg.SUPPORTED_PLUGINS, self._server_side_supported_plugins))
@@ -295,17 +328,97 @@ class Model(QObject):
         start = time.time()
         self._mesh_data.deserialize(stream=stream)
         logging.info('deserialize mesh item in: {:.3}s'.format(time.time() - start))
+        if self._mesh_cache is not None:
+            self._mesh_cache.store(self._mesh_data.meshes[-1])
         self.sendStateMsgSig.emit((StateMsg.DATA_MESH, self._mesh_data.meshes[-1]))
 
-    def deserialize_render_data(self, stream):
+    def deserialize_scene_hash(self, stream):
         """
-        Deserialize Render data and informs the controller about it
+        Deserialize the geometry hash of the scene and the amount of scene objects,
+        informs the controller if the scene can be loaded from the mesh cache
         :param stream:
         :return:
         """
+        geometry_hash = stream.read_string()
+        mesh_count = stream.read_uint()
+        logging.info('Scene hash = {} with {} objects'.format(geometry_hash, mesh_count))
+        self._mesh_data.clear()
+        is_cached = False
+        if self._mesh_cache is not None:
+            self._mesh_cache.set_scene(self._render_info.scene_name, geometry_hash, mesh_count)
+            is_cached = self._mesh_cache.is_complete()
+        self.sendStateMsgSig.emit((StateMsg.DATA_SCENE_HASH, is_cached))
+
+    def load_cached_scene(self):
+        """
+        Loads all scene objects from the mesh cache and informs the controller about every object
+        :return: True if the scene was cached
+        """
+        if self._mesh_cache is None:
+            return False
         start = time.time()
-        self._render_data.deserialize(stream=stream)
+        meshes = self._mesh_cache.load()
+        if meshes is None:
+            return False
+        self._mesh_data.clear()
+        for mesh in meshes:
+            self._mesh_data.append(mesh)
+        logging.info('load cached scene objects in: {:.3}s'.format(time.time() - start))
+        for mesh in meshes:
+            self.sendStateMsgSig.emit((StateMsg.DATA_MESH, mesh))
+        return True
+
+    def decode_render_data(self, stream, is_cancelled=None):
+        """
+        Deserialize Render data into a new RenderData object without informing the controller.
+        Returns None if decoding was cancelled
+        :param stream:
+        :param is_cancelled: function() -> boolean or None
+        :return: RenderData|None
+        """
+        start = time.time()
+        render_data = self._render_data_decoder.decode(stream, RenderData(), is_cancelled)
         logging.info('deserialize render data in: {:.3}s'.format(time.time() - start))
+        return render_data
+
+    def build_render_data(self, columns):
+        """
+        Creates a new RenderData object from decoded columns without informing the controller
+        :param columns: RenderDataColumns
+        :return: RenderData
+        """
+        start = time.time()
+        render_data = self._render_data_decoder.build(columns, RenderData())
+        logging.info('build render data in: {:.3}s'.format(time.time() - start))
+        return render_data
+
+    def skip_render_data(self, stream):
+        """
+        Reads and discards Render data which is not needed anymore
+        :param stream:
+        :return:
+        """
+        start = time.time()
+        self._render_data_decoder.skip(stream)
+        logging.info('skipped render data in: {:.3}s'.format(time.time() - start))
+
+    def deserialize_render_data(self, stream):
+        """
+        Deserialize Render data and informs the controller about it
+        :param stream:
+        :return: RenderData
+        """
+        render_data = self.decode_render_data(stream)
+        self.load_render_data(render_data)
+        return render_data
+
+    def load_render_data(self, render_data):
+        """
+        Sets the current Render data (e.g. from the cache) and informs the controller about it
+        :param render_data: RenderData
+        :return:
+        """
+        self._render_data = render_data
         self.sendStateMsgSig.emit((StateMsg.DATA_RENDER, self._render_data))
 
     def load_sample_contribution_data(self, dict_paths):
@@ -54,7 +54,14 @@ class OptionsConfig(object):
             self._config['Options'] = {
                 'auto_connect': 'False',
                 'auto_scene_load': 'False',
-                'auto_rendered_image_load': 'False'}
+                'auto_rendered_image_load': 'False',
+                'decode_in_process': 'False',
+                'render_data_cache_size': '512',
+                'render_data_disk_cache': 'False',
+                'render_data_disk_cache_size': '2048',
+                'render_data_disk_cache_dir': '',
+                'mesh_cache': 'True',
+                'mesh_cache_dir': ''}
             self._config['Last'] = {
                 'hostname': 'localhost',
                 'port': '50013',
@@ -105,6 +112,84 @@ class OptionsConfig(object):
     def set_option_auto_image_load(self, value):
         self._config['Options']['auto_rendered_image_load'] = str(value)
 
+    def get_option_decode_in_process(self):
+        try:
+            val = self._config['Options']['decode_in_process']
+            return val == 'True'
+        except Exception as e:
+            logging.error(e)
+            return False
+
+    def set_option_decode_in_process(self, value):
+        self._config['Options']['decode_in_process'] = str(value)
+
+    def get_option_render_data_cache_size(self):
+        # memory budget of the render data cache in megabytes
+        try:
+            return int(self._config['Options']['render_data_cache_size'])
+        except Exception as e:
+            logging.error(e)
+            return 512
+
+    def set_option_render_data_cache_size(self, value):
+        self._config['Options']['render_data_cache_size'] = str(int(value))
+
+    def get_option_render_data_disk_cache(self):
+        # persist pixels across sessions, only meaningful for deterministic rendering
+        try:
+            val = self._config['Options']['render_data_disk_cache']
+            return val == 'True'
+        except Exception as e:
+            logging.error(e)
+            return False
+
+    def set_option_render_data_disk_cache(self, value):
+        self._config['Options']['render_data_disk_cache'] = str(value)
+
+    def get_option_render_data_disk_cache_size(self):
+        # memory budget of the disk cache in megabytes
+        try:
+            return int(self._config['Options']['render_data_disk_cache_size'])
+        except Exception as e:
+            logging.error(e)
+            return 2048
+
+    def set_option_render_data_disk_cache_size(self, value):
+        self._config['Options']['render_data_disk_cache_size'] = str(int(value))
+
+    def get_option_render_data_disk_cache_dir(self):
+        # empty for the default directory ~/.cache/emca/render_data
+        try:
+            return self._config['Options']['render_data_disk_cache_dir']
+        except Exception as e:
+            logging.error(e)
+            return ''
+
+    def set_option_render_data_disk_cache_dir(self, value):
+        self._config['Options']['render_data_disk_cache_dir'] = str(value)
+
+    def get_option_mesh_cache(self):
+        try:
+            val = self._config['Options']['mesh_cache']
+            return val == 'True'
+        except Exception as e:
+            logging.error(e)
+            return False
+
+    def set_option_mesh_cache(self, value):
+        self._config['Options']['mesh_cache'] = str(value)
+
+    def get_option_mesh_cache_dir(self):
+        # empty for the default directory ~/.cache/emca/meshes
+        try:
+            return self._config['Options']['mesh_cache_dir']
+        except Exception as e:
+            logging.error(e)
+            return ''
+
+    def set_option_mesh_cache_dir(self, value):
+        self._config['Options']['mesh_cache_dir'] = str(value)
+
     def get_last_hostname(self):
         return self._config['Last']['hostname']
 
@@ -23,6 +23,9 @@
 """
 
 from model.intersection_data import IntersectionData
+from model.intersection_data import IntersectionDataView
+from core.color3 import Color3f
+from core.point3 import Point3f
 from model.user_data import UserData
 import logging
 
@@ -141,7 +144,7 @@ class PathData(UserData):
         Checks if the path depth is valid (path_depth != -1)
         :return: bool
         """
-        return self._path_depth != -1
+        return self.path_depth != -1
 
     def to_string(self):
         return "SampleIdx = {}\n" \
@@ -151,6 +154,88 @@ class PathData(UserData):
                "ShowPath = {}\n" \
                "ShowNe = {}\n" \
                "Intersections = {}\n" \
-               "IntersectionCount = {}".format(self._sample_idx, self._path_depth, self._path_origin,
-                                               self._final_estimate, self._show_path, self._show_ne,
-                                               self._dict_intersections, self._intersection_count)
+               "IntersectionCount = {}".format(self.sample_idx, self.path_depth, self.path_origin,
+                                               self.final_estimate, self.is_show_path, self.is_show_ne,
+                                               self.intersections, self.intersection_count)
+
+
+class PathDataView(PathData):
+
+    """
+        PathDataView
+        Thin view of one path within RenderDataColumns,
+        path values are read from the columns on access, intersection views are created on first access.
+        decode_user_data(user_data, pos) fills a UserData object from the payload at pos on first access.
+    """
+
+    def __init__(self, columns, index, decode_user_data):
+        UserData.__init__(self, decode_user_data, int(columns.path_columns['user_data_span'][index, 0]))
+        self._columns = columns
+        self._index = index
+        self._decode_user_data = decode_user_data
+        self._dict_intersections = None
+
+    @property
+    def columns(self):
+        """
+        Returns the columns this path is a view of
+        :return: RenderDataColumns
+        """
+        return self._columns
+
+    @property
+    def index(self):
+        """
+        Returns the row of this path within the columns
+        :return: integer
+        """
+        return self._index
+
+    @property
+    def final_estimate(self):
+        columns = self._columns.path_columns
+        if not columns['has_final_estimate'][self._index]:
+            return None
+        return Color3f.from_row(columns['final_estimate'], self._index)
+
+    @property
+    def sample_idx(self):
+        return int(self._columns.path_columns['sample_idx'][self._index])
+
+    @property
+    def path_origin(self):
+        return Point3f.from_row(self._columns.path_columns['path_origin'], self._index)
+
+    @property
+    def path_depth(self):
+        return int(self._columns.path_columns['path_depth'][self._index])
+
+    @property
+    def intersections(self):
+        if self._dict_intersections is None:
+            first, last = self.vertex_range()
+            keys = self._columns.vertex_columns['intersection_idx'][first:last].tolist()
+            self._dict_intersections = {key: IntersectionDataView(self._columns, first + i, self._decode_user_data)
+                                        for i, key in enumerate(keys)}
+        return self._dict_intersections
+
+    @property
+    def is_show_path(self):
+        return bool(self._columns.path_columns['show_path'][self._index])
+
+    @property
+    def is_show_ne(self):
+        return bool(self._columns.path_columns['show_ne'][self._index])
+
+    @property
+    def intersection_count(self):
+        first, last = self.vertex_range()
+        return last - first
+
+    def vertex_range(self):
+        """
+        Returns the rows [first, last) of the vertices of this path within the vertex columns
+        :return: (integer, integer)
+        """
+        offsets = self._columns.path_columns['vertex_offsets']
+        return int(offsets[self._index]), int(offsets[self._index + 1])
@@ -22,7 +22,9 @@
     SOFTWARE.
 """
 
-from model.path_data import PathData
+from model.path_data import PathDataView
+from model.render_data_decoder import RenderDataDecoder
+from model.user_data_columns import UserDataColumns
 import numpy as np
 import logging
 
@@ -34,6 +36,7 @@ class RenderData(object):
         Represents information about one pixel.
         The data is computed on the server side in the pixel re-rendering step.
         Containing all information about all traced paths through this pixel with all user added information.
+        The path data is stored in RenderDataColumns, the PathData objects are thin views of it.
     """
 
     def __init__(self):
@@ -41,6 +44,10 @@ class RenderData(object):
         self._sample_count = -1
         # {sample_index / path_index : PathData}
         self._dict_paths = {}
+        # struct-of-arrays store of all paths
+        self._columns = None
+        # index of the user data keys, built together with the columns
+        self._user_data_columns = None
 
     def deserialize(self, stream):
         """
@@ -48,15 +55,52 @@ class RenderData(object):
         :param stream:
         :return:
         """
-        self._sample_count = stream.read_uint()
-        self._dict_paths.clear()
+        RenderDataDecoder().decode(stream, self)
+
+    def set_columns(self, columns, decode_user_data):
+        """
+        Sets the columns of this pixel and creates a view for every path
+        :param columns: RenderDataColumns
+        :param decode_user_data: function(user_data, pos) decoding user data from the payload
+        :return:
+        """
+        self.clear()
+        self._sample_count = columns.sample_count
+        self._columns = columns
+        self._user_data_columns = UserDataColumns.from_columns(columns)
         logging.info("SampleCount: {}".format(self._sample_count))
-        # deserialize the amount of paths which were traced through the selected pixel
-        for sample in range(0, self._sample_count):
-            path_data = PathData()
-            path_data.deserialize(stream)
-            # append deserialized path to dict
-            self._dict_paths[path_data.sample_idx] = path_data
+        sample_indices = columns.path_columns['sample_idx'].tolist()
+        self._dict_paths = {sample_idx: PathDataView(columns, index, decode_user_data)
+                            for index, sample_idx in enumerate(sample_indices)}
+
+    @property
+    def columns(self):
+        """
+        Returns the struct-of-arrays store of all paths, for vectorized access
+        :return: RenderDataColumns|None
+        """
+        return self._columns
+
+    @property
+    def user_data_columns(self):
+        """
+        Returns the index of the user data of all paths and intersections, one column per key
+        :return: UserDataColumns
+        """
+        if self._user_data_columns is None:
+            return UserDataColumns(len(self._dict_paths), {})
+        return self._user_data_columns
+
+    @property
+    def nbytes(self):
+        """
+        Returns the memory footprint of the columns,
+        lazily decoded user data is not taken into account
+        :return: integer
+        """
+        if self._columns is None:
+            return 0
+        return self._columns.nbytes
 
     @property
     def dict_paths(self):
@@ -86,6 +130,8 @@ class RenderData(object):
         Returns all path indices as numpy array
         :return: numpy array
         """
+        if self._columns is not None:
+            return self._columns.path_columns['sample_idx'].copy()
         return np.array(list(self._dict_paths.keys()))
 
     def to_string(self):
@@ -102,4 +148,7 @@ class RenderData(object):
         :return:
         """
         self._sample_count = -1
-        self._dict_paths.clear()
+        self._dict_paths = {}
+        # views of the paths may still be referenced, the columns are released with them
+        self._columns = None
+        self._user_data_columns = None
@@ -0,0 +1,219 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from collections import OrderedDict
+import threading
+import logging
+
+
+class RenderDataCache(object):
+
+    """
+        RenderDataCache
+        Least recently used cache of received pixels, bounded by a memory budget in bytes.
+        Entries are keyed by (x, y, sample_count) and belong to the current render settings of the server,
+        all entries are dropped once the settings change or a new image is rendered.
+        Entries on disk additionally belong to the content hash of the rendered image.
+        The most recently added entry is never evicted, even if it exceeds the budget on its own.
+        An optional RenderDataDiskCache backs the cache, added entries are written through.
+        get only looks up the memory, entries on disk are loaded explicitly by load_from_disk.
+        Invalidating drops the entries in memory only.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self._max_bytes = max(0, int(max_bytes))
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        # render settings of the server the cached pixels were rendered with
+        self._render_settings = None
+        # hash of the rendered image, the disk cache is only used if it is known
+        self._content_hash = None
+        # RenderDataDiskCache or None
+        self._disk_cache = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        with self._lock:
+            self._max_bytes = max(0, int(max_bytes))
+            self._evict()
+
+    @property
+    def nbytes(self):
+        """
+        Returns the memory footprint of all cached entries
+        :return: integer
+        """
+        return self._nbytes
+
+    @property
+    def render_settings(self):
+        return self._render_settings
+
+    @property
+    def disk_cache(self):
+        return self._disk_cache
+
+    @disk_cache.setter
+    def disk_cache(self, disk_cache):
+        """
+        Sets the persistent cache backing this cache, None disables it
+        :param disk_cache: RenderDataDiskCache|None
+        """
+        if disk_cache is not None:
+            disk_cache.set_render_settings(self._render_settings, self._content_hash)
+        if self._disk_cache is not None and self._disk_cache is not disk_cache:
+            # pending writes of the previous disk cache are still finished
+            self._disk_cache.close(wait=False)
+        self._disk_cache = disk_cache
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Returns the RenderData of key cached in memory and marks it as most recently used,
+        the disk cache is not looked up (see load_from_disk)
+        :param key: (x, y, sample_count)
+        :param default: returned if key is not cached
+        :return: RenderData|default
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def on_disk(self, key):
+        """
+        Returns if key can be loaded from the disk cache
+        :param key: (x, y, sample_count)
+        :return: boolean
+        """
+        disk_cache = self._disk_cache
+        return disk_cache is not None and disk_cache.contains(key)
+
+    def load_from_disk(self, key):
+        """
+        Loads the RenderData of key from the disk cache and adds it to the memory cache.
+        Maps the file and builds the RenderData, call it outside of locks and off the GUI thread
+        :param key: (x, y, sample_count)
+        :return: RenderData|None
+        """
+        disk_cache = self._disk_cache
+        if disk_cache is None:
+            return None
+        render_data = disk_cache.load(key)
+        if render_data is not None:
+            self._add(key, render_data)
+        return render_data
+
+    def put(self, key, render_data):
+        """
+        Adds the RenderData of key and evicts the least recently used entries until the budget is met,
+        the disk cache writes the entry in the background
+        :param key: (x, y, sample_count)
+        :param render_data: RenderData
+        :return:
+        """
+        self._add(key, render_data)
+        disk_cache = self._disk_cache
+        if disk_cache is not None:
+            disk_cache.store(key, render_data)
+
+    def _add(self, key, render_data):
+        nbytes = render_data.nbytes
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._entries[key] = (render_data, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def set_render_settings(self, render_settings):
+        """
+        Sets the render settings of the server, the cache is invalidated if they differ from the previous ones
+        :param render_settings: hashable settings, e.g. RenderInfo.settings_key()
+        :return: True if the cache was invalidated
+        """
+        with self._lock:
+            if render_settings == self._render_settings:
+                return False
+            self._render_settings = render_settings
+            # the image of the new settings is not rendered yet
+            self._content_hash = None
+            if self._disk_cache is not None:
+                self._disk_cache.set_render_settings(render_settings, None)
+        self.invalidate()
+        return True
+
+    def set_content_hash(self, content_hash):
+        """
+        Sets the hash of the rendered image, pixels on disk are only valid for the same image.
+        None disables the disk cache
+        :param content_hash: str|None
+        :return:
+        """
+        with self._lock:
+            self._content_hash = content_hash
+            if self._disk_cache is not None:
+                self._disk_cache.set_render_settings(self._render_settings, content_hash)
+
+    def invalidate(self):
+        """
+        Drops all cached entries
+        :return:
+        """
+        with self._lock:
+            if self._entries:
+                logging.info('Invalidate {} cached pixels ({:.1f} MB)'.format(
+                    len(self._entries), self._nbytes / (1024.0 * 1024.0)))
+            self._entries.clear()
+            self._nbytes = 0
+
+    def clear(self):
+        """
+        Drops all cached entries together with the render settings
+        :return:
+        """
+        self.invalidate()
+        self._render_settings = None
+        self._content_hash = None
+        if self._disk_cache is not None:
+            self._disk_cache.set_render_settings(None)
+
+    def _evict(self):
+        while self._nbytes > self._max_bytes and len(self._entries) > 1:
+            key, (render_data, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            logging.debug('Evict cached pixel {} ({} bytes)'.format(key, nbytes))
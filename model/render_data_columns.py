@@ -0,0 +1,336 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import numpy as np
+import logging
+import struct
+import json
+import mmap
+import threading
+import os
+
+
+# (name, dtype, components) of the per path columns
+PATH_COLUMNS = (
+    ('sample_idx', 'i4', 1),
+    ('path_depth', 'i4', 1),
+    ('path_origin', 'f4', 3),
+    ('has_final_estimate', '?', 1),
+    ('final_estimate', 'f4', 4),
+    ('show_path', '?', 1),
+    ('show_ne', '?', 1),
+    # CSR offsets into the vertex columns, path i owns vertices [offsets[i], offsets[i+1])
+    ('vertex_offsets', 'i8', 1),
+    # [start, end) of the serialized user data within the payload
+    ('user_data_span', 'i8', 2),
+)
+
+# (name, dtype, components) of the per vertex (intersection) columns
+VERTEX_COLUMNS = (
+    ('intersection_idx', 'i4', 1),
+    ('depth_idx', 'i4', 1),
+    ('has_pos', '?', 1),
+    ('pos', 'f4', 3),
+    ('has_ne', '?', 1),
+    ('pos_ne', 'f4', 3),
+    ('occluded_ne', '?', 1),
+    ('has_envmap', '?', 1),
+    ('pos_envmap', 'f4', 3),
+    ('has_li', '?', 1),
+    ('li', 'f4', 4),
+    ('user_data_span', 'i8', 2),
+)
+
+# (name, dtype, components) of the per user data entry columns, one entry per key of a path or vertex
+ENTRY_COLUMNS = (
+    # id of the key within the pixel and [start, end) of the key within the payload
+    ('key_id', 'i4', 1),
+    ('key_span', 'i8', 2),
+    # index of the data type in the order the user data dicts are sent
+    ('type_idx', 'i1', 1),
+    # offset of the first value within the payload and the amount of values
+    ('value_offset', 'i8', 1),
+    ('value_count', 'i4', 1),
+    ('path_row', 'i8', 1),
+    # vertex row or -1 for user data of the path
+    ('vertex_row', 'i8', 1),
+)
+
+# arrays within a shared memory block start at multiples of this
+_ALIGNMENT = 64
+
+# magic header of column files, followed by the length of the json header
+COLUMNS_FILE_MAGIC = b'EMCACOL\x02'
+_FILE_HEADER = struct.Struct('=8sI')
+
+
+class RenderDataColumns(object):
+
+    """
+        RenderDataColumns
+        Struct-of-arrays representation of a pixel payload.
+        Path and vertex attributes are stored in numpy columns, the vertices of a path are found by CSR offsets.
+        The raw payload is kept as well, user data is referenced by byte spans into it.
+        Every user data key is listed in the entry columns with the path and vertex row it belongs to.
+        All columns can be moved into one shared memory block and mapped by another process without copying,
+        the same block layout is used to persist the columns in a file which is memory mapped back.
+    """
+
+    def __init__(self, sample_count=0, path_columns=None, vertex_columns=None, payload=None, entry_columns=None):
+        self._sample_count = sample_count
+        self._path_columns = path_columns or {}
+        self._vertex_columns = vertex_columns or {}
+        self._entry_columns = entry_columns or {}
+        self._payload = payload if payload is not None else np.empty(0, np.uint8)
+        # shared memory block the columns are mapped from
+        self._shm = None
+        # memory mapped file the columns are mapped from
+        self._mmap = None
+
+    @staticmethod
+    def from_lists(sample_count, path_lists, vertex_lists, payload, entry_lists=None):
+        """
+        Creates the columns from python lists of flat values
+        :param sample_count: integer
+        :param path_lists: dict{name : list}
+        :param vertex_lists: dict{name : list}
+        :param payload: bytes-like
+        :param entry_lists: dict{name : list or np.array} or None
+        :return: RenderDataColumns
+        """
+        path_columns = RenderDataColumns._arrays_from_lists(PATH_COLUMNS, path_lists)
+        vertex_columns = RenderDataColumns._arrays_from_lists(VERTEX_COLUMNS, vertex_lists)
+        entry_columns = RenderDataColumns._arrays_from_lists(ENTRY_COLUMNS, entry_lists or {})
+        return RenderDataColumns(sample_count, path_columns, vertex_columns, np.frombuffer(payload, np.uint8),
+                                 entry_columns)
+
+    @staticmethod
+    def _arrays_from_lists(layout, lists):
+        arrays = {}
+        for name, dtype, dim in layout:
+            shape = (-1, dim) if dim > 1 else (-1,)
+            arrays[name] = np.array(lists.get(name, ()), dtype).reshape(shape)
+        return arrays
+
+    @property
+    def sample_count(self):
+        return self._sample_count
+
+    @property
+    def path_count(self):
+        return len(self._path_columns['sample_idx'])
+
+    @property
+    def vertex_count(self):
+        return len(self._vertex_columns['depth_idx'])
+
+    @property
+    def path_columns(self):
+        """
+        Returns the per path columns
+        :return: dict{name : np.array}
+        """
+        return self._path_columns
+
+    @property
+    def vertex_columns(self):
+        """
+        Returns the per vertex columns
+        :return: dict{name : np.array}
+        """
+        return self._vertex_columns
+
+    @property
+    def entry_count(self):
+        return len(self._entry_columns.get('type_idx', ()))
+
+    @property
+    def entry_columns(self):
+        """
+        Returns the per user data entry columns
+        :return: dict{name : np.array}
+        """
+        return self._entry_columns
+
+    @property
+    def payload(self):
+        """
+        Returns the raw pixel payload
+        :return: np.array uint8
+        """
+        return self._payload
+
+    @property
+    def nbytes(self):
+        """
+        Returns the memory footprint of all columns including the raw payload
+        :return: integer
+        """
+        return sum(array.nbytes for name, array in self._arrays())
+
+    def _arrays(self):
+        yield 'payload', self._payload
+        for name, array in self._path_columns.items():
+            yield 'path.' + name, array
+        for name, array in self._vertex_columns.items():
+            yield 'vertex.' + name, array
+        for name, array in self._entry_columns.items():
+            yield 'entry.' + name, array
+
+    def layout(self):
+        """
+        Returns the layout of all arrays within one contiguous block and its size in bytes
+        :return: (list[(name, dtype, shape, offset)], integer)
+        """
+        layout = []
+        offset = 0
+        for name, array in self._arrays():
+            layout.append((name, array.dtype.str, array.shape, offset))
+            offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        return layout, max(offset, 1)
+
+    def to_shared_memory(self):
+        """
+        Copies all arrays into a new shared memory block,
+        the caller owns the returned block and has to close it
+        :return: (SharedMemory, layout)
+        """
+        from multiprocessing import shared_memory
+        layout, size = self.layout()
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        for (name, array), (_, dtype, shape, offset) in zip(self._arrays(), layout):
+            target = np.ndarray(shape, dtype, buffer=shm.buf, offset=offset)
+            target[...] = array
+            del target
+        return shm, layout
+
+    @staticmethod
+    def from_shared_memory(name, sample_count, layout):
+        """
+        Maps the columns of a shared memory block without copying,
+        the name of the block is unlinked, it is freed once the columns are released
+        :param name: shared memory name
+        :param sample_count: integer
+        :param layout: list[(name, dtype, shape, offset)]
+        :return: RenderDataColumns
+        """
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=name)
+        shm.unlink()
+        columns = RenderDataColumns._from_buffer(shm.buf, 0, sample_count, layout)
+        columns._shm = shm
+        return columns
+
+    def to_file(self, filepath):
+        """
+        Writes all arrays in the block layout of to_shared_memory to a file, which can be mapped by from_file.
+        The file is written next to its target and renamed, readers never see a partial file
+        :param filepath: str
+        :return: size of the file in bytes
+        """
+        layout, size = self.layout()
+        header = json.dumps({'sample_count': self._sample_count,
+                             'layout': layout}).encode('utf-8')
+        data_offset = -(-(_FILE_HEADER.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+        tmp_filepath = '{}.{}.{}.tmp'.format(filepath, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp_filepath, 'wb') as f:
+                f.write(_FILE_HEADER.pack(COLUMNS_FILE_MAGIC, len(header)))
+                f.write(header)
+                for (name, array), (_, dtype, shape, offset) in zip(self._arrays(), layout):
+                    f.seek(data_offset + offset)
+                    f.write(np.ascontiguousarray(array).tobytes())
+                f.truncate(data_offset + size)
+            os.replace(tmp_filepath, filepath)
+        except BaseException:
+            # never leave a partial file behind
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+            raise
+        return data_offset + size
+
+    @staticmethod
+    def from_file(filepath):
+        """
+        Maps the columns of a file written by to_file without copying
+        :param filepath: str
+        :return: RenderDataColumns
+        """
+        with open(filepath, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, header_len = _FILE_HEADER.unpack_from(mapping, 0)
+            if magic != COLUMNS_FILE_MAGIC:
+                raise ValueError('{} is no render data columns file'.format(filepath))
+            header = json.loads(bytes(mapping[_FILE_HEADER.size:_FILE_HEADER.size + header_len]).decode('utf-8'))
+            data_offset = -(-(_FILE_HEADER.size + header_len) // _ALIGNMENT) * _ALIGNMENT
+            columns = RenderDataColumns._from_buffer(mapping, data_offset, header['sample_count'],
+                                                     [(name, dtype, tuple(shape), offset)
+                                                      for name, dtype, shape, offset in header['layout']])
+        except Exception:
+            mapping.close()
+            raise
+        columns._mmap = mapping
+        return columns
+
+    @staticmethod
+    def _from_buffer(buffer, data_offset, sample_count, layout):
+        columns = RenderDataColumns(sample_count)
+        for array_name, dtype, shape, offset in layout:
+            array = np.ndarray(shape, dtype, buffer=buffer, offset=data_offset + offset)
+            if array_name == 'payload':
+                columns._payload = array
+            elif array_name.startswith('path.'):
+                columns._path_columns[array_name[5:]] = array
+            elif array_name.startswith('entry.'):
+                columns._entry_columns[array_name[6:]] = array
+            else:
+                columns._vertex_columns[array_name[7:]] = array
+        return columns
+
+    def __del__(self):
+        self.release()
+
+    def release(self):
+        """
+        Drops all columns and closes the shared memory or file mapping
+        :return:
+        """
+        self._path_columns = {}
+        self._vertex_columns = {}
+        self._entry_columns = {}
+        self._payload = np.empty(0, np.uint8)
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                # columns are still referenced, the mapping is closed once they are released
+                logging.debug("Shared memory {} is still referenced".format(self._shm.name))
+            self._shm = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                logging.debug("Mapped columns file is still referenced")
+            self._mmap = None
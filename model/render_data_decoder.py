@@ -0,0 +1,413 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from model.render_data_columns import RenderDataColumns
+from model.render_data_columns import PATH_COLUMNS
+from model.render_data_columns import VERTEX_COLUMNS
+from stream.buffer_stream import BufferStream
+from stream.recording_stream import RecordingStream
+from stream.socket_stream import SocketStream
+from core.color3 import Color3f
+from core.point2 import Point2f
+from core.point2 import Point2i
+from core.point3 import Point3f
+from core.point3 import Point3i
+from functools import lru_cache
+import struct
+import logging
+import io
+import numpy as np
+
+
+# all records are packed ('=') since the server writes every field separately
+_INT = struct.Struct('=i')
+_UINT = struct.Struct('=I')
+_BOOL = struct.Struct('=?')
+_COLOR3F = struct.Struct('=4f')
+# sample_idx, path_depth, path_origin, final_estimate set
+_PATH_HEAD = struct.Struct('=ii3f?')
+# final_estimate, show_path, show_ne, intersection_count
+_PATH_TAIL_ESTIMATE = struct.Struct('=4f??I')
+# show_path, show_ne, intersection_count
+_PATH_TAIL = struct.Struct('=??I')
+# depth_idx, pos set
+_ITS_HEAD = struct.Struct('=i?')
+# point3f followed by the next set flag
+_POINT3F_BOOL = struct.Struct('=3f?')
+# pos_ne, occluded_ne, envmap set
+_POINT3F_BOOL_BOOL = struct.Struct('=3f??')
+
+# (format, components, value type) of the user data dicts in the order they are sent
+_USER_DATA_LAYOUT = (
+    ('?', 1, None),         # bool
+    ('f', 1, None),         # float
+    ('d', 1, None),         # double
+    ('i', 1, None),         # int
+    ('i', 2, Point2i),      # point2i
+    ('f', 2, Point2f),      # point2f
+    ('i', 3, Point3i),      # point3i
+    ('f', 3, Point3f),      # point3f
+    ('f', 4, Color3f),      # color3f
+    (None, 1, None),        # string
+)
+
+# (format, size in bytes of one value) of the user data dicts
+_USER_DATA_VALUE_SIZES = tuple((fmt, 0 if fmt is None else struct.calcsize('=' + fmt) * dim)
+                               for fmt, dim, cls in _USER_DATA_LAYOUT)
+
+
+@lru_cache(maxsize=1024)
+def array_struct(fmt, count):
+    """
+    Returns a cached precompiled struct for count packed items of fmt
+    :param fmt: struct format character
+    :param count: integer
+    :return: struct.Struct
+    """
+    return struct.Struct('={}{}'.format(count, fmt))
+
+
+class RenderDataDecoder(object):
+
+    """
+        RenderDataDecoder
+        Bulk decoder for the EMCA_HEADER_PIXEL_DATA payload.
+        Decodes the payload into RenderDataColumns, fixed size records and user data arrays
+        are read at once with precompiled structs from a memoryview cursor.
+        User data is decoded from the raw payload kept in the columns.
+    """
+
+    def decode(self, stream, render_data, is_cancelled=None):
+        """
+        Decodes the pixel payload from the stream into render_data.
+        is_cancelled is checked before every path, once it returns True
+        the rest of the payload is skipped and None is returned.
+        :param stream: Stream
+        :param render_data: RenderData
+        :param is_cancelled: function() -> boolean or None
+        :return: RenderData|None
+        """
+        if not isinstance(stream, BufferStream):
+            # the payload has no length prefix, collect it first to decode it from memory
+            payload = self.read_payload(stream, is_cancelled)
+            if payload is None:
+                return None
+            stream = BufferStream(payload)
+        columns = self.decode_columns(stream, is_cancelled)
+        if columns is None:
+            return None
+        return self.build(columns, render_data)
+
+    def read_payload(self, stream, is_cancelled=None):
+        """
+        Reads the raw bytes of a pixel payload, only counts and flags are unpacked.
+        Returns None if reading was cancelled, the rest of the payload is skipped then
+        :param stream: Stream
+        :param is_cancelled: function() -> boolean or None
+        :return: memoryview|None
+        """
+        if isinstance(stream, SocketStream):
+            # the payload is captured within the receive buffer
+            capture = None
+            recording = stream
+            stream.mark()
+        else:
+            capture = io.BytesIO()
+            recording = RecordingStream(stream, capture)
+        sample_count = recording.read_struct(_UINT)[0]
+        skip_paths = self.skip_paths
+        for sample in range(sample_count):
+            if is_cancelled is not None and is_cancelled():
+                logging.info("Reading cancelled, skip {} paths".format(sample_count - sample))
+                if capture is None:
+                    stream.captured()
+                skip_paths(stream, sample_count - sample)
+                return None
+            skip_paths(recording, 1)
+        if capture is None:
+            return memoryview(stream.captured())
+        return capture.getbuffer()
+
+    def skip(self, stream):
+        """
+        Reads and discards a whole pixel payload without creating any objects
+        :param stream: Stream
+        :return:
+        """
+        self.skip_paths(stream, stream.read_struct(_UINT)[0])
+
+    def skip_paths(self, stream, count):
+        """
+        Reads and discards count paths, only counts and flags are unpacked
+        :param stream: Stream
+        :param count: integer
+        :return:
+        """
+        read_struct = stream.read_struct
+        skip = stream.skip
+        skip_user_data = self.skip_user_data
+        for i in range(count):
+            skip_user_data(stream)
+            # sample_idx, path_depth, path_origin
+            skip(20)
+            if read_struct(_BOOL)[0]:
+                skip(_COLOR3F.size)
+            intersection_count = read_struct(_PATH_TAIL)[2]
+            for j in range(intersection_count):
+                # intersection index
+                skip(4)
+                skip_user_data(stream)
+                if read_struct(_ITS_HEAD)[1]:
+                    skip(12)
+                if read_struct(_BOOL)[0]:
+                    skip(13)
+                if read_struct(_BOOL)[0]:
+                    skip(12)
+                if read_struct(_BOOL)[0]:
+                    skip(_COLOR3F.size)
+
+    @staticmethod
+    def skip_user_data(stream):
+        """
+        Reads and discards all user data dicts of a path or intersection object
+        :param stream: Stream
+        :return:
+        """
+        read_struct = stream.read_struct
+        skip = stream.skip
+        for fmt, dim, cls in _USER_DATA_LAYOUT:
+            for i in range(read_struct(_UINT)[0]):
+                skip(read_struct(_INT)[0])
+                count = read_struct(_UINT)[0]
+                if fmt is None:
+                    for j in range(count):
+                        skip(read_struct(_INT)[0])
+                else:
+                    skip(count * dim * array_struct(fmt, 1).size)
+
+    @staticmethod
+    def index_user_data(stream, start_pos, entries, key_ids, path_row, vertex_row):
+        """
+        Reads over all user data dicts of a path or intersection object,
+        every key is appended to entries as (key_id, key_start, key_end, type_idx, value_offset, value_count,
+        path_row, vertex_row) with positions relative to the payload start
+        :param stream: BufferStream
+        :param start_pos: position of the payload start
+        :param entries: list
+        :param key_ids: dict{key : id} of the keys seen so far
+        :param path_row: integer
+        :param vertex_row: integer, -1 for user data of the path
+        :return:
+        """
+        read_struct = stream.read_struct
+        skip = stream.skip
+        tell = stream.tell
+        append = entries.append
+        for type_i, (fmt, value_size) in enumerate(_USER_DATA_VALUE_SIZES):
+            for i in range(read_struct(_UINT)[0]):
+                key_len = read_struct(_INT)[0]
+                key_start = tell() - start_pos
+                key, count = read_struct(array_struct('sI', key_len))
+                value_offset = tell() - start_pos
+                append((key_ids.setdefault(key, len(key_ids)), key_start, key_start + key_len, type_i,
+                        value_offset, count, path_row, vertex_row))
+                if fmt is None:
+                    for j in range(count):
+                        skip(read_struct(_INT)[0])
+                else:
+                    skip(count * value_size)
+
+    def decode_columns(self, stream, is_cancelled=None):
+        """
+        Decodes the pixel payload of a BufferStream into columns.
+        Only path and vertex attributes are unpacked, user data is referenced by its byte span within the buffer
+        and its keys are listed in the entry columns.
+        Returns None if decoding was cancelled
+        :param stream: BufferStream
+        :param is_cancelled: function() -> boolean or None
+        :return: RenderDataColumns|None
+        """
+        start_pos = stream.tell()
+        read_struct = stream.read_struct
+        tell = stream.tell
+        index_user_data = self.index_user_data
+        sample_count = read_struct(_UINT)[0]
+
+        paths = {name: [] for name, dtype, dim in PATH_COLUMNS}
+        vertices = {name: [] for name, dtype, dim in VERTEX_COLUMNS}
+        (sample_idx, path_depth, path_origin, has_final_estimate, final_estimate,
+         show_path, show_ne, vertex_offsets, path_user_data_span) = (paths[name] for name, dtype, dim in PATH_COLUMNS)
+        (intersection_idx, depth_idx, has_pos, pos, has_ne, pos_ne, occluded_ne,
+         has_envmap, pos_envmap, has_li, li, vertex_user_data_span) = (vertices[name] for name, dtype, dim in VERTEX_COLUMNS)
+        entries = []
+        key_ids = {}
+        no_point = (0.0, 0.0, 0.0)
+        no_color = (0.0, 0.0, 0.0, 0.0)
+
+        vertex_count = 0
+        for sample in range(sample_count):
+            if is_cancelled is not None and is_cancelled():
+                logging.info("Decoding cancelled, skip {} paths".format(sample_count - sample))
+                self.skip_paths(stream, sample_count - sample)
+                return None
+            user_data_start = tell()
+            index_user_data(stream, start_pos, entries, key_ids, sample, -1)
+            path_user_data_span.extend((user_data_start - start_pos, tell() - start_pos))
+
+            idx, depth, x, y, z, has_estimate = read_struct(_PATH_HEAD)
+            sample_idx.append(idx)
+            path_depth.append(depth)
+            path_origin.extend((x, y, z))
+            has_final_estimate.append(has_estimate)
+            if has_estimate:
+                r, g, b, a, show_p, show_n, intersection_count = read_struct(_PATH_TAIL_ESTIMATE)
+                final_estimate.extend((r, g, b, a))
+            else:
+                show_p, show_n, intersection_count = read_struct(_PATH_TAIL)
+                final_estimate.extend(no_color)
+            show_path.append(show_p)
+            show_ne.append(show_n)
+            vertex_offsets.append(vertex_count)
+            vertex_count += intersection_count
+
+            for i in range(intersection_count):
+                intersection_idx.append(read_struct(_INT)[0])
+                user_data_start = tell()
+                index_user_data(stream, start_pos, entries, key_ids, sample, vertex_count - intersection_count + i)
+                vertex_user_data_span.extend((user_data_start - start_pos, tell() - start_pos))
+
+                depth_i, set_pos = read_struct(_ITS_HEAD)
+                depth_idx.append(depth_i)
+                has_pos.append(set_pos)
+                if set_pos:
+                    x, y, z, set_ne = read_struct(_POINT3F_BOOL)
+                    pos.extend((x, y, z))
+                else:
+                    set_ne = read_struct(_BOOL)[0]
+                    pos.extend(no_point)
+
+                has_ne.append(set_ne)
+                if set_ne:
+                    x, y, z, occluded, set_envmap = read_struct(_POINT3F_BOOL_BOOL)
+                    pos_ne.extend((x, y, z))
+                    occluded_ne.append(occluded)
+                else:
+                    set_envmap = read_struct(_BOOL)[0]
+                    pos_ne.extend(no_point)
+                    occluded_ne.append(False)
+
+                has_envmap.append(set_envmap)
+                if set_envmap:
+                    x, y, z, set_li = read_struct(_POINT3F_BOOL)
+                    pos_envmap.extend((x, y, z))
+                else:
+                    set_li = read_struct(_BOOL)[0]
+                    pos_envmap.extend(no_point)
+
+                has_li.append(set_li)
+                li.extend(read_struct(_COLOR3F) if set_li else no_color)
+        vertex_offsets.append(vertex_count)
+
+        payload = stream.view[start_pos:stream.tell()]
+        records = np.array(entries, dtype=np.int64).reshape(-1, 8)
+        entry_lists = {'key_id': records[:, 0], 'key_span': records[:, 1:3], 'type_idx': records[:, 3],
+                       'value_offset': records[:, 4], 'value_count': records[:, 5],
+                       'path_row': records[:, 6], 'vertex_row': records[:, 7]}
+        return RenderDataColumns.from_lists(sample_count, paths, vertices, payload, entry_lists)
+
+    def build(self, columns, render_data):
+        """
+        Sets the columns of a pixel, the paths of render_data are views of them.
+        User data of a path or intersection is decoded from the payload on first access
+        :param columns: RenderDataColumns
+        :param render_data: RenderData
+        :return: RenderData
+        """
+        payload = columns.payload
+        decode_user_data = self.decode_user_data
+
+        def decode_user_data_at(user_data, pos):
+            # own cursor per call, user data may be loaded from several threads at once
+            stream = BufferStream(payload)
+            stream.seek(pos)
+            decode_user_data(stream, user_data)
+
+        render_data.set_columns(columns, decode_user_data_at)
+        return render_data
+
+    def decode_user_data(self, stream, user_data):
+        """
+        Decodes all user data dicts of a path or intersection object
+        :param stream: Stream
+        :param user_data: UserData
+        :return:
+        """
+        read_struct = stream.read_struct
+        decode_dict = self.decode_dict
+        dicts = []
+        for fmt, dim, cls in _USER_DATA_LAYOUT:
+            count = read_struct(_UINT)[0]
+            dicts.append(decode_dict(stream, count, fmt, dim, cls) if count else {})
+        (user_data._dict_bool, user_data._dict_float, user_data._dict_double, user_data._dict_int,
+         user_data._dict_point2i, user_data._dict_point2f, user_data._dict_point3i, user_data._dict_point3f,
+         user_data._dict_color3f, user_data._dict_string) = dicts
+        user_data._data = []
+        user_data.init_data_list()
+
+    @staticmethod
+    def decode_key(stream):
+        """
+        Decodes a user data key together with the amount of following values
+        :param stream: Stream
+        :return: (key, count)
+        """
+        key_len = stream.read_struct(_INT)[0]
+        key, count = stream.read_struct(array_struct('sI', key_len))
+        return key.decode('utf-8'), count
+
+    def decode_dict(self, stream, key_count, fmt, dim, cls):
+        """
+        Decodes one user data dict, all values of one key are unpacked at once
+        :param stream: Stream
+        :param key_count: amount of keys
+        :param fmt: struct format character of one component, None for strings
+        :param dim: amount of components per value
+        :param cls: value type wrapping dim components or None for scalars
+        :return: dict{name : [values], ...}
+        """
+        result = {}
+        for i in range(key_count):
+            key, count = self.decode_key(stream)
+            if fmt is None:
+                result[key] = [stream.read_string() for j in range(count)]
+                continue
+            compiled = array_struct(fmt, count * dim)
+            if cls is None:
+                result[key] = list(stream.read_struct(compiled))
+            else:
+                # values wrap the rows of one array instead of holding their own components
+                xs = np.frombuffer(stream.read(compiled.size), dtype='=' + fmt).reshape(count, dim)
+                result[key] = cls.from_rows(xs)
+        return result
@@ -0,0 +1,295 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from model.render_data import RenderData
+from model.render_data_columns import RenderDataColumns
+from model.render_data_decoder import RenderDataDecoder
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import struct
+import hashlib
+import logging
+import time
+import os
+import re
+
+
+class RenderDataDiskCache(object):
+
+    """
+        RenderDataDiskCache
+        Persists received pixels across sessions in a local cache directory.
+        Pixels are stored per scene name and render fingerprint, a hash of the render settings of the server
+        and of the content of the rendered image. The settings do not change if the scene or the integrator is edited,
+        the rendered image does. The cache is disabled until the content hash of the current render is known.
+        One columns file per (x, y, sample_count) which is memory mapped back on load.
+        Only meaningful for deterministic rendering (-DDETERMINISTIC), where the same pixel always yields the same paths.
+        Once the budget in bytes is exceeded the least recently loaded files are removed.
+        Files are written by a background thread, the size of the cache is tracked in memory
+        and the directory is only scanned once.
+    """
+
+    EXTENSION = '.emcacol'
+    # temporary files of crashed writers older than this are removed, in seconds
+    STALE_TMP_AGE = 60 * 60
+
+    def __init__(self, directory=None, max_bytes=2048 * 1024 * 1024):
+        if not directory:
+            directory = os.path.join(os.path.expanduser('~'), '.cache', 'emca', 'render_data')
+        self._directory = directory
+        self._max_bytes = max(0, int(max_bytes))
+        # render settings of the server and hash of the rendered image
+        self._render_settings = None
+        self._content_hash = None
+        # directory of the current scene and fingerprint
+        self._settings_directory = None
+        self._decoder = RenderDataDecoder()
+        # { filepath : [size, mtime] } of all cached files, None until the directory is scanned
+        self._files_index = None
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        # writes files in the background, so the socket reader thread is not blocked
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self._max_bytes = max(0, int(max_bytes))
+
+    @staticmethod
+    def fingerprint(render_settings, content_hash):
+        """
+        Returns a short hash of the render settings and the content hash of the render
+        :param render_settings: tuple
+        :param content_hash: str
+        :return: str
+        """
+        return hashlib.sha1(repr((tuple(render_settings), content_hash)).encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def content_hash(filepath):
+        """
+        Returns the sha1 of a file, e.g. the rendered image, or None if it can not be read
+        :param filepath: str
+        :return: str|None
+        """
+        sha1 = hashlib.sha1()
+        try:
+            with open(filepath, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha1.update(chunk)
+        except (OSError, TypeError) as e:
+            logging.info('No content hash of {}: {}'.format(filepath, e))
+            return None
+        return sha1.hexdigest()
+
+    def set_render_settings(self, render_settings, content_hash=None):
+        """
+        Selects the directory of the scene and fingerprint of the render settings and the rendered image,
+        the first entry of the settings is the scene name. Without content hash the cache is disabled
+        :param render_settings: tuple, e.g. RenderInfo.settings_key()
+        :param content_hash: str|None, e.g. content_hash of the rendered image
+        :return:
+        """
+        self._render_settings = render_settings
+        self._content_hash = content_hash
+        if render_settings is None or content_hash is None:
+            self._settings_directory = None
+            return
+        scene_name = re.sub(r'[^\w.-]', '_', str(render_settings[0]))
+        self._settings_directory = os.path.join(self._directory, scene_name,
+                                                self.fingerprint(render_settings, content_hash))
+
+    def filepath(self, key):
+        """
+        Returns the file of a pixel within the directory of the current render settings
+        :param key: (x, y, sample_count)
+        :return: str|None
+        """
+        if self._settings_directory is None:
+            return None
+        return os.path.join(self._settings_directory, '{}_{}_{}{}'.format(*key, self.EXTENSION))
+
+    def contains(self, key):
+        """
+        Returns if a pixel of the current render settings is cached
+        :param key: (x, y, sample_count)
+        :return: boolean
+        """
+        filepath = self.filepath(key)
+        return filepath is not None and os.path.exists(filepath)
+
+    def load(self, key):
+        """
+        Loads a pixel of the current render settings, the columns are memory mapped
+        :param key: (x, y, sample_count)
+        :return: RenderData|None
+        """
+        filepath = self.filepath(key)
+        if filepath is None or not os.path.exists(filepath):
+            return None
+        try:
+            columns = RenderDataColumns.from_file(filepath)
+            # keeps track of the least recently used files
+            os.utime(filepath)
+            with self._lock:
+                if self._files_index is not None and filepath in self._files_index:
+                    self._files_index[filepath][1] = time.time()
+            render_data = self._decoder.build(columns, RenderData())
+        except (OSError, ValueError, struct.error) as e:
+            logging.error('Remove broken cache file {}: {}'.format(filepath, e))
+            self._forget(filepath)
+            self._remove(filepath)
+            return None
+        logging.info('Load pixel {} from {}'.format(key, filepath))
+        return render_data
+
+    def store(self, key, render_data):
+        """
+        Writes a pixel of the current render settings in the background, existing files are kept
+        :param key: (x, y, sample_count)
+        :param render_data: RenderData
+        :return:
+        """
+        filepath = self.filepath(key)
+        columns = render_data.columns
+        if filepath is None or columns is None:
+            return
+        self._executor.submit(self._write, filepath, columns)
+
+    def flush(self):
+        """
+        Waits until all stored pixels are written
+        :return:
+        """
+        self._executor.submit(lambda: None).result()
+
+    def close(self, wait=True):
+        """
+        Stops the writer thread after all pending writes
+        :param wait: boolean, blocks until the pending writes are finished
+        :return:
+        """
+        self._executor.shutdown(wait=wait)
+
+    def clear(self):
+        """
+        Removes all cached files of all scenes
+        :return:
+        """
+        self.flush()
+        for filepath, size, mtime in self._files():
+            self._remove(filepath)
+        with self._lock:
+            self._files_index = {}
+            self._nbytes = 0
+
+    def _write(self, filepath, columns):
+        if os.path.exists(filepath):
+            return
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            size = columns.to_file(filepath)
+        except OSError as e:
+            logging.error('Could not write cache file {}: {}'.format(filepath, e))
+            return
+        self._scan()
+        with self._lock:
+            old = self._files_index.get(filepath, None)
+            if old is not None:
+                self._nbytes -= old[0]
+            self._files_index[filepath] = [size, time.time()]
+            self._nbytes += size
+        self._evict()
+
+    def _scan(self):
+        """
+        Builds the index of all cached files once, stale temporary files of crashed writers are removed
+        :return:
+        """
+        if self._files_index is not None:
+            return
+        files_index = {}
+        now = time.time()
+        for root, dirs, filenames in os.walk(self._directory):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    filepath = os.path.join(root, filename)
+                    try:
+                        if now - os.stat(filepath).st_mtime > self.STALE_TMP_AGE:
+                            self._remove(filepath)
+                    except OSError:
+                        pass
+        for filepath, size, mtime in self._files():
+            files_index[filepath] = [size, mtime]
+        with self._lock:
+            self._files_index = files_index
+            self._nbytes = sum(size for size, mtime in files_index.values())
+
+    def _files(self):
+        for root, dirs, filenames in os.walk(self._directory):
+            for filename in filenames:
+                if not filename.endswith(self.EXTENSION):
+                    continue
+                filepath = os.path.join(root, filename)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    continue
+                yield filepath, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        removed = []
+        with self._lock:
+            if self._nbytes <= self._max_bytes:
+                return
+            files = sorted(self._files_index.items(), key=lambda item: item[1][1])
+            # the most recently used file is never removed
+            for filepath, (size, mtime) in files[:-1]:
+                del self._files_index[filepath]
+                self._nbytes -= size
+                removed.append(filepath)
+                if self._nbytes <= self._max_bytes:
+                    break
+        for filepath in removed:
+            self._remove(filepath)
+
+    def _forget(self, filepath):
+        with self._lock:
+            if self._files_index is not None and filepath in self._files_index:
+                self._nbytes -= self._files_index.pop(filepath)[0]
+
+    @staticmethod
+    def _remove(filepath):
+        try:
+            os.remove(filepath)
+        except OSError as e:
+            logging.error(e)
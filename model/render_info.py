@@ -58,8 +58,9 @@ class RenderInfo(object):
         :param stream: SocketStream
         :return:
         """
-        stream.write_short(ServerMsg.EMCA_SEND_RENDER_INFO.value)
-        stream.write_int(self._sample_count)
+        with stream.message() as msg:
+            msg.write_short(ServerMsg.EMCA_SEND_RENDER_INFO.value)
+            msg.write_int(self._sample_count)
 
     @staticmethod
     def is_valid_str(s):
@@ -153,6 +154,14 @@ class RenderInfo(object):
         else:
             return self._output_filepath + ".exr"
 
+    def settings_key(self):
+        """
+        Returns the render settings of the server as hashable tuple,
+        pixels requested with different settings are not comparable
+        :return: tuple
+        """
+        return self._scene_name, self._output_filepath, self._extension, self._sample_count
+
     def to_string(self):
         """
         Returns a string containing information about the class
@@ -22,8 +22,12 @@
     SOFTWARE.
 """
 
+import threading
 import logging
 
+# user data is accessed lazily from the GUI, the filter worker and the disk cache loader
+_load_lock = threading.Lock()
+
 
 class UserData(object):
 
@@ -31,10 +35,22 @@ class UserData(object):
         UserData
         Handles general data types which can be added by the user during the path tracing algorithm,
         in order to debug the system.
-        Supported data types boolean, float, double, integer, point2i, point2f, point3i, point3f, color3f and vectors
+        Supported data types boolean, float, double, integer, point2i, point2f, point3i, point3f, color3f and vectors.
+        If decode is given, the data is decoded on first access with decode(user_data, pos) and kept afterwards.
     """
 
-    def __init__(self):
+    def __init__(self, decode=None, pos=-1):
+        # lazy decoding of the user data, pos is the offset of the data within the received payload
+        self._lazy_decode = decode
+        self._lazy_pos = pos
+        if decode is None:
+            self.init_dicts()
+
+    def init_dicts(self):
+        """
+        Creates the empty data dicts
+        :return:
+        """
         # handle default data types
         self._dict_bool = {}
         self._dict_float = {}
@@ -48,6 +64,28 @@ class UserData(object):
         self._dict_string = {}
         self._data = []
 
+    def load(self):
+        """
+        Decodes the user data if it was not accessed yet
+        :return:
+        """
+        if self._lazy_decode is None:
+            return
+        with _load_lock:
+            decode = self._lazy_decode
+            if decode is not None:
+                # the dicts are visible to other threads only after they are complete
+                decode(self, self._lazy_pos)
+                self._lazy_decode = None
+
+    @property
+    def is_loaded(self):
+        """
+        Returns if the user data is decoded
+        :return: boolean
+        """
+        return self._lazy_decode is None
+
     def deserialize(self, stream):
         """
         Deserialize UserData class from a socket stream
@@ -99,6 +137,7 @@ class UserData(object):
         Returns a list containing data dicts with set information
         :return: list
         """
+        self.load()
         return self._data
 
     @property
@@ -107,6 +146,7 @@ class UserData(object):
         Returns the bool dict
         :return: dict {name : value, ...}
         """
+        self.load()
         return self._dict_bool
 
     @property
@@ -115,6 +155,7 @@ class UserData(object):
         Returns the float dict
         :return: dict{name : value, ...}
         """
+        self.load()
         return self._dict_float
 
     @property
@@ -123,6 +164,7 @@ class UserData(object):
         Returns the double dict
         :return: dict{name : value, ...}
         """
+        self.load()
         return self._dict_double
 
     @property
@@ -131,6 +173,7 @@ class UserData(object):
         Returns the int dict
         :return: dict{name : value, ...}
         """
+        self.load()
         return self._dict_int
 
     @property
@@ -139,6 +182,7 @@ class UserData(object):
         Returns the point2i dict
         :return: dict{name : value, ...}
         """
+        self.load()
         return self._dict_point2i
 
     @property
@@ -147,6 +191,7 @@ class UserData(object):
         Returns the point2f dict
         :return: dict{name : value, ...}
         """
+        self.load()
         return self._dict_point2f
 
     @property
@@ -155,6 +200,7 @@ class UserData(object):
         Returns the point3 dict
         :return: dict{name : value, ...}
         """
+        self.load()
         return self._dict_point3i
 
     @property
@@ -163,6 +209,7 @@ class UserData(object):
         Returns the point3f dict
         :return: dict{name : value, ...}
         """
+        self.load()
         return self._dict_point3f
 
     @property
@@ -171,6 +218,7 @@ class UserData(object):
         Returns the color3f dict
         :return:
         """
+        self.load()
         return self._dict_color3f
 
     @property
@@ -179,6 +227,7 @@ class UserData(object):
         Returns the string dict
         :return:
         """
+        self.load()
         return self._dict_string
 
     def clear(self):
@@ -186,6 +235,7 @@ class UserData(object):
         Clears all data sets
         :return:
         """
+        self.load()
         self._dict_bool.clear()
         self._dict_float.clear()
         self._dict_double.clear()
@@ -0,0 +1,216 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import numpy as np
+
+
+# user data types in the order they are sent, with the struct format and the amount of sent components of one value
+USER_DATA_TYPES = (
+    ('bool', '?', 1),
+    ('float', 'f', 1),
+    ('double', 'd', 1),
+    ('int', 'i', 1),
+    ('point2i', 'i', 2),
+    ('point2f', 'f', 2),
+    ('point3i', 'i', 3),
+    ('point3f', 'f', 3),
+    # alpha is sent as well but not filtered
+    ('color3f', 'f', 4),
+    ('string', None, 1),
+)
+
+_STRING_LENGTH = np.dtype('=i4')
+
+
+class UserDataColumn(object):
+
+    """
+        UserDataColumn
+        All entries of one user data key of a pixel, in the order of the paths.
+        Only the first value of an entry is kept (the value filters compare),
+        values are stored as float64 array [n, components] or as object array of strings.
+        path_rows holds the path row of every entry, vertex_rows the vertex row or -1 for path user data
+        and counts the amount of values the entry was sent with.
+    """
+
+    def __init__(self, name, type_name, values, path_rows, vertex_rows, counts=None):
+        self.name = name
+        self.type_name = type_name
+        self.values = values
+        self.path_rows = path_rows
+        self.vertex_rows = vertex_rows
+        self.counts = counts if counts is not None else np.ones(len(path_rows), dtype=np.int32)
+        # lower case string representation, created on first string comparison
+        self._strings = None
+
+    @property
+    def components(self):
+        return self.values.shape[1] if self.values.ndim > 1 else 1
+
+    @property
+    def is_numeric(self):
+        return self.type_name != 'string'
+
+    def path_slice(self, path_row):
+        """
+        Returns the range of entries belonging to a path
+        :param path_row: integer
+        :return: slice
+        """
+        start, end = np.searchsorted(self.path_rows, (path_row, path_row + 1))
+        return slice(int(start), int(end))
+
+    def strings(self):
+        """
+        Returns the lower case string representation of the values as object array,
+        composite values are represented by None
+        :return: np.array
+        """
+        if self._strings is None:
+            values = self.values
+            if values.ndim > 1 and values.shape[1] > 1:
+                strings = np.full(len(values), None, dtype=object)
+            elif self.type_name == 'bool':
+                strings = np.where(values.reshape(-1) != 0, 'true', 'false').astype(object)
+            elif self.type_name == 'int':
+                strings = values.reshape(-1).astype(np.int64).astype(str).astype(object)
+            elif self.type_name == 'string':
+                strings = np.array([str(v).lower() for v in values], dtype=object)
+            else:
+                strings = np.array([repr(float(v)) for v in values.reshape(-1)], dtype=object)
+            self._strings = strings
+        return self._strings
+
+    def __len__(self):
+        return len(self.path_rows)
+
+
+class UserDataColumns(object):
+
+    """
+        UserDataColumns
+        Inverted index of the user data of all paths and intersections of one pixel,
+        one UserDataColumn per key (and type). It is built from the entry columns listed while decoding,
+        filters and plugins query the entries of a key instead of iterating over the path objects.
+    """
+
+    def __init__(self, path_count, columns):
+        self._path_count = path_count
+        # dict{(name, type_name) : UserDataColumn}
+        self._columns = columns
+
+    @staticmethod
+    def from_columns(columns):
+        """
+        Builds the index from the entry columns of a pixel, the first value of every entry is read from the payload.
+        Entries without values are left out
+        :param columns: RenderDataColumns
+        :return: UserDataColumns
+        """
+        if columns.entry_count == 0:
+            return UserDataColumns(columns.path_count, {})
+        entries = columns.entry_columns
+        payload = columns.payload
+        counts = entries['value_count']
+        valid = np.flatnonzero(counts > 0)
+        type_idx = entries['type_idx'][valid]
+        groups = entries['key_id'][valid].astype(np.int64) * len(USER_DATA_TYPES) + type_idx
+        # stable to keep the entries of a group in path order
+        order = np.argsort(groups, kind='stable')
+        bounds = np.flatnonzero(np.diff(groups[order])) + 1
+
+        result = {}
+        for group in np.split(order, bounds):
+            if len(group) == 0:
+                continue
+            rows = valid[group]
+            type_name, fmt, dim = USER_DATA_TYPES[int(type_idx[group[0]])]
+            start, end = entries['key_span'][rows[0]]
+            name = bytes(payload[start:end]).decode('utf-8')
+            values = UserDataColumns._first_values(payload, entries['value_offset'][rows], fmt, dim)
+            if type_name == 'color3f':
+                values = values[:, :3]
+            result[(name, type_name)] = UserDataColumn(name, type_name, values,
+                                                       entries['path_row'][rows],
+                                                       entries['vertex_row'][rows],
+                                                       counts[rows])
+        return UserDataColumns(columns.path_count, result)
+
+    @staticmethod
+    def _gather(payload, offsets, size):
+        """
+        Gathers size bytes at every offset of the payload into an array [n, size]
+        :param payload: np.array uint8
+        :param offsets: np.array
+        :param size: integer
+        :return: np.array uint8
+        """
+        return payload[offsets[:, None] + np.arange(size)]
+
+    @staticmethod
+    def _first_values(payload, offsets, fmt, dim):
+        """
+        Reads the first value at every offset of the payload
+        :param payload: np.array uint8
+        :param offsets: np.array
+        :param fmt: struct format character, None for strings
+        :param dim: amount of components of one value
+        :return: np.array float64 [n] or [n, dim], object array for strings
+        """
+        if fmt is None:
+            lengths = UserDataColumns._gather(payload, offsets, _STRING_LENGTH.itemsize).view(_STRING_LENGTH)
+            view = memoryview(payload)
+            return np.array([str(view[offset:offset + length], 'utf-8')
+                             for offset, length in zip((offsets + _STRING_LENGTH.itemsize).tolist(),
+                                                       lengths.reshape(-1).tolist())], dtype=object)
+        dtype = np.dtype('=' + fmt)
+        values = UserDataColumns._gather(payload, offsets, dtype.itemsize * dim).view(dtype).astype(np.float64)
+        return values.reshape(-1) if dim == 1 else values
+
+    @property
+    def path_count(self):
+        return self._path_count
+
+    def keys(self):
+        """
+        Returns all user data keys
+        :return: list[str]
+        """
+        return sorted(set(name for name, type_name in self._columns))
+
+    def type_names(self, name):
+        """
+        Returns the types a key was sent with
+        :param name: str
+        :return: list[str]
+        """
+        return [type_name for key, type_name in self._columns if key == name]
+
+    def columns(self, name=None):
+        """
+        Returns the columns of a key, one per type the key was sent with, all columns if name is None
+        :param name: str or None
+        :return: list[UserDataColumn]
+        """
+        return [column for (key, type_name), column in self._columns.items() if name is None or key == name]
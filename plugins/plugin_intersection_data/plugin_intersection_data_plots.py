@@ -148,18 +148,21 @@ class IntersectionData(Plugin):
         path_data = paths.get(item.idx, None)
 
         if path_data:
-            intersections = path_data.intersections
             plot_2d_dict = {}
             plot_3d_dict = {}
             plot_color_dict = {}
-            for its_idx, its in intersections.items():
-                self.insert_plot_data(its.dict_bool, plot_2d_dict, its_idx)
-                self.insert_plot_data(its.dict_float, plot_2d_dict, its_idx)
-                self.insert_plot_data(its.dict_double, plot_2d_dict, its_idx)
-                self.insert_plot_data(its.dict_int, plot_2d_dict, its_idx)
-                self.insert_plot_data(its.dict_point2i, plot_3d_dict, its_idx)
-                self.insert_plot_data(its.dict_point2f, plot_3d_dict, its_idx)
-                self.insert_plot_data(its.dict_color3f, plot_color_dict, its_idx)
+            plot_dicts = {'bool': plot_2d_dict, 'float': plot_2d_dict, 'double': plot_2d_dict, 'int': plot_2d_dict,
+                          'point2i': plot_3d_dict, 'point2f': plot_3d_dict, 'color3f': plot_color_dict}
+            intersection_idx = self._render_data.columns.vertex_columns['intersection_idx']
+            # query the entries of the selected path from the user data index
+            for column in self._render_data.user_data_columns.columns():
+                target_dict = plot_dicts.get(column.type_name, None)
+                if target_dict is None:
+                    continue
+                entries = column.path_slice(path_data.index)
+                for vertex_row, value in zip(column.vertex_rows[entries], column.values[entries]):
+                    if vertex_row >= 0:
+                        self.insert_plot_data({column.name: [value]}, target_dict, int(intersection_idx[vertex_row]))
 
             for name in plot_2d_dict:
                 HistListItem(name, self.listHistNames, plot_2d_dict, 0.75, path_data.path_depth+0.25, self._its_data_plot_2d, 0)
@@ -80,19 +80,20 @@ class SphericalView(Plugin):
             self._render_size.y = self.sbHeight.value()
             self._sample_count = int(self.sbSampleCount.value())
             self._integrator = self.integrator.text()
-            # send package id
-            stream.write_short(self.flag)
-            # send point / data
-            stream.write_float(self._spherical_view.pos.x)
-            stream.write_float(self._spherical_view.pos.y)
-            stream.write_float(self._spherical_view.pos.z)
-            # send amount of samples
-            stream.write_int(self._sample_count)
-            # send render size
-            stream.write_int(self._render_size.x)
-            stream.write_int(self._render_size.y)
-            # send integrator
-            stream.write_string(self._integrator)
+            with stream.message() as msg:
+                # send package id
+                msg.write_short(self.flag)
+                # send point / data
+                msg.write_float(self._spherical_view.pos.x)
+                msg.write_float(self._spherical_view.pos.y)
+                msg.write_float(self._spherical_view.pos.z)
+                # send amount of samples
+                msg.write_int(self._sample_count)
+                # send render size
+                msg.write_int(self._render_size.x)
+                msg.write_int(self._render_size.y)
+                # send integrator
+                msg.write_string(self._integrator)
 
     def deserialize(self, stream):
         logging.info("Deserialize in: {}".format(self.name))
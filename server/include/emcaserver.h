@@ -63,6 +63,8 @@ private:
 	bool respondRenderInfo(Stream *stream);
 	bool respondRenderImage(Stream *stream);
 	bool respondSceneData(Stream *stream);
+	bool respondSceneHash(Stream *stream);
+	bool respondCameraData(Stream *stream);
 	bool respondRenderData(Stream *stream);
 	bool respondPluginRequest(short id, Stream *stream);
 
@@ -0,0 +1,56 @@
+/*
+	EMCA - Explorer Monte-Carlo based Alorithm (Shared Server Library)
+	comes with an Apache License 2.0
+	(c) Christoph Kreisl 2020
+
+	Licensed to the Apache Software Foundation (ASF) under one
+	or more contributor license agreements.  See the NOTICE file
+	distributed with this work for additional information
+	regarding copyright ownership.  The ASF licenses this file
+	to you under the Apache License, Version 2.0 (the
+	"License"); you may not use this file except in compliance
+	with the License.  You may obtain a copy of the License at
+
+	http://www.apache.org/licenses/LICENSE-2.0
+
+	Unless required by applicable law or agreed to in writing,
+	software distributed under the License is distributed on an
+	"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+	KIND, either express or implied.  See the License for the
+	specific language governing permissions and limitations
+	under the License.
+*/
+
+#ifndef INCLUDE_EMCA_HASHSTREAM_H_
+#define INCLUDE_EMCA_HASHSTREAM_H_
+
+#include "platform.h"
+#include "stream.h"
+
+EMCA_NAMESPACE_BEGIN
+
+/*
+ * Stream which does not transfer any data but hashes it (64 bit FNV-1a).
+ * Used to fingerprint the scene geometry without sending it,
+ * scene data messages are counted by the header written with writeHeader.
+ */
+class HashStream : public Stream {
+public:
+
+	HashStream();
+	void writeHeader(short header);
+	void write(const void *ptr, size_t size);
+	void read(void *ptr, size_t size);
+
+	unsigned long long getHash() { return m_hash; }
+	std::string getHexHash();
+	unsigned int getMessageCount() { return m_messageCount; }
+
+private:
+	unsigned long long m_hash;
+	unsigned int m_messageCount;
+};
+
+EMCA_NAMESPACE_END
+
+#endif /* INCLUDE_EMCA_HASHSTREAM_H_ */
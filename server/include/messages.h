@@ -37,6 +37,10 @@ enum Message {
 	EMCA_HEADER_SCENE_DATA	= 0x000F,
 	EMCA_HEADER_CAMERA		= 0x0010,
 	EMCA_SUPPORTED_PLUGINS	= 0x0011,
+	EMCA_HEADER_SCENE_HASH	= 0x0012,
+	// capabilities are announced after the supported plugins without payload,
+	// clients which do not know a capability skip its header
+	EMCA_CAPABILITY_SCENE_HASH = 0x0013,
 	EMCA_DISCONNECT			= 0x1bcc,
 	EMCA_QUIT		 		= 0x1bcd
 };
@@ -90,7 +90,7 @@ struct Mesh
 
     void serialize(Stream *stream)
     {
-        stream->writeShort(Message::EMCA_HEADER_SCENE_DATA);
+        stream->writeHeader(Message::EMCA_HEADER_SCENE_DATA);
         stream->writeShort(MeshType::TriangleMesh);
         unsigned int msgLen = vertexPositions.size();
         stream->writeUInt(msgLen);
@@ -114,7 +114,7 @@ struct Meshes
 
     void serialize(Stream *stream)
     {
-        stream->writeShort(Message::EMCA_HEADER_SCENE_DATA);
+        stream->writeHeader(Message::EMCA_HEADER_SCENE_DATA);
         unsigned int msgLen = meshes.size();
         stream->writeUInt(msgLen);
         for (unsigned int i = 0; i < msgLen; ++i)
@@ -134,7 +134,7 @@ struct Sphere
 
     void serialize(Stream *stream) 
     {
-        stream->writeShort(Message::EMCA_HEADER_SCENE_DATA);
+        stream->writeHeader(Message::EMCA_HEADER_SCENE_DATA);
         stream->writeShort(MeshType::SphereMesh);
         stream->writeFloat(radius);
         center.serialize(stream);
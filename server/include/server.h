@@ -55,6 +55,8 @@ public:
 	void setReadInfoCallback(const std::function<bool(Stream *)> &callback);
 	void setRespondRenderImageCallback(const std::function<bool(Stream *)> &callback);
 	void setRespondSceneDataCallback(const std::function<bool(Stream *)> &callback);
+	void setRespondSceneHashCallback(const std::function<bool(Stream *)> &callback);
+	void setRespondCameraDataCallback(const std::function<bool(Stream *)> &callback);
 	void setRespondRenderDataCallback(const std::function<bool(Stream *)> &callback);
 	void setRespondRenderSystemCallback(const std::function<bool(Stream *)> &callback);
 	void setRespondSupportedPluginsCallback(const std::function<bool(Stream *)> &callback);
@@ -74,6 +76,8 @@ private:
 	std::function<bool(Stream *)> m_callbackReadRenderInfo;
 	std::function<bool(Stream *)> m_callbackRespondRenderImage;
 	std::function<bool(Stream *)> m_callbackRespondSceneData;
+	std::function<bool(Stream *)> m_callbackRespondSceneHash;
+	std::function<bool(Stream *)> m_callbackRespondCameraData;
 	std::function<bool(Stream *)> m_callbackRespondRenderData;
 	std::function<bool(Stream *)> m_callbackRespondRenderSystem;
 	std::function<bool(Stream *)> m_callbackRespondSupportedPlugins;
@@ -37,6 +37,9 @@ public:
 	virtual void read(void *ptr, size_t size) = 0;
 	virtual void write(const void *ptr, size_t size) = 0;
 
+	/* writes the header which starts a message, streams may track the messages */
+	virtual void writeHeader(short header) { writeShort(header); }
+
 	/* write methods */
 	void writeShort(short value);
 	void writeUShort(unsigned short value);
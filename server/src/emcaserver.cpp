@@ -23,6 +23,7 @@
 
 #include "emcaserver.h"
 #include "scenedata.h"
+#include "hashstream.h"
 #include "messages.h"
 #include "dataapisingleton.h"
 
@@ -42,6 +43,8 @@ EMCAServer::EMCAServer() {
 	m_server->setReadInfoCallback([this](Stream *stream) { return readRenderInfo(stream); });
 	m_server->setRespondRenderImageCallback([this](Stream *stream) { return respondRenderImage(stream); });
 	m_server->setRespondSceneDataCallback([this](Stream *stream) { return respondSceneData(stream); });
+	m_server->setRespondSceneHashCallback([this](Stream *stream) { return respondSceneHash(stream); });
+	m_server->setRespondCameraDataCallback([this](Stream *stream) { return respondCameraData(stream); });
 	m_server->setRespondRenderDataCallback([this](Stream *stream) { return respondRenderData(stream); });
 	m_server->setRespondSupportedPluginsCallback([this](Stream *stream) { return respondSupportedPlugins(stream); });
 }
@@ -106,6 +109,8 @@ bool EMCAServer::respondSupportedPlugins(Stream *stream) {
 		for (short &id : supportedPlugins) {
 			stream->writeShort(id);
 		}
+		// clients with a mesh cache request the scene hash instead of the scene data
+		stream->writeShort(Message::EMCA_CAPABILITY_SCENE_HASH);
 	}
 	catch (...)
 	{
@@ -159,6 +164,30 @@ bool EMCAServer::respondSceneData(Stream *stream) {
 	return true;
 }
 
+bool EMCAServer::respondSceneHash(Stream *stream) {
+	try {
+		// the mesh data is serialized into a hash, clients with a matching cache skip the transfer
+		HashStream hashStream;
+		m_renderer->sendMeshData(&hashStream);
+		std::cout << "Send Scene Hash " << hashStream.getHexHash() << " ... !" << std::endl;
+		stream->writeShort(Message::EMCA_HEADER_SCENE_HASH);
+		stream->writeString(hashStream.getHexHash());
+		stream->writeUInt(hashStream.getMessageCount());
+	} catch(...) {
+		return false;
+	}
+	return true;
+}
+
+bool EMCAServer::respondCameraData(Stream *stream) {
+	try {
+		m_renderer->sendCameraData(stream);
+	} catch(...) {
+		return false;
+	}
+	return true;
+}
+
 bool EMCAServer::respondRenderData(Stream *stream) {
 	try {
 		m_dataApi->enable();
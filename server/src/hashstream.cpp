@@ -0,0 +1,58 @@
+/*
+	EMCA - Explorer Monte-Carlo based Alorithm (Shared Server Library)
+	comes with an Apache License 2.0
+	(c) Christoph Kreisl 2020
+
+	Licensed to the Apache Software Foundation (ASF) under one
+	or more contributor license agreements.  See the NOTICE file
+	distributed with this work for additional information
+	regarding copyright ownership.  The ASF licenses this file
+	to you under the Apache License, Version 2.0 (the
+	"License"); you may not use this file except in compliance
+	with the License.  You may obtain a copy of the License at
+
+	http://www.apache.org/licenses/LICENSE-2.0
+
+	Unless required by applicable law or agreed to in writing,
+	software distributed under the License is distributed on an
+	"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+	KIND, either express or implied.  See the License for the
+	specific language governing permissions and limitations
+	under the License.
+*/
+
+#include "hashstream.h"
+#include "messages.h"
+#include <iomanip>
+#include <stdexcept>
+
+EMCA_NAMESPACE_BEGIN
+
+HashStream::HashStream() : m_hash(14695981039346656037ULL), m_messageCount(0) { }
+
+void HashStream::writeHeader(short header) {
+	// the scene data writers mark the start of every message explicitly
+	if(header == Message::EMCA_HEADER_SCENE_DATA)
+		m_messageCount++;
+	writeShort(header);
+}
+
+void HashStream::write(const void *ptr, size_t size) {
+	const unsigned char *data = (const unsigned char *) ptr;
+	for(size_t i = 0; i < size; ++i) {
+		m_hash ^= data[i];
+		m_hash *= 1099511628211ULL;
+	}
+}
+
+void HashStream::read(void *ptr, size_t size) {
+	throw std::runtime_error("HashStream can not be read");
+}
+
+std::string HashStream::getHexHash() {
+	std::stringstream ss;
+	ss << std::hex << std::setw(16) << std::setfill('0') << m_hash;
+	return ss.str();
+}
+
+EMCA_NAMESPACE_END
@@ -99,6 +99,16 @@ void Server::setRespondSceneDataCallback(const std::function<bool(Stream *)> &ca
 	m_callbackRespondSceneData = callback;
 }
 
+void Server::setRespondSceneHashCallback(const std::function<bool(Stream *)> &callback)
+{
+	m_callbackRespondSceneHash = callback;
+}
+
+void Server::setRespondCameraDataCallback(const std::function<bool(Stream *)> &callback)
+{
+	m_callbackRespondCameraData = callback;
+}
+
 void Server::start() {
 
 	struct sockaddr_in server_addr, client_addr;
@@ -180,6 +190,14 @@ void Server::start() {
 					std::cout << "Respond scene data msg" << std::endl;
 					m_callbackRespondSceneData(m_stream);
 					break;
+				case Message::EMCA_HEADER_SCENE_HASH:
+					std::cout << "Respond scene hash msg" << std::endl;
+					m_callbackRespondSceneHash(m_stream);
+					break;
+				case Message::EMCA_HEADER_CAMERA:
+					std::cout << "Respond camera data msg" << std::endl;
+					m_callbackRespondCameraData(m_stream);
+					break;
 				case Message::EMCA_RENDER_IMAGE:
 					std::cout << "Render image msg" << std::endl;
 					m_callbackRespondRenderImage(m_stream);
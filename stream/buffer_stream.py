@@ -0,0 +1,125 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from stream.stream import Stream
+
+
+class BufferStream(Stream):
+    """
+    Buffer Stream inherits from Stream
+
+    In-memory stream over a bytes-like object.
+    Reads are served as zero-copy memoryview slices from a cursor,
+    writes are appended to an internal bytearray.
+    """
+
+    def __init__(self, data=None):
+        Stream.__init__(self)
+        self._buffer = bytearray() if data is None else data
+        self._view = memoryview(self._buffer)
+        self._pos = 0
+
+    @property
+    def view(self):
+        """
+        Returns a memoryview of the underlying buffer
+        :return: memoryview
+        """
+        return self._view
+
+    def tell(self):
+        """
+        Returns the current cursor position
+        :return: integer
+        """
+        return self._pos
+
+    def seek(self, pos):
+        """
+        Moves the cursor to the given position
+        :param pos: integer
+        :return:
+        """
+        self._pos = pos
+
+    def remaining(self):
+        """
+        Returns the amount of bytes which can still be read
+        :return: integer
+        """
+        return len(self._view) - self._pos
+
+    def getvalue(self):
+        """
+        Returns the content of the buffer as bytes
+        :return: bytes
+        """
+        return bytes(self._view)
+
+    def read(self, size):
+        """
+        Reads size bytes from the buffer
+        :param size: integer
+        :return: memoryview
+        """
+        end = self._pos + size
+        if end > len(self._view):
+            raise RuntimeError('Buffer stream exhausted')
+        data = self._view[self._pos:end]
+        self._pos = end
+        return data
+
+    def skip(self, size):
+        """
+        Skips size bytes
+        :param size: integer
+        :return:
+        """
+        if self._pos + size > len(self._view):
+            raise RuntimeError('Buffer stream exhausted')
+        self._pos += size
+
+    def read_struct(self, compiled):
+        """
+        Unpacks a precompiled struct directly from the buffer without slicing it
+        :param compiled: struct.Struct
+        :return: tuple
+        """
+        # unpack_from raises struct.error if the buffer is exhausted
+        values = compiled.unpack_from(self._view, self._pos)
+        self._pos += compiled.size
+        return values
+
+    def write(self, data, size):
+        """
+        Appends data to the buffer
+        :param data: bytes
+        :param size: integer
+        :return:
+        """
+        # release the view, a bytearray with exported buffers can not be resized
+        self._view.release()
+        self._buffer += data[:size]
+        self._view = memoryview(self._buffer)
@@ -0,0 +1,177 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from stream.socket_stream import SocketStream
+from stream.buffer_stream import BufferStream
+from model.render_data_columns import RenderDataColumns
+from model.render_data_decoder import RenderDataDecoder
+import multiprocessing
+import logging
+
+
+def _decoder_main(conn, sock, cancel_event):
+    """
+    Main loop of the decoder process.
+    Receives pixel payloads from its own handle of the client socket,
+    decodes them into columns and hands them over as shared memory block.
+    :param conn: multiprocessing Connection to the client
+    :param sock: socket of the client connection
+    :param cancel_event: multiprocessing Event, set if the current payload is not needed anymore
+    :return:
+    """
+    stream = SocketStream(sock=sock)
+    decoder = RenderDataDecoder()
+    while True:
+        command, prefix = conn.recv()
+        if command == 'stop':
+            break
+        # continue with the bytes the client thread already received
+        stream.feed(prefix)
+        try:
+            if command == 'skip':
+                decoder.skip(stream)
+                conn.send(('skipped', None, None, stream.take_buffered()))
+                continue
+            # first pass collects the raw payload, the second decodes the columns from memory
+            payload = decoder.read_payload(stream, cancel_event.is_set)
+            columns = None if payload is None else decoder.decode_columns(BufferStream(payload), cancel_event.is_set)
+            if columns is None:
+                conn.send(('cancelled', None, None, stream.take_buffered()))
+                continue
+            shm, layout = columns.to_shared_memory()
+            conn.send(('columns', shm.name, (columns.sample_count, layout), stream.take_buffered()))
+            # the client process unlinks the block after mapping it
+            shm.close()
+        except Exception as e:
+            logging.error(e)
+            conn.send(('error', str(e), None, b''))
+            break
+    conn.close()
+
+
+class DecoderProcess(object):
+
+    """
+        DecoderProcess
+        Decodes pixel payloads in a separate process, so the GIL of the GUI process is not held
+        while a large pixel is received. The client thread reads the message headers,
+        for a pixel payload it hands the socket over to the process and waits for the columns.
+        Bytes received beyond the payload are handed back to the client stream.
+    """
+
+    def __init__(self):
+        # spawn does not fork the state of the Qt application
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+        self._sock = None
+        self._cancel_event = None
+
+    def is_running(self, sock=None):
+        """
+        Returns if the process is running, if sock is given for this socket
+        :param sock: socket or None
+        :return: boolean
+        """
+        if self._process is None or not self._process.is_alive():
+            return False
+        return sock is None or sock is self._sock
+
+    def start(self, sock):
+        """
+        Starts the decoder process for the given socket connection
+        :param sock: socket
+        :return:
+        """
+        self.stop()
+        logging.info("Start decoder process ...")
+        self._conn, child_conn = self._context.Pipe()
+        self._cancel_event = self._context.Event()
+        self._process = self._context.Process(target=_decoder_main,
+                                              args=(child_conn, sock, self._cancel_event),
+                                              daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._sock = sock
+
+    def stop(self):
+        """
+        Stops the decoder process
+        :return:
+        """
+        if self._process is None:
+            return
+        logging.info("Stop decoder process ...")
+        try:
+            self._conn.send(('stop', None))
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+        self._sock = None
+
+    def decode(self, stream, is_cancelled=None):
+        """
+        Decodes the next pixel payload of the stream in the decoder process.
+        Returns None if decoding was cancelled
+        :param stream: SocketStream
+        :param is_cancelled: function() -> boolean or None
+        :return: RenderDataColumns|None
+        """
+        self._cancel_event.clear()
+        self._conn.send(('decode', stream.take_buffered()))
+        result, name, info, leftover = self._wait(is_cancelled)
+        stream.feed(leftover)
+        if result == 'error':
+            raise RuntimeError('Decoder process failed: {}'.format(name))
+        if result != 'columns':
+            return None
+        sample_count, layout = info
+        return RenderDataColumns.from_shared_memory(name, sample_count, layout)
+
+    def skip(self, stream):
+        """
+        Discards the next pixel payload of the stream in the decoder process
+        :param stream: SocketStream
+        :return:
+        """
+        self._conn.send(('skip', stream.take_buffered()))
+        result, name, info, leftover = self._wait(None)
+        stream.feed(leftover)
+        if result == 'error':
+            raise RuntimeError('Decoder process failed: {}'.format(name))
+
+    def _wait(self, is_cancelled):
+        # waiting on the pipe releases the GIL, check for cancellation every now and then
+        while not self._conn.poll(0.05):
+            if is_cancelled is not None and is_cancelled():
+                self._cancel_event.set()
+            if not self._process.is_alive():
+                raise RuntimeError('Decoder process died')
+        return self._conn.recv()
@@ -0,0 +1,119 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from stream.buffer_stream import BufferStream
+from stream.recording_stream import RECORDING_MAGIC
+import logging
+import mmap
+import os
+
+
+class FileStream(BufferStream):
+    """
+    File Stream inherits from BufferStream
+
+    Replays a session recorded by a RecordingStream.
+    The recording is memory mapped, reads are zero-copy memoryview slices of the mapping.
+    Writes (requests to the server) are discarded, since there is no server to answer them.
+    The connect and disconnect functions mimic a SocketStream,
+    so the FileStream can be used by the SocketStreamClient instead of a socket.
+    """
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._file = open(filename, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(RECORDING_MAGIC):
+            self._file.close()
+            raise RuntimeError('{} is not an EMCA session recording'.format(filename))
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        BufferStream.__init__(self, self._mmap)
+        if self.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+            self.close()
+            raise RuntimeError('{} is not an EMCA session recording'.format(filename))
+        self._is_connected = False
+
+    @property
+    def filename(self):
+        """
+        Returns the path of the recording
+        :return: str
+        """
+        return self._filename
+
+    @property
+    def port(self):
+        return None
+
+    @port.setter
+    def port(self, port):
+        pass
+
+    @property
+    def hostname(self):
+        return self._filename
+
+    @hostname.setter
+    def hostname(self, hostname):
+        pass
+
+    def is_connected(self):
+        return self._is_connected
+
+    def connect(self):
+        """
+        Starts the replay from the beginning of the recording
+        :return: True, None
+        """
+        logging.info("Replay session {}".format(self._filename))
+        self.seek(len(RECORDING_MAGIC))
+        self._is_connected = True
+        return True, None
+
+    def disconnect(self):
+        """
+        Finishes the replay and closes the recording
+        :return: True, None
+        """
+        self.close()
+        return True, None
+
+    def close(self):
+        """
+        Unmaps and closes the recording
+        :return:
+        """
+        self._is_connected = False
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # data read from the mapping is still referenced, the mapping is closed once it is released
+            logging.debug("Recording {} is still referenced".format(self._filename))
+        self._file.close()
+
+    def write(self, data, size):
+        # no server is listening, requests are dropped
+        pass
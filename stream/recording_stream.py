@@ -0,0 +1,133 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from stream.stream import Stream
+import logging
+
+# every recording starts with this magic followed by all bytes received from the server
+RECORDING_MAGIC = b'EMCAREC\x01'
+
+
+class RecordingStream(Stream):
+    """
+    Recording Stream inherits from Stream
+
+    Wraps a SocketStream and tees every received byte into a file,
+    writes are passed through to the wrapped stream and are not recorded.
+    A session recorded to a filename can be replayed with a FileStream,
+    any other writable binary file object (e.g. io.BytesIO) captures the raw received data only.
+    """
+
+    def __init__(self, stream, file):
+        Stream.__init__(self)
+        self._stream = stream
+        if isinstance(file, str):
+            logging.info("Record session to {}".format(file))
+            self._filename = file
+            self._file = open(file, 'wb')
+            self._file.write(RECORDING_MAGIC)
+        else:
+            self._filename = None
+            self._file = file
+
+    @property
+    def stream(self):
+        """
+        Returns the wrapped stream
+        :return: Stream
+        """
+        return self._stream
+
+    @property
+    def filename(self):
+        """
+        Returns the path of the recording or None if recorded to a file object
+        :return: str|None
+        """
+        return self._filename
+
+    @property
+    def port(self):
+        return self._stream.port
+
+    @port.setter
+    def port(self, port):
+        self._stream.port = port
+
+    @property
+    def hostname(self):
+        return self._stream.hostname
+
+    @hostname.setter
+    def hostname(self, hostname):
+        self._stream.hostname = hostname
+
+    def is_connected(self):
+        return self._stream.is_connected()
+
+    def connect(self):
+        return self._stream.connect()
+
+    def disconnect(self):
+        """
+        Disconnects the wrapped stream and finishes the recording
+        :return: True|False, ErrorMsg|None
+        """
+        self.close_recording()
+        return self._stream.disconnect()
+
+    def close_recording(self):
+        """
+        Flushes and closes the recording file
+        :return:
+        """
+        if not self._file.closed:
+            logging.info("Finished recording {}".format(self._filename))
+            self._file.close()
+
+    def read(self, size):
+        """
+        Reads size bytes from the wrapped stream and records them
+        :param size: integer
+        :return: bytes|memoryview
+        """
+        data = self._stream.read(size)
+        if not self._file.closed:
+            self._file.write(data)
+        return data
+
+    def skip(self, size):
+        """
+        Skipped data is read and recorded as well, otherwise the recording could not be replayed
+        :param size: integer
+        :return:
+        """
+        self.read(size)
+
+    def read_struct(self, compiled):
+        return compiled.unpack(self.read(compiled.size))
+
+    def write(self, data, size):
+        self._stream.write(data, size)
@@ -0,0 +1,392 @@
+"""
+    MIT License
+
+    Copyright (c) 2020 Christoph Kreisl
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+
+from model.render_data_cache import RenderDataCache
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import threading
+import logging
+
+
+class PixelRequest(object):
+
+    """
+        PixelRequest
+        One render data request of a pixel.
+        display is set if the result should be shown in the views,
+        batch is set if the result was requested for the cache.
+        A cancelled request stays in flight until its response arrives, but the response is discarded
+        unless the pixel is requested again before.
+    """
+
+    def __init__(self, request_id, x, y, sample_count, display=True):
+        self.request_id = request_id
+        self.x = int(x)
+        self.y = int(y)
+        self.sample_count = int(sample_count)
+        self.display = display
+        self.batch = not display
+        self.cancelled = False
+
+    def is_cancelled(self):
+        return self.cancelled
+
+    @property
+    def key(self):
+        """
+        Returns the cache key of this request
+        :return: (x, y, sample_count)
+        """
+        return self.x, self.y, self.sample_count
+
+    def __repr__(self):
+        return 'PixelRequest(id={}, x={}, y={}, sample_count={}, display={}, cancelled={})'.format(
+            self.request_id, self.x, self.y, self.sample_count, self.display, self.cancelled)
+
+
+class RequestScheduler(object):
+
+    """
+        RequestScheduler
+        Keeps several pixel requests in flight on one server connection.
+        The server handles requests strictly in the order they are received,
+        therefore every incoming render data package belongs to the oldest request in flight.
+        Finished RenderData is parked in a LRU cache keyed by (x, y, sample_count),
+        which is bounded by a memory budget and invalidated once the render settings of the server change.
+        Only the latest displayed pixel matters, a new displayed request supersedes all older ones:
+        pending ones are dropped and the responses of those in flight are skipped.
+
+        Requests are sent from the Qt main thread (request, dispatch),
+        responses are matched within the socket stream client thread (pop_in_flight, complete).
+        Pixels in the disk cache are not sent to the server but loaded by a loader thread,
+        which hands them to the loaded callback.
+    """
+
+    def __init__(self, send_callback, max_in_flight=4, cache_bytes=512 * 1024 * 1024, loaded_callback=None):
+        # function(PixelRequest) which writes the request onto the stream
+        self._send = send_callback
+        # function(PixelRequest, RenderData|None) called by the loader thread,
+        # None if the request was cancelled or could not be loaded and is requeued for the server
+        self._loaded = loaded_callback
+        self._loader = ThreadPoolExecutor(max_workers=1)
+        # requests which are loaded from the disk cache
+        self._loading = []
+        self._max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        # keeps the order of sent requests equal to the order of _in_flight, never held by the reader thread
+        self._send_lock = threading.Lock()
+        # serializes setting the displayed render data from the GUI, reader and loader thread
+        self._display_lock = threading.RLock()
+        self._pending = deque()
+        self._in_flight = deque()
+        self._cache = RenderDataCache(cache_bytes)
+        self._next_request_id = 0
+        # key of the pixel which is currently shown in the views
+        self._latest_key = None
+        # render data of the latest displayed pixel, kept apart since the cache may evict it
+        self._latest_render_data = None
+
+    @property
+    def max_in_flight(self):
+        return self._max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, max_in_flight):
+        self._max_in_flight = max(1, int(max_in_flight))
+
+    def set_loaded_callback(self, loaded_callback):
+        """
+        Sets the function(PixelRequest, RenderData|None) which receives pixels loaded from the disk cache
+        :param loaded_callback: function
+        :return:
+        """
+        self._loaded = loaded_callback
+
+    def pending_count(self):
+        """
+        Returns the amount of requests which are not sent yet
+        :return: integer
+        """
+        return len(self._pending)
+
+    def in_flight_count(self):
+        """
+        Returns the amount of sent requests without response
+        :return: integer
+        """
+        return len(self._in_flight)
+
+    @property
+    def cache(self):
+        """
+        Returns the cache of received pixels
+        :return: RenderDataCache
+        """
+        return self._cache
+
+    def get_cached(self, x, y, sample_count):
+        """
+        Returns the cached RenderData of a pixel or None
+        :return: RenderData|None
+        """
+        return self._cache.get((int(x), int(y), int(sample_count)), None)
+
+    def request(self, x, y, sample_count, display=True):
+        """
+        Queues a pixel request.
+        Returns the cached RenderData if the pixel is already available, in this case nothing is queued.
+        Displayed requests are queued in front of pending cache-only (batch) requests
+        and supersede all older displayed requests.
+        :param x: integer
+        :param y: integer
+        :param sample_count: integer
+        :param display: boolean
+        :return: RenderData|None
+        """
+        key = (int(x), int(y), int(sample_count))
+        # the cache has its own lock, the reader thread is not blocked by the lookup
+        cached = self._cache.get(key, None)
+        on_disk = cached is None and self._cache.on_disk(key)
+        with self._lock:
+            if display:
+                self._latest_key = key
+                self._latest_render_data = None
+                self._supersede(key)
+            if cached is not None:
+                if display:
+                    self._latest_render_data = cached
+                return cached
+            queued = self._find(key)
+            if queued is not None:
+                # already requested, a cancelled request is revived instead of requested twice
+                if display:
+                    queued.display = True
+                    if queued in self._pending:
+                        self._pending.remove(queued)
+                        self._pending.appendleft(queued)
+                else:
+                    if queued.cancelled:
+                        queued.display = False
+                    queued.batch = True
+                queued.cancelled = False
+                return None
+            request = PixelRequest(self._next_request_id, x, y, sample_count, display)
+            self._next_request_id += 1
+            if on_disk:
+                self._loading.append(request)
+            elif display:
+                self._pending.appendleft(request)
+            else:
+                self._pending.append(request)
+        if on_disk:
+            self._loader.submit(self._load, request)
+        return None
+
+    def _load(self, request):
+        """
+        Loads the render data of a request from the disk cache within the loader thread,
+        if the file is gone or broken the request is queued for the server
+        :param request: PixelRequest
+        :return:
+        """
+        render_data = None
+        if not request.cancelled:
+            try:
+                render_data = self._cache.load_from_disk(request.key)
+            except Exception:
+                # the executor would swallow the error and leave the request loading forever
+                logging.exception('Failed to load {} from disk'.format(request))
+        with self._lock:
+            if request in self._loading:
+                self._loading.remove(request)
+            if render_data is None and not request.cancelled:
+                logging.info('Could not load {} from disk, request it from the server'.format(request))
+                if request.display:
+                    self._pending.appendleft(request)
+                else:
+                    self._pending.append(request)
+            elif render_data is not None and request.display and request.key == self._latest_key:
+                self._latest_render_data = render_data
+        if self._loaded is not None:
+            self._loaded(request, render_data)
+
+    def cancel(self, request_id):
+        """
+        Cancels a request, a pending request is dropped,
+        the response of a request in flight will be skipped
+        :param request_id: integer
+        :return: True if the request was found
+        """
+        with self._lock:
+            for request in list(self._pending):
+                if request.request_id == request_id:
+                    self._pending.remove(request)
+                    return True
+            for request in list(self._in_flight) + self._loading:
+                if request.request_id == request_id:
+                    request.cancelled = True
+                    return True
+        return False
+
+    def cancel_all(self):
+        """
+        Drops all pending requests and skips the responses of all requests in flight
+        :return:
+        """
+        with self._lock:
+            self._pending.clear()
+            for request in list(self._in_flight) + self._loading:
+                request.cancelled = True
+
+    def is_current(self, render_data):
+        """
+        Returns if the render data belongs to the latest displayed pixel,
+        render data of superseded requests should not be processed by the views
+        :param render_data: RenderData
+        :return: boolean
+        """
+        with self._lock:
+            if self._latest_key is None:
+                return True
+            return self._latest_render_data is render_data
+
+    def display(self, render_data, load):
+        """
+        Calls load(render_data) if the render data belongs to the latest displayed pixel.
+        Render data of a pixel which was superseded meanwhile is dropped,
+        so a late response or disk load never overwrites a newer pixel
+        :param render_data: RenderData
+        :param load: function(RenderData) which sets the displayed render data
+        :return: boolean, False if the render data was dropped
+        """
+        with self._display_lock:
+            if not self.is_current(render_data):
+                logging.info('Drop render data of superseded pixel request')
+                return False
+            load(render_data)
+        return True
+
+    def request_batch(self, pixels, sample_count):
+        """
+        Queues cache-only requests for a list of pixels, e.g. a row or a region of interest
+        :param pixels: [(x, y), ...]
+        :param sample_count: integer
+        :return:
+        """
+        for x, y in pixels:
+            self.request(x, y, sample_count, display=False)
+
+    def dispatch(self):
+        """
+        Sends pending requests until max_in_flight requests are in flight.
+        The requests are written after releasing the lock, so the reader thread is not blocked by the socket
+        :return:
+        """
+        with self._send_lock:
+            requests = []
+            with self._lock:
+                while self._pending and len(self._in_flight) < self._max_in_flight:
+                    request = self._pending.popleft()
+                    self._in_flight.append(request)
+                    requests.append(request)
+                    logging.info('Dispatch {} (in flight: {})'.format(request, len(self._in_flight)))
+            for request in requests:
+                self._send(request)
+
+    def pop_in_flight(self):
+        """
+        Returns the request an incoming render data package belongs to
+        :return: PixelRequest|None
+        """
+        with self._lock:
+            if not self._in_flight:
+                logging.error('Received render data without request in flight')
+                return None
+            return self._in_flight.popleft()
+
+    def complete(self, request, render_data):
+        """
+        Parks the finished render data of a request in the cache
+        :param request: PixelRequest
+        :param render_data: RenderData
+        :return:
+        """
+        if render_data is None:
+            return
+        with self._lock:
+            if request.display and request.key == self._latest_key:
+                self._latest_render_data = render_data
+        # the cache is thread safe, the disk cache writes the entry in a background thread
+        self._cache.put(request.key, render_data)
+
+    def clear(self):
+        """
+        Drops all pending and in flight requests (e.g. after a disconnect)
+        :return:
+        """
+        with self._lock:
+            self._pending.clear()
+            self._in_flight.clear()
+            for request in self._loading:
+                request.cancelled = True
+            self._loading = []
+            self._latest_key = None
+            self._latest_render_data = None
+
+    def clear_cache(self):
+        """
+        Drops all cached render data
+        :return:
+        """
+        with self._lock:
+            self._cache.invalidate()
+
+    def _supersede(self, key):
+        """
+        Supersedes all displayed requests of other pixels than key.
+        Requests which are also needed for the cache are kept but not displayed anymore.
+        """
+        for request in list(self._pending):
+            if request.display and request.key != key:
+                if request.batch:
+                    request.display = False
+                else:
+                    self._pending.remove(request)
+        for request in list(self._in_flight) + self._loading:
+            if request.display and request.key != key:
+                if request.batch:
+                    request.display = False
+                else:
+                    request.cancelled = True
+
+    def _find(self, key):
+        # cancelled requests are still found, their response was not read yet and can be revived
+        for request in list(self._in_flight) + self._loading:
+            if request.key == key:
+                return request
+        for request in self._pending:
+            if request.key == key:
+                return request
+        return None
@@ -33,15 +33,31 @@ class SocketStream(Stream):
 
     Handles Port, Hostname and Socket.
     Handles read and write from Socket Stream pipeline
+
+    In buffered mode incoming data is received with recv_into into a reusable receive buffer,
+    small reads (primitives, records) are served from this buffer without a syscall,
+    reads larger than the buffer are received directly into their own memory and returned as memoryview.
     """
 
-    def __init__(self, port=None, hostname=None):
+    def __init__(self, port=None, hostname=None, sock=None, buffered=True, buffer_size=1 << 16):
         Stream.__init__(self)
         logging.info("Init SocketStream ...")
         self._port = port
         self._hostname = hostname or socket.gethostname()
-        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self._is_connected = False
+        # an already connected socket can be passed in (e.g. one end of a socketpair)
+        self._socket = sock or socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._is_connected = sock is not None
+        self._configure_socket()
+
+        # receive buffer, valid unread data is located in [start, end)
+        self._buffered = buffered
+        self._buffer_size = buffer_size
+        self._buffer = bytearray(buffer_size)
+        self._buffer_view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        # start of the captured data within the buffer, see mark()
+        self._mark = None
 
     @property
     def port(self):
@@ -75,6 +91,14 @@ class SocketStream(Stream):
         """
         self._hostname = hostname
 
+    @property
+    def buffered(self):
+        """
+        Returns if the buffered reader mode is used
+        :return: boolean
+        """
+        return self._buffered
+
     @property
     def socket(self):
         """
@@ -96,6 +120,7 @@ class SocketStream(Stream):
         :return: True|False, ErrorMsg|None
         """
         logging.info("Connecting to {}:{}".format(self._hostname, self._port))
+        self.reset_buffer()
         try:
             self._socket.connect((self._hostname, self._port))
         except socket.error as e:
@@ -116,6 +141,8 @@ class SocketStream(Stream):
         try:
             self._socket.close()
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._configure_socket()
+            self.reset_buffer()
         except socket.error as e:
             logging.error("Socket error {}".format(e))
             return False, str(e)
@@ -125,23 +152,210 @@ class SocketStream(Stream):
         self._is_connected = False
         return True, None
 
-    def read(self, size):
+    def _configure_socket(self):
         """
-        Reads size bytes from the socket stream pipeline
-        :param size: package size
+        Disables Nagle's algorithm, requests are small and latency bound
         :return:
         """
         try:
-            data = b''
-            while len(data) < size:
-                chunk = self._socket.recv(size - len(data))
-                if chunk == b'':
-                    raise RuntimeError('Socket connection broken')
-                data += chunk
-            return data
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            # not a TCP socket (e.g. unix socketpair)
+            logging.debug("TCP_NODELAY not set: {}".format(e))
+
+    def reset_buffer(self):
+        """
+        Drops all buffered data
+        :return:
+        """
+        self._start = 0
+        self._end = 0
+        self._mark = None
+
+    def mark(self):
+        """
+        Starts capturing, all data consumed from now on is kept in the (growing) receive buffer
+        until it is taken with captured()
+        :return:
+        """
+        self._mark = self._start
+
+    def captured(self):
+        """
+        Stops capturing and returns all data consumed since mark()
+        :return: bytearray
+        """
+        data = self._buffer[self._mark:self._start]
+        self._mark = None
+        if len(self._buffer) > self._buffer_size and self._end - self._start <= self._buffer_size:
+            # shrink the buffer grown by the capture
+            self._set_buffer(bytearray(self._buffer_size))
+        return data
+
+    def _set_buffer(self, buffer):
+        # moves the unread (and captured) data to the front of the given buffer
+        keep = self._start if self._mark is None else self._mark
+        available = self._end - keep
+        if buffer is self._buffer:
+            self._buffer_view[:available] = self._buffer_view[keep:self._end]
+        else:
+            buffer[:available] = self._buffer_view[keep:self._end]
+            self._buffer_view.release()
+            self._buffer = buffer
+            self._buffer_view = memoryview(buffer)
+        self._start -= keep
+        self._end -= keep
+        if self._mark is not None:
+            self._mark = 0
+
+    def buffered_size(self):
+        """
+        Returns the amount of received bytes which are not consumed yet
+        :return: integer
+        """
+        return self._end - self._start
+
+    def take_buffered(self):
+        """
+        Returns and drops all received bytes which are not consumed yet,
+        e.g. to hand the stream over to another reader of the same socket
+        :return: bytes
+        """
+        data = bytes(self._buffer_view[self._start:self._end])
+        self.reset_buffer()
+        return data
+
+    def feed(self, data):
+        """
+        Puts data in front of the unread data, it is read before anything else from the socket
+        :param data: bytes-like
+        :return:
+        """
+        if not data:
+            return
+        available = self._end - self._start
+        if available + len(data) > len(self._buffer):
+            self._buffer = bytearray(available + len(data))
+            self._buffer[len(data):] = self._buffer_view[self._start:self._end]
+            self._buffer_view.release()
+            self._buffer_view = memoryview(self._buffer)
+        elif self._start >= len(data):
+            self._start -= len(data)
+            self._buffer_view[self._start:self._start + len(data)] = data
+            return
+        else:
+            self._buffer_view[len(data):len(data) + available] = self._buffer_view[self._start:self._end]
+        self._buffer_view[:len(data)] = data
+        self._start = 0
+        self._end = len(data) + available
+
+    def _recv_into(self, view):
+        """
+        Receives data into the given memoryview,
+        returns the amount of received bytes
+        :param view: memoryview
+        :return: integer
+        """
+        try:
+            received = self._socket.recv_into(view)
         except ConnectionResetError as e:
             logging.error(e)
             raise ConnectionResetError(e)
+        if received == 0:
+            raise RuntimeError('Socket connection broken')
+        return received
+
+    def _fill(self, size):
+        """
+        Receives data until at least size bytes are buffered,
+        size must not exceed the buffer size unless data is captured
+        :param size: integer
+        :return:
+        """
+        if self._start + size > len(self._buffer):
+            keep = self._start if self._mark is None else self._mark
+            required = self._start - keep + size
+            if required > len(self._buffer):
+                # only while capturing
+                self._set_buffer(bytearray(max(required, 2 * len(self._buffer))))
+            else:
+                # move unread data to the front of the buffer
+                self._set_buffer(self._buffer)
+        while self._end - self._start < size:
+            self._end += self._recv_into(self._buffer_view[self._end:])
+
+    def _read_into(self, view):
+        """
+        Fills the whole memoryview, first from the buffer then directly from the socket
+        :param view: memoryview
+        :return:
+        """
+        size = len(view)
+        pos = min(self._end - self._start, size)
+        view[:pos] = self._buffer_view[self._start:self._start + pos]
+        self._start += pos
+        while pos < size:
+            pos += self._recv_into(view[pos:])
+
+    def read(self, size):
+        """
+        Reads size bytes from the socket stream pipeline
+        :param size: package size
+        :return: bytes|memoryview
+        """
+        if self._mark is None and (not self._buffered or size > len(self._buffer)):
+            # large data is received directly into its own memory without intermediate copies
+            data = bytearray(size)
+            self._read_into(memoryview(data))
+            return memoryview(data)
+        if self._end - self._start < size:
+            self._fill(size)
+        data = bytes(self._buffer_view[self._start:self._start + size])
+        self._start += size
+        return data
+
+    def skip(self, size):
+        """
+        Reads and discards size bytes, the data is received into the receive buffer and dropped
+        :param size: integer
+        :return:
+        """
+        available = self._end - self._start
+        if size <= available:
+            self._start += size
+            return
+        if self._mark is not None:
+            self._fill(size)
+            self._start += size
+            return
+        size -= available
+        self.reset_buffer()
+        while size > 0:
+            if self._buffered:
+                received = self._recv_into(self._buffer_view)
+            else:
+                received = self._recv_into(self._buffer_view[:min(size, len(self._buffer))])
+            if received > size:
+                # keep the beginning of the next message
+                self._start = size
+                self._end = received
+                return
+            size -= received
+
+    def read_struct(self, compiled):
+        """
+        Unpacks a precompiled struct, in buffered mode directly from the receive buffer
+        :param compiled: struct.Struct
+        :return: tuple
+        """
+        size = compiled.size
+        if self._mark is None and (not self._buffered or size > len(self._buffer)):
+            return compiled.unpack(self.read(size))
+        if self._end - self._start < size:
+            self._fill(size)
+        values = compiled.unpack_from(self._buffer, self._start)
+        self._start += size
+        return values
 
     def write(self, data, size):
         """
@@ -24,6 +24,11 @@
 
 from PySide2.QtCore import QThread
 from stream.socket_stream import SocketStream
+from stream.recording_stream import RecordingStream
+from stream.file_stream import FileStream
+from stream.decoder_process import DecoderProcess
+from stream.request_scheduler import RequestScheduler
+from model.render_data_disk_cache import RenderDataDiskCache
 from core.messages import ServerMsg
 from core.messages import StateMsg
 from core.messages import RenderSystem
@@ -45,7 +50,16 @@ class SocketStreamClient(QThread):
     def __init__(self, port, hostname):
         QThread.__init__(self)
         # init socket stream
-        self._stream = SocketStream(port=port, hostname=hostname)
+        self._socket_stream = SocketStream(port=port, hostname=hostname)
+        # stream used by this thread, either the socket stream, a recording or a replay of it
+        self._stream = self._socket_stream
+        # if set, the next session is recorded to this file
+        self._record_filename = None
+        # optional process which decodes pixel payloads without holding the GIL of this process
+        self._decoder_process = None
+        # keeps track of pixel requests in flight and caches their results
+        self._scheduler = RequestScheduler(self.send_render_data_request,
+                                           loaded_callback=self.handle_loaded_render_data)
         # model will be used to deserialize data within this thread
         self._model = None
         # bool to check an open socket connection
@@ -74,6 +88,14 @@ class SocketStreamClient(QThread):
         """
         return self._stream
 
+    @property
+    def scheduler(self):
+        """
+        Return the pixel request scheduler
+        :return: RequestScheduler
+        """
+        return self._scheduler
+
     def request_render_info(self):
         """
         Requests the render info data package from the server
@@ -95,18 +117,54 @@ class SocketStreamClient(QThread):
         """
         self._stream.write_short(ServerMsg.EMCA_HEADER_SCENE_DATA.value)
 
-    def request_render_data(self, pixel, sample_count):
+    def request_scene_hash(self):
+        """
+        Requests the geometry hash of the scene, only if announced by the server
+        :return:
+        """
+        self._stream.write_short(ServerMsg.EMCA_HEADER_SCENE_HASH.value)
+
+    def request_camera_data(self):
+        """
+        Requests the camera data without the scene objects, only if the scene hash was announced by the server
+        :return:
+        """
+        self._stream.write_short(ServerMsg.EMCA_HEADER_CAMERA.value)
+
+    def request_render_data(self, pixel, sample_count, display=True):
         """
-        Requests the render data of the selected pixel
+        Requests the render data of the selected pixel via the request scheduler.
+        Returns the cached render data if the pixel was already received
         :param pixel: (x,y)
         :param sample_count: sampleCount Integer
-        :return:
+        :param display: False if the result should only be cached
+        :return: RenderData|None
         """
         logging.info('Request pixel=({},{})'.format(pixel.x(), pixel.y()))
-        self._stream.write_short(ServerMsg.EMCA_HEADER_PIXEL_DATA.value)
-        self._stream.write_int(int(pixel.x()))
-        self._stream.write_int(int(pixel.y()))
-        self._stream.write_int(int(sample_count))
+        render_data = self._scheduler.request(pixel.x(), pixel.y(), sample_count, display)
+        self._scheduler.dispatch()
+        return render_data
+
+    def display_render_data(self, render_data):
+        """
+        Sets the render data in the model if it belongs to the latest displayed pixel.
+        Called from the GUI, the reader and the disk cache loader thread
+        :param render_data: RenderData
+        :return: boolean, False if the pixel was superseded meanwhile
+        """
+        return self._scheduler.display(render_data, self._model.load_render_data)
+
+    def send_render_data_request(self, request):
+        """
+        Sends the render data request of one pixel to the server
+        :param request: PixelRequest
+        :return:
+        """
+        with self._stream.message() as msg:
+            msg.write_short(ServerMsg.EMCA_HEADER_PIXEL_DATA.value)
+            msg.write_int(request.x)
+            msg.write_int(request.y)
+            msg.write_int(request.sample_count)
 
     def request_disconnect(self):
         """
@@ -122,13 +180,54 @@ class SocketStreamClient(QThread):
         """
         return self._stream.is_connected()
 
+    def record_session(self, filename):
+        """
+        Records all received data of the next session to filename, None disables recording
+        :param filename: str|None
+        :return:
+        """
+        self._record_filename = filename
+
+    def set_decode_in_process(self, enabled):
+        """
+        Enables decoding of pixel payloads in a separate process
+        :param enabled: boolean
+        :return:
+        """
+        if enabled and self._decoder_process is None:
+            self._decoder_process = DecoderProcess()
+        elif not enabled and self._decoder_process is not None:
+            self._decoder_process.stop()
+            self._decoder_process = None
+
     def connect_socket_stream(self, hostname, port):
         """
         Connects the socket stream and returns if successful
         :return: True|False, None|ErrorMsg
         """
-        self._stream.hostname = hostname
-        self._stream.port = port
+        self._socket_stream.hostname = hostname
+        self._socket_stream.port = port
+        if self._record_filename:
+            try:
+                self._stream = RecordingStream(self._socket_stream, self._record_filename)
+            except OSError as e:
+                logging.error(e)
+                return False, str(e)
+        else:
+            self._stream = self._socket_stream
+        return self._stream.connect()
+
+    def replay_session(self, filename):
+        """
+        Replays a recorded session from file instead of connecting to a server
+        :param filename: str
+        :return: True|False, None|ErrorMsg
+        """
+        try:
+            self._stream = FileStream(filename)
+        except (OSError, RuntimeError) as e:
+            logging.error(e)
+            return False, str(e)
         return self._stream.connect()
 
     def disconnect_socket_stream(self):
@@ -136,6 +235,8 @@ class SocketStreamClient(QThread):
         Shutdown / Disconnect the SocketStream and returns if successful
         :return: True|False, None|ErrorMsg
         """
+        if self._decoder_process is not None:
+            self._decoder_process.stop()
         return self._stream.disconnect()
 
     def close(self):
@@ -145,6 +246,76 @@ class SocketStreamClient(QThread):
         """
         self._stream.write_short(ServerMsg.EMCA_QUIT.value)
 
+    def handle_render_data(self):
+        """
+        Handles an incoming render data package.
+        The package is matched to the oldest request in flight,
+        responses of cancelled (superseded) requests are skipped without creating any objects.
+        :return:
+        """
+        request = self._scheduler.pop_in_flight()
+        if request is None:
+            self._model.deserialize_render_data(stream=self._stream)
+            return
+
+        # only plain socket streams are handed over, recorded streams have to see every byte
+        decoder_process = self._decoder_process
+        if decoder_process is not None and self._stream is self._socket_stream:
+            if not decoder_process.is_running(self._socket_stream.socket):
+                decoder_process.start(self._socket_stream.socket)
+        else:
+            decoder_process = None
+
+        if request.cancelled:
+            logging.info('Skip render data of cancelled {}'.format(request))
+            if decoder_process is not None:
+                decoder_process.skip(self._stream)
+            else:
+                self._model.skip_render_data(stream=self._stream)
+            self._sendStateMsgSig.emit((StateMsg.DATA_RENDER_CANCELLED, request))
+            return
+
+        # the request may be superseded while its data is decoded
+        if decoder_process is not None:
+            columns = decoder_process.decode(self._stream, is_cancelled=request.is_cancelled)
+            render_data = None if columns is None else self._model.build_render_data(columns)
+        else:
+            render_data = self._model.decode_render_data(stream=self._stream, is_cancelled=request.is_cancelled)
+        self._scheduler.complete(request, render_data)
+        if render_data is None:
+            self._sendStateMsgSig.emit((StateMsg.DATA_RENDER_CANCELLED, request))
+        elif not request.display or not self.display_render_data(render_data):
+            self._sendStateMsgSig.emit((StateMsg.DATA_RENDER_CACHED, request))
+
+    def set_content_hash(self):
+        """
+        Hashes the rendered image, pixels on disk are only reused for the same image.
+        The disk cache is skipped if the image can not be read
+        :return:
+        """
+        cache = self._scheduler.cache
+        if cache.disk_cache is None:
+            return
+        try:
+            content_hash = RenderDataDiskCache.content_hash(self._model.render_info.filepath())
+        except Exception as e:
+            logging.error(e)
+            content_hash = None
+        cache.set_content_hash(content_hash)
+
+    def handle_loaded_render_data(self, request, render_data):
+        """
+        Handles a pixel loaded from the disk cache, called within the loader thread of the scheduler
+        :param request: PixelRequest
+        :param render_data: RenderData|None, None if cancelled or requeued for the server
+        :return:
+        """
+        if render_data is None or request.cancelled:
+            # the following dispatch sends a requeued request to the server
+            self._sendStateMsgSig.emit((StateMsg.DATA_RENDER_CANCELLED, request))
+        elif not request.display or not self.display_render_data(render_data):
+            self._sendStateMsgSig.emit((StateMsg.DATA_RENDER_CACHED, request))
+
     def run(self):
         """
         Handles handshake and incoming messages from the server,
@@ -202,16 +373,31 @@ class SocketStreamClient(QThread):
                 self._sendStateMsgSig.emit((StateMsg.UPDATE_PLUGIN, plugin.flag))
             elif state is ServerMsg.EMCA_SUPPORTED_PLUGINS:
                 self._model.deserialize_supported_plugins(stream=self._stream)
+            elif state is ServerMsg.EMCA_CAPABILITY_SCENE_HASH:
+                self._model.server_supports_scene_hash = True
             elif state is ServerMsg.EMCA_HEADER_RENDER_INFO:
                 self._model.deserialize_render_info(stream=self._stream)
+                # pixels of other render settings are outdated
+                render_settings = self._model.render_info.settings_key() + (str(self._model.server_render_system),)
+                self._scheduler.cache.set_render_settings(render_settings)
             elif state is ServerMsg.EMCA_HEADER_CAMERA:
                 self._model.deserialize_camera(stream=self._stream)
             elif state is ServerMsg.EMCA_HEADER_SCENE_DATA:
                 self._model.deserialize_scene_objects(stream=self._stream)
+            elif state is ServerMsg.EMCA_HEADER_SCENE_HASH:
+                self._model.deserialize_scene_hash(stream=self._stream)
             elif state is ServerMsg.EMCA_HEADER_IMAGE_DATA:
+                # the image was rendered again, responses from here on belong to the new image
+                self._scheduler.clear_cache()
+                self.set_content_hash()
                 self._sendStateMsgSig.emit((StateMsg.DATA_IMAGE, None))
             elif state is ServerMsg.EMCA_HEADER_PIXEL_DATA:
-                self._model.deserialize_render_data(stream=self._stream)
+                try:
+                    self.handle_render_data()
+                except RuntimeError as e:
+                    # the stream position is lost if the decoder process failed
+                    logging.error(e)
+                    break
             elif state is ServerMsg.EMCA_NO_VALID_DATA:
                 self._sendStateMsgSig.emit((StateMsg.DATA_NOT_VALID, None))
             elif state is ServerMsg.EMCA_DISCONNECT:
@@ -220,4 +406,8 @@ class SocketStreamClient(QThread):
                 self._sendStateMsgSig.emit((StateMsg.QUIT, None))
                 break
 
+        if isinstance(self._stream, FileStream) and self._stream.is_connected():
+            # end of the recording was reached without a recorded disconnect
+            self._sendStateMsgSig.emit((StateMsg.DISCONNECT, None))
+
         logging.info("Shutdown SocketStreamClient Thread ...")
@@ -32,6 +32,8 @@ from core.point3 import Point3i
 
 import abc
 import struct
+import numpy as np
+from contextlib import contextmanager
 from enum import Enum
 
 
@@ -41,6 +43,18 @@ class ByteOrder(Enum):
     BIG_ENDIAN          = '>'   # big endian
     NETWORK             = '!'   # network (= big endian)
 
+    def np_char(self):
+        """
+        Returns the corresponding numpy byte order character
+        :return: str
+        """
+        return {
+            ByteOrder.NATIVE: '=',
+            ByteOrder.LITTLE_ENDIAN: '<',
+            ByteOrder.BIG_ENDIAN: '>',
+            ByteOrder.NETWORK: '>'
+        }[self]
+
 
 class Format(Enum):
     CHAR                = 'c'
@@ -83,7 +97,8 @@ class Stream(object):
     """
 
     def __init__(self):
-        pass
+        # pending data of the currently open message, see message()
+        self._message = None
 
     @abc.abstractmethod
     def read(self, size):
@@ -93,68 +108,100 @@ class Stream(object):
     def write(self, data, size):
         return
 
+    @contextmanager
+    def message(self):
+        """
+        Batches all write operations within the context and writes them at once on exit,
+        so a request consisting of several fields is sent with a single write call.
+        Nested messages are merged into the outer one, on an exception nothing is written.
+        """
+        if self._message is not None:
+            yield self
+            return
+        self._message = bytearray()
+        try:
+            yield self
+            data = self._message
+        finally:
+            self._message = None
+        self.write(data, len(data))
+
+    def _write(self, data, size):
+        if self._message is not None:
+            self._message += data
+        else:
+            self.write(data, size)
+
     """ Write operations """
 
     def write_char(self, value):
         data = struct.pack(Format.CHAR.value, value)
-        self.write(data, SizeOf.CHAR.value)
+        self._write(data, SizeOf.CHAR.value)
 
     def write_schar(self, value):
         data = struct.pack(Format.UNSIGNED_CHAR.value, value)
-        self.write(data, SizeOf.SIGNED_CHAR.value)
+        self._write(data, SizeOf.SIGNED_CHAR.value)
 
     def write_uchar(self, value):
         data = struct.pack(Format.UNSIGNED_CHAR.value, value)
-        self.write(data, SizeOf.UNSIGNED_CHAR.value)
+        self._write(data, SizeOf.UNSIGNED_CHAR.value)
 
     def write_bool(self, value):
         data = struct.pack(Format.BOOL.value, value)
-        self.write(data, SizeOf.BOOL.value)
+        self._write(data, SizeOf.BOOL.value)
 
     def write_short(self, value):
         data = struct.pack(Format.SHORT.value, value)
-        self.write(data, SizeOf.SHORT.value)
+        self._write(data, SizeOf.SHORT.value)
 
     def write_ushort(self, value):
         data = struct.pack(Format.UNSIGNED_SHORT.value, value)
-        self.write(data, SizeOf.UNSIGNED_SHORT.value)
+        self._write(data, SizeOf.UNSIGNED_SHORT.value)
 
     def write_int(self, value):
         data = struct.pack(Format.INT.value, value)
-        self.write(data, SizeOf.INT.value)
+        self._write(data, SizeOf.INT.value)
 
     def write_uint(self, value):
         data = struct.pack(Format.UNSIGNED_INT.value, value)
-        self.write(data, SizeOf.UNSIGNED_INT.value)
+        self._write(data, SizeOf.UNSIGNED_INT.value)
 
     def write_long(self, value):
         data = struct.pack(Format.LONG.value, value)
-        self.write(data, SizeOf.LONG.value)
+        self._write(data, SizeOf.LONG.value)
 
     def write_ulong(self, value):
         data = struct.pack(Format.UNSIGNED_LONG.value, value)
-        self.write(data, SizeOf.UNSIGNED_LONG.value)
+        self._write(data, SizeOf.UNSIGNED_LONG.value)
 
     def write_longlong(self, value):
         data = struct.pack(Format.LONG_LONG.value, value)
-        self.write(data, SizeOf.LONG_LONG.value)
+        self._write(data, SizeOf.LONG_LONG.value)
 
     def write_ulonglong(self, value):
         data = struct.pack(Format.UNSIGNED_LONG_LONG.value, value)
-        self.write(data, SizeOf.UNSIGNED_LONG_LONG.value)
+        self._write(data, SizeOf.UNSIGNED_LONG_LONG.value)
 
     def write_float(self, value):
         data = struct.pack(Format.FLOAT.value, value)
-        self.write(data, SizeOf.FLOAT.value)
+        self._write(data, SizeOf.FLOAT.value)
 
     def write_double(self, value):
         data = struct.pack(Format.DOUBLE.value, value)
-        self.write(data, SizeOf.DOUBLE.value)
+        self._write(data, SizeOf.DOUBLE.value)
+
+    def write_bytes(self, data):
+        """
+        Writes raw bytes, unlike write they are batched within an open message
+        :param data: bytes-like
+        :return:
+        """
+        self._write(data, len(data))
 
     def write_string(self, value):
         raw_value = bytes(value, "utf-8")
         data = raw_value+bytes(1)
-        self.write(data, len(raw_value)+1)
+        self._write(data, len(raw_value)+1)
 
     """ Read operations """
 
@@ -207,10 +254,17 @@ class Stream(object):
         return struct.unpack(Format.DOUBLE.value, data)[0]
 
     """ Specific read and write functions """
+    def skip(self, size):
+        self.read(size)
+
+    def read_struct(self, compiled):
+        data = self.read(compiled.size)
+        return compiled.unpack(data)
+
     def read_string(self):
         string_len = self.read_int()
         data = self.read(string_len)
-        return data.decode("utf-8")
+        return str(data, "utf-8")
 
     def read_float_array(self, size):
         data = self.read(size * SizeOf.FLOAT.value)
@@ -220,6 +274,25 @@ class Stream(object):
         data = self.read(size * SizeOf.INT.value)
         return struct.unpack(size * Format.INT.value, data)
 
+    def read_array_np(self, fmt, size, byte_order=ByteOrder.NATIVE):
+        """
+        Reads size items of format fmt as numpy array,
+        the array is a view on the received data without per item conversion
+        :param fmt: Format
+        :param size: amount of items
+        :param byte_order: ByteOrder of the incoming data
+        :return: numpy array
+        """
+        dtype = np.dtype(byte_order.np_char() + fmt.value)
+        data = self.read(size * dtype.itemsize)
+        return np.frombuffer(data, dtype=dtype, count=size)
+
+    def read_float_array_np(self, size, byte_order=ByteOrder.NATIVE):
+        return self.read_array_np(Format.FLOAT, size, byte_order)
+
+    def read_int_array_np(self, size, byte_order=ByteOrder.NATIVE):
+        return self.read_array_np(Format.INT, size, byte_order)
+
     def read_point2f(self):
         xs = self.read_float_array(2)
         return Point2f(xs[0], xs[1])
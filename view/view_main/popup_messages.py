@@ -179,3 +179,17 @@ class PopupMessages(QObject):
 
 
 
+
+    def error_invalid_filter_query(self, msg):
+        """
+        Popup error message if a filter query can not be parsed
+        :param msg: string
+        :return:
+        """
+        self._msgBox.setIcon(QMessageBox.Information)
+        self._msgBox.setWindowTitle("Filter error")
+        self._msgBox.setText("Invalid filter query")
+        self._msgBox.setInformativeText(msg)
+        self._msgBox.setDetailedText("")
+        self._msgBox.setStandardButtons(QMessageBox.Ok)
+        self._msgBox.exec_()
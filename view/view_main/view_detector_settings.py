@@ -26,6 +26,7 @@ from core.pyside2_uic import loadUi
 from PySide2.QtCore import Slot
 from PySide2.QtWidgets import QWidget
 from PySide2.QtWidgets import QApplication
+from detector.detector import Detector
 import os
 import logging
 
@@ -50,8 +51,15 @@ class ViewDetectorSettings(QWidget):
         screen_rect = desktop_widget.availableGeometry(self)
         self.move(screen_rect.center() - self.rect().center())
 
+        # robust strategies shown in comb_robust, and their thresholds { strategy flag : threshold }
+        self._robust_flags = []
+        self._thresholds = {}
+
         self.cb_default.clicked.connect(self.toggle_esd)
         self.cb_esd.clicked.connect(self.toggle_default)
+        self.cb_robust.clicked.connect(self.toggle_robust)
+        self.comb_robust.currentIndexChanged.connect(self.select_robust)
+        self.dsb_threshold.valueChanged.connect(self.change_threshold)
         self.btn_apply.clicked.connect(self.apply)
         self.btn_apply_close.clicked.connect(self.apply_close)
 
@@ -74,6 +82,45 @@ class ViewDetectorSettings(QWidget):
         self.dsb_k.setValue(detector.k)
         self.dsb_pre_filter.setValue(detector.pre_filter)
         self.cb_default.setChecked(detector.is_default_active)
+        self.cb_esd.setChecked(detector.strategy == Detector.ESD)
+        self.comb_channel.setCurrentIndex(detector.channel)
+
+        robust = [s for s in detector.strategies if s.flag not in (Detector.DEFAULT, Detector.ESD)]
+        self._robust_flags = [s.flag for s in robust]
+        self._thresholds = {s.flag: s.threshold for s in robust}
+        self.comb_robust.blockSignals(True)
+        self.comb_robust.clear()
+        for strategy in robust:
+            self.comb_robust.addItem(strategy.name, strategy.threshold_name)
+        self.comb_robust.blockSignals(False)
+        if detector.strategy in self._robust_flags:
+            self.cb_robust.setChecked(True)
+            self.comb_robust.setCurrentIndex(self._robust_flags.index(detector.strategy))
+        self.select_robust(self.comb_robust.currentIndex())
+
+    def selected_strategy(self):
+        """
+        Returns the flag of the selected detector strategy
+        :return: string
+        """
+        if self.cb_esd.isChecked():
+            return Detector.ESD
+        if self.cb_robust.isChecked() and self._robust_flags:
+            return self._robust_flags[self.comb_robust.currentIndex()]
+        return Detector.DEFAULT
+
+    def uncheck_others(self, checkbox):
+        """
+        Only one detector can be active, unchecks all other detector checkboxes.
+        If no checkbox is checked the default detector is used
+        :param checkbox: QCheckBox
+        :return:
+        """
+        for cb in (self.cb_default, self.cb_esd, self.cb_robust):
+            if cb is not checkbox and checkbox.isChecked():
+                cb.setChecked(False)
+        if not any(cb.isChecked() for cb in (self.cb_default, self.cb_esd, self.cb_robust)):
+            self.cb_default.setChecked(True)
 
     @Slot(bool, name='toggle_esd')
     def toggle_esd(self, clicked):
@@ -82,10 +129,7 @@ class ViewDetectorSettings(QWidget):
         :param clicked: boolean
         :return:
         """
-        if self.cb_default.isChecked():
-            self.cb_esd.setChecked(False)
-        if not self.cb_default.isChecked() and not self.cb_esd.isChecked():
-            self.cb_esd.setChecked(True)
+        self.uncheck_others(self.cb_default)
 
     @Slot(bool, name='toggle_default')
     def toggle_default(self, clicked):
@@ -94,10 +138,42 @@ class ViewDetectorSettings(QWidget):
         :param clicked: boolean
         :return:
         """
-        if self.cb_esd.isChecked():
-            self.cb_default.setChecked(False)
-        if not self.cb_esd.isChecked() and not self.cb_default.isChecked():
-            self.cb_default.setChecked(True)
+        self.uncheck_others(self.cb_esd)
+
+    @Slot(bool, name='toggle_robust')
+    def toggle_robust(self, clicked):
+        """
+        Toggles the checkbox of the robust detector, only one detector can be active
+        :param clicked: boolean
+        :return:
+        """
+        self.uncheck_others(self.cb_robust)
+
+    @Slot(int, name='select_robust')
+    def select_robust(self, index):
+        """
+        Shows the threshold of the selected robust detector
+        :param index: integer
+        :return:
+        """
+        if index < 0:
+            return
+        flag = self._robust_flags[index]
+        self.label_threshold.setText('{}:'.format(self.comb_robust.itemData(index)))
+        self.dsb_threshold.blockSignals(True)
+        self.dsb_threshold.setValue(self._thresholds[flag])
+        self.dsb_threshold.blockSignals(False)
+
+    @Slot(float, name='change_threshold')
+    def change_threshold(self, value):
+        """
+        Saves the threshold of the selected robust detector
+        :param value: float
+        :return:
+        """
+        index = self.comb_robust.currentIndex()
+        if index >= 0:
+            self._thresholds[self._robust_flags[index]] = value
 
     @Slot(bool, name='apply')
     def apply(self, clicked):
@@ -111,8 +187,10 @@ class ViewDetectorSettings(QWidget):
             self.dsb_alpha.value(),
             self.dsb_k.value(),
             self.dsb_pre_filter.value(),
-            self.cb_default.isChecked(),
-            self.cb_is_active.isChecked())
+            self.selected_strategy(),
+            self.cb_is_active.isChecked(),
+            self.comb_channel.currentIndex(),
+            dict(self._thresholds))
 
     @Slot(bool, name='apply_close')
     def apply_close(self, clicked):
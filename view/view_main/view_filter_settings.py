@@ -24,16 +24,12 @@
 
 from core.pyside2_uic import loadUi
 from filter.filter_list_item import FilterListItem
+from filter.filter_type import FilterType
 from PySide2.QtCore import Slot
 from PySide2.QtWidgets import QWidget
 from PySide2.QtWidgets import QApplication
 from PySide2.QtWidgets import QListWidgetItem
 from PySide2.QtCore import Qt
-from core.point2 import Point2f
-from core.point2 import Point2i
-from core.point3 import Point3f
-from core.point3 import Point3i
-from core.color3 import Color3f
 import os
 
 
@@ -57,6 +53,8 @@ class ViewFilterSettings(QWidget):
         self.move(screen_rect.center() - self.rect().center())
 
         self._filter_items = {}
+        # filter indices stay unique when filters are deleted
+        self._next_filter_idx = 0
 
         self.combItems.currentTextChanged.connect(self.update_stacked_widget)
         self.btnClose.clicked.connect(self.close)
@@ -87,6 +85,8 @@ class ViewFilterSettings(QWidget):
         self.btnApplyFilter.clicked.connect(controller.filter.apply_filters)
         self.btnDeleteFilter.clicked.connect(controller.filter.delete_filter)
         self.btnAddFilter.clicked.connect(controller.filter.add_filter)
+        self.btnAddQuery.clicked.connect(controller.filter.add_query)
+        self.combComposition.currentIndexChanged.connect(controller.filter.set_composition)
 
     def prepare_new_data(self):
         """
@@ -102,44 +102,20 @@ class ViewFilterSettings(QWidget):
         :param render_data: RenderData
         :return:
         """
-        # iterate through all paths and their vertices
-        for _, path in render_data.dict_paths.items():
-
+        columns = render_data.columns
+        if columns is not None and columns.path_count > 0:
             # pathinfo stuff sample_idx, final_estimate, path_depth
-            if path.sample_idx:
-                if not self._filter_items.get('sampleIndex', None):
-                    self._filter_items['sampleIndex'] = path.sample_idx
-
-            if path.valid_depth:
-                if not self._filter_items.get('pathDepth', None):
-                    self._filter_items['pathDepth'] = path.path_depth
-
-            if path.final_estimate:
-                if not self._filter_items.get('finalEstimate', None):
-                    self._filter_items['finalEstimate'] = path.final_estimate
-
-            # add path user data
-            user_data_path = path.data_list
-            for item in user_data_path:
-                for key_user, value_user in item.items():
-                    if not self._filter_items.get(key_user, None):
-                        # add item if not in list
-                        if isinstance(value_user, list):
-                            self._filter_items[key_user] = value_user[0]
-                        else:
-                            self._filter_items[key_user] = value_user
-
-            # iterate over intersection points
-            for _, its in path.intersections.items():
-                user_data_vert = its.data_list
-                for item in user_data_vert:
-                    for key_user, value_user in item.items():
-                        # add item if not in list
-                        if not self._filter_items.get(key_user, None):
-                            if isinstance(value_user, list):
-                                self._filter_items[key_user] = value_user[0]
-                            else:
-                                self._filter_items[key_user] = value_user
+            path_columns = columns.path_columns
+            if path_columns['sample_idx'].any():
+                self._filter_items.setdefault('sampleIndex', 'int')
+            self._filter_items.setdefault('pathDepth', 'int')
+            if path_columns['has_final_estimate'].any():
+                self._filter_items.setdefault('finalEstimate', 'color3f')
+
+        # add the user data keys of all paths and their vertices
+        user_data_columns = render_data.user_data_columns
+        for key in user_data_columns.keys():
+            self._filter_items.setdefault(key, user_data_columns.type_names(key)[0])
 
         # add all values to combBox
         for key, _ in self._filter_items.items():
@@ -164,7 +140,10 @@ class ViewFilterSettings(QWidget):
         :return:
         """
         if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
-            self._controller.filter.add_filter(True)
+            if self.leQuery.hasFocus():
+                self._controller.filter.add_query(True)
+            else:
+                self._controller.filter.add_filter(True)
 
     @Slot(str, name='update_stacked_widget')
     def update_stacked_widget(self, text):
@@ -173,23 +152,23 @@ class ViewFilterSettings(QWidget):
         :param text: string
         :return:
         """
-        item = self._filter_items.get(text, None)
-        if item:
+        type_name = self._filter_items.get(text, None)
+        if type_name:
             """
                 Index   - Widget:
-                0       - bool, float, int, string
+                0       - bool, float, double, int, string
                 1       - Point2
                 2       - Point3
                 3       - Color3
             """
-            if isinstance(item, bool) or isinstance(item, float) or isinstance(item, int) or isinstance(item, str):
-                self.stackedWidget.setCurrentIndex(0)
-            elif isinstance(item, Point2f) or isinstance(item, Point2i):
+            if type_name in ('point2i', 'point2f'):
                 self.stackedWidget.setCurrentIndex(1)
-            elif isinstance(item, Point3f) or isinstance(item, Point3i):
+            elif type_name in ('point3i', 'point3f'):
                 self.stackedWidget.setCurrentIndex(2)
-            elif isinstance(item, Color3f):
+            elif type_name == 'color3f':
                 self.stackedWidget.setCurrentIndex(3)
+            else:
+                self.stackedWidget.setCurrentIndex(0)
 
     @Slot(str, name='le_point_2x')
     def le_point_2x(self, text):
@@ -286,12 +265,44 @@ class ViewFilterSettings(QWidget):
         :return:
         """
         fi = FilterListItem(filter_settings)
+        fi.cbActive.toggled.connect(
+            lambda checked, idx=fi.get_idx(): self._controller.filter.toggle_filter(idx, checked))
         item = QListWidgetItem()
         item.setSizeHint(fi.sizeHint())
         idx = self.stackedWidget.currentIndex()
         self.filterList.addItem(item)
         self.filterList.setItemWidget(item, fi)
-        self.clear_line_edit_entries(idx)
+        if filter_settings.get_type() is FilterType.QUERY:
+            self.leQuery.clear()
+        else:
+            self.clear_line_edit_entries(idx)
+
+    def show_progress(self, done, total):
+        """
+        Shows the progress of the running filter job
+        :param done: number of evaluated filters
+        :param total: number of filters in the job
+        :return:
+        """
+        self.progressFilter.setMaximum(total)
+        self.progressFilter.setValue(done)
+        self.progressFilter.setVisible(True)
+
+    def hide_progress(self):
+        """
+        Hides the filter progress bar
+        :return:
+        """
+        self.progressFilter.setVisible(False)
+
+    def next_filter_idx(self):
+        """
+        Returns a new filter index
+        :return: integer
+        """
+        idx = self._next_filter_idx
+        self._next_filter_idx += 1
+        return idx
 
     def is_line_edit_empty(self, index):
         """
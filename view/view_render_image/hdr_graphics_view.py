@@ -23,6 +23,7 @@
 """
 
 from core.hdr_graphics_view_base import HDRGraphicsViewBase
+from PySide2.QtWidgets import QGraphicsPixmapItem
 from PySide2.QtCore import QPoint
 import logging
 
@@ -38,6 +39,44 @@ class HDRGraphicsView(HDRGraphicsViewBase):
         HDRGraphicsViewBase.__init__(self)
         self._parent = parent
         self._old_scene_pos = QPoint()
+        # heatmap drawn on top of the render image
+        self._overlay_item = None
+
+    def set_overlay(self, pixmap):
+        """
+        Shows the pixmap on top of the render image, the overlay moves with the image
+        :param pixmap: QPixmap
+        :return:
+        """
+        if self._pixmap_item is None:
+            return
+        if self._overlay_item is None:
+            self._overlay_item = QGraphicsPixmapItem(self._pixmap_item)
+        self._overlay_item.setPixmap(pixmap)
+        self._overlay_item.setVisible(True)
+
+    def hide_overlay(self):
+        """
+        Hides the overlay
+        :return:
+        """
+        if self._overlay_item:
+            self._overlay_item.setVisible(False)
+
+    def load_hdr_image(self, filepath, falsecolor=False):
+        """
+        Loads a hdr (exr) image, the overlay of the previous image is removed
+        :param filepath: string
+        :param falsecolor: boolean
+        :return:
+        """
+        self.hide_overlay()
+        self._parent.reset_fireflies()
+        return super().load_hdr_image(filepath, falsecolor)
+
+    def clear(self):
+        super().clear()
+        self._overlay_item = None
 
     def mousePressEvent(self, q_mouse_event):
         """
@@ -23,7 +23,11 @@
 """
 
 from view.view_render_image.hdr_graphics_view import HDRGraphicsView
+from core.firefly_heatmap import FireflyHeatmap
 from PySide2.QtWidgets import QWidget
+from PySide2.QtWidgets import QListWidgetItem
+from PySide2.QtCore import QPoint
+from PySide2.QtCore import Qt
 from PySide2.QtCore import Slot
 from core.pyside2_uic import loadUi
 import math
@@ -53,6 +57,9 @@ class ViewRenderImage(QWidget):
         # HDR graphics view handles .exr images
         self._graphics_view = HDRGraphicsView(self)
 
+        # firefly scores of the render image, computed once the overlay is shown
+        self._fireflies = FireflyHeatmap()
+
         # add graphics view
         self.layoutView.addWidget(self._graphics_view)
 
@@ -60,6 +67,9 @@ class ViewRenderImage(QWidget):
         self.btnReset.clicked.connect(self.reset)
         self.hsExposure.valueChanged.connect(self.set_spin_value)
         self.dsbExposure.valueChanged.connect(self.set_slider_value)
+        self.cbFireflies.toggled.connect(self.toggle_fireflies)
+        self.btnRequestFireflies.clicked.connect(self.request_fireflies)
+        self.listFireflies.itemDoubleClicked.connect(self.select_firefly)
 
     @property
     def pixmap(self):
@@ -126,6 +136,7 @@ class ViewRenderImage(QWidget):
         self.btnReset.setEnabled(enable)
         self.dsbExposure.setEnabled(enable)
         self.hsExposure.setEnabled(enable)
+        self.cbFireflies.setEnabled(enable)
 
     def request_render_data(self, pixel):
         """
@@ -158,3 +169,62 @@ class ViewRenderImage(QWidget):
         """
         self._graphics_view.reset()
         self.hsExposure.setValue(0)
+
+    @Slot(bool, name='toggle_fireflies')
+    def toggle_fireflies(self, checked):
+        """
+        Shows or hides the firefly heatmap and the ranked list of firefly candidates,
+        the scores are computed the first time the heatmap is shown
+        :param checked: boolean
+        :return:
+        """
+        if checked and self._fireflies.scores is None:
+            hdr_image = self._graphics_view.hdr_image
+            try:
+                self._fireflies.compute(*hdr_image.rgb())
+            except Exception as e:
+                logging.error("Error computing firefly heatmap: {}".format(e))
+                self.cbFireflies.setChecked(False)
+                return
+            self.listFireflies.clear()
+            for x, y, score in self._fireflies.candidates():
+                item = QListWidgetItem('({}, {})  score {:.1f}'.format(x, y, score))
+                item.setData(Qt.UserRole, (x, y))
+                self.listFireflies.addItem(item)
+        if checked:
+            self._graphics_view.set_overlay(self._fireflies.create_pixmap())
+        else:
+            self._graphics_view.hide_overlay()
+        self.listFireflies.setVisible(checked)
+        self.btnRequestFireflies.setEnabled(checked)
+
+    def reset_fireflies(self):
+        """
+        Removes the firefly scores of the previous render image
+        :return:
+        """
+        self.cbFireflies.setChecked(False)
+        self._fireflies.clear()
+        self.listFireflies.clear()
+
+    @Slot(bool, name='request_fireflies')
+    def request_fireflies(self, clicked):
+        """
+        Requests the render data of all selected firefly candidates in the background,
+        candidates are displayed once they are selected
+        :param clicked: boolean
+        :return:
+        """
+        pixels = [item.data(Qt.UserRole) for item in self.listFireflies.selectedItems()]
+        if pixels:
+            self._controller.stream.request_render_data_batch(pixels)
+
+    @Slot(QListWidgetItem, name='select_firefly')
+    def select_firefly(self, item):
+        """
+        Selects the pixel of a firefly candidate
+        :param item: QListWidgetItem
+        :return:
+        """
+        x, y = item.data(Qt.UserRole)
+        self.request_render_data(QPoint(x, y))